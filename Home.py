@@ -1,18 +1,19 @@
 import streamlit as st
-import pdfplumber
-import pandas as pd
-import plotly.graph_objects as go
 import tempfile
 import re
-import time
 from pathlib import Path
 
+from analysis_visuals import analysis_key, render_category_chart
+from chatbot_component import start_warm_up
+from services.LazyImport import lazy_import
 from services.ResumeModel import (
-    analyze_resume_langgraph,
+    analyze_resume_and_job_fit,
     display_basic_info_from_resume,
     analyze_job_fit
 )
 
+pdfplumber = lazy_import("pdfplumber")  # Loaded on the first upload
+
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
     page_title="AI Resume Analyzer",
@@ -30,6 +31,9 @@ def load_css():
 
 load_css()
 
+# First page most users open: start warming LLM clients and agents now
+start_warm_up()
+
 # ---------------- TITLE ----------------
 st.markdown("""
 <div style='text-align: center; padding: 20px 0;'>
@@ -57,35 +61,6 @@ for key in ["resume", "role", "job_description", "allow_mock", "analysis_result"
     if key not in st.session_state:
         st.session_state[key] = None if key != "allow_mock" else False
 
-# ---------------- INPUTS ----------------
-st.markdown("<br>", unsafe_allow_html=True)
-
-uploaded_file = st.file_uploader(
-    "📄 Upload your resume (PDF or TXT)", 
-    type=["pdf", "txt"],
-    help="Upload your resume in PDF or TXT format"
-)
-
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    job_role = st.text_input(
-        "🎯 Job Role", 
-        value=st.session_state.get('role', '') or '',
-        placeholder="e.g., Software Engineer, Data Scientist"
-    )
-
-with col2:
-    st.markdown("<br>", unsafe_allow_html=True)
-    analyze = st.button("🚀 Analyze", use_container_width=True, type="primary")
-
-job_description = st.text_area(
-    "📋 Job Description (Optional - for better match analysis)",
-    height=150,
-    placeholder="Paste the full job description here for detailed match analysis...",
-    value=st.session_state.get('job_description', '') or ''
-)
-
 # ---------------- HELPERS ----------------
 def make_signature(resume_text, role, jd):
     return hash((resume_text.strip(), role.strip(), jd.strip()))
@@ -115,19 +90,55 @@ def extract_text_from_file(uploaded_file):
     except:
         return ""
 
-# ---------------- ANALYZE ----------------
-if analyze:
+# ---------------- INPUTS + ANALYZE ----------------
+@st.fragment
+def input_panel():
+    """
+    Upload, role, JD and the Analyze button. Editing these reruns only this
+    panel; the page below is redrawn once a new analysis is ready.
+    """
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    uploaded_file = st.file_uploader(
+        "📄 Upload your resume (PDF or TXT)", 
+        type=["pdf", "txt"],
+        help="Upload your resume in PDF or TXT format",
+        key="resume_file"
+    )
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        job_role = st.text_input(
+            "🎯 Job Role", 
+            value=st.session_state.get('role', '') or '',
+            placeholder="e.g., Software Engineer, Data Scientist"
+        )
+
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        analyze = st.button("🚀 Analyze", use_container_width=True, type="primary")
+
+    job_description = st.text_area(
+        "📋 Job Description (Optional - for better match analysis)",
+        height=150,
+        placeholder="Paste the full job description here for detailed match analysis...",
+        value=st.session_state.get('job_description', '') or ''
+    )
+
+    if not analyze:
+        return
     if not uploaded_file:
         st.error("⚠️ Please upload a resume file before analyzing.")
-        st.stop()
+        return
     if not job_role.strip():
         st.error("⚠️ Please enter the job role before analyzing your resume.")
-        st.stop()
+        return
 
     file_content = extract_text_from_file(uploaded_file)
     if not file_content.strip():
         st.error("⚠️ File doesn't contain any readable content.")
-        st.stop()
+        return
 
     st.session_state.resume = file_content.strip()
     st.session_state.role = job_role.strip()
@@ -142,25 +153,90 @@ if analyze:
     if st.session_state.analysis_signature != current_signature:
         with st.spinner("🔍 Analyzing your resume with AI..."):
             try:
-                result = analyze_resume_langgraph(
+                # One model call for analysis + job match when a JD is given
+                result, job_match = analyze_resume_and_job_fit(
                     st.session_state.resume,
                     st.session_state.role,
                     st.session_state.job_description
                 )
                 st.session_state.analysis_result = result
                 st.session_state.analysis_signature = current_signature
-                st.session_state.job_match_result = None
+                st.session_state.job_match_result = job_match
                 st.session_state.allow_mock = True
-                st.balloons()
-                st.success("✅ Analysis complete!")
+                st.session_state.just_analyzed = True
             except Exception as e:
                 st.error(f"Analysis failed: {str(e)[:200]}")
                 st.info("💡 Try again in a moment or with a shorter job description.")
-                st.stop()
+                return
+        # Redraw the results with the new analysis
+        st.rerun()
+
+input_panel()
+
+if st.session_state.pop("just_analyzed", False):
+    st.balloons()
+    st.success("✅ Analysis complete!")
+
+# ---------------- JOB MATCH ----------------
+@st.fragment
+def job_match_panel():
+    """Calculating the match only redraws this section"""
+    if st.session_state.job_description:
+        if st.session_state.job_match_result is None:
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                if st.button("📊 Calculate Job Match Score", type="primary", use_container_width=True):
+                    with st.spinner("Calculating match..."):
+                        try:
+                            st.session_state.job_match_result = analyze_job_fit(
+                                st.session_state.resume,
+                                st.session_state.job_description
+                            )
+                            st.success("✅ Match calculated!")
+                            st.rerun(scope="fragment")
+                        except Exception as e:
+                            st.error("⚠️ Match calculation failed. Try again later.")
+                            print(f"Match error: {e}")
+
+        if st.session_state.job_match_result:
+            job_match = st.session_state.job_match_result
+            score = job_match.get("match_score", 0)
+
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                if score >= 8:
+                    gradient = "linear-gradient(135deg, #84FAB0 0%, #8FD3F4 100%)"
+                    emoji = "⭐"
+                    label = "Strong Match"
+                elif score >= 5:
+                    gradient = "linear-gradient(135deg, #FFD89B 0%, #FF9A8B 100%)"
+                    emoji = "📊"
+                    label = "Moderate Match"
+                else:
+                    gradient = "linear-gradient(135deg, #FF9A9E 0%, #FECFEF 100%)"
+                    emoji = "📈"
+                    label = "Needs Improvement"
+
+                st.markdown(f"""
+                <div style='padding: 40px 30px; background: {gradient}; border-radius: 30px;
+                            text-align: center; color: white; 
+                            box-shadow: 0 15px 45px rgba(0, 0, 0, 0.3); margin: 20px 0;
+                            animation: fadeInUp 0.6s ease;'>
+                    <h1 style='margin: 0; font-size: 52px;'>{emoji} {round(score, 1)}/10</h1>
+                    <p style='margin: 15px 0 0 0; font-size: 20px;'>{label}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            st.progress(min(score / 10, 1.0))
+            st.info(f"💡 **Actionable Tip:** {job_match.get('actionable_tip', 'Keep improving!')}")
+    else:
+        st.info("💡 Add a job description above to calculate your match score!")
+
 
 # ---------------- DISPLAY ANALYSIS ----------------
 if st.session_state.analysis_result:
     result = st.session_state.analysis_result
+    uploaded_file = st.session_state.get("resume_file")
 
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("---")
@@ -207,43 +283,8 @@ if st.session_state.analysis_result:
             st.markdown("<h3 style='text-align: center;'>📊 Category-wise Score Distribution</h3>", 
                        unsafe_allow_html=True)
             
-            fig = go.Figure()
-            fig.add_trace(go.Pie(
-                labels=list(scores.keys()),
-                values=list(scores.values()),
-                hole=.35,
-                textinfo='label+percent',
-                textposition='outside',
-                textfont=dict(size=16, family="Inter", color='#2c3e50'),
-                marker=dict(
-                    colors=['#FF6B9D', '#FFC371', '#A8E6CF', '#56CCF2', '#FFD89B', '#CE93D8', '#84FAB0'],
-                    line=dict(color='#FFFFFF', width=3)
-                ),
-                pull=[0.05] * len(scores),
-                hovertemplate='<b>%{label}</b><br>Score: %{value}<br>Percentage: %{percent}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                showlegend=True,
-                height=650,
-                width=800,
-                margin=dict(t=40, b=40, l=40, r=200),
-                paper_bgcolor='rgba(0,0,0,0)',
-                legend=dict(
-                    orientation="v",
-                    yanchor="middle",
-                    y=0.5,
-                    xanchor="left",
-                    x=1.05,
-                    font=dict(size=14, family="Inter", color='#2c3e50'),
-                    bgcolor='rgba(255, 255, 255, 0.95)',
-                    bordercolor='#e0e0e0',
-                    borderwidth=2
-                ),
-                font=dict(family="Inter", size=14)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            # Built once per analysis; plotly or the lighter native chart
+            render_category_chart(scores, analysis_key(result))
     else:
         st.info("💡 Category scores not available")
 
@@ -292,57 +333,7 @@ if st.session_state.analysis_result:
     st.markdown("<h3 style='text-align: center;'>🎯 Job Match Score</h3>", 
                unsafe_allow_html=True)
 
-    if st.session_state.job_description:
-        if st.session_state.job_match_result is None:
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button("📊 Calculate Job Match Score", type="primary", use_container_width=True):
-                    with st.spinner("Calculating match..."):
-                        try:
-                            time.sleep(3)
-                            st.session_state.job_match_result = analyze_job_fit(
-                                st.session_state.resume,
-                                st.session_state.job_description
-                            )
-                            st.success("✅ Match calculated!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error("⚠️ Match calculation failed. Try again later.")
-                            print(f"Match error: {e}")
-        
-        if st.session_state.job_match_result:
-            job_match = st.session_state.job_match_result
-            score = job_match.get("match_score", 0)
-            
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if score >= 8:
-                    gradient = "linear-gradient(135deg, #84FAB0 0%, #8FD3F4 100%)"
-                    emoji = "⭐"
-                    label = "Strong Match"
-                elif score >= 5:
-                    gradient = "linear-gradient(135deg, #FFD89B 0%, #FF9A8B 100%)"
-                    emoji = "📊"
-                    label = "Moderate Match"
-                else:
-                    gradient = "linear-gradient(135deg, #FF9A9E 0%, #FECFEF 100%)"
-                    emoji = "📈"
-                    label = "Needs Improvement"
-                
-                st.markdown(f"""
-                <div style='padding: 40px 30px; background: {gradient}; border-radius: 30px;
-                            text-align: center; color: white; 
-                            box-shadow: 0 15px 45px rgba(0, 0, 0, 0.3); margin: 20px 0;
-                            animation: fadeInUp 0.6s ease;'>
-                    <h1 style='margin: 0; font-size: 52px;'>{emoji} {round(score, 1)}/10</h1>
-                    <p style='margin: 15px 0 0 0; font-size: 20px;'>{label}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.progress(min(score / 10, 1.0))
-            st.info(f"💡 **Actionable Tip:** {job_match.get('actionable_tip', 'Keep improving!')}")
-    else:
-        st.info("💡 Add a job description above to calculate your match score!")
+    job_match_panel()
 
     st.markdown("---")
 
@@ -0,0 +1,236 @@
+"""
+Cached Visualisations for the Analysis Pages
+Charts and HTML fragments built from an analysis result are pure functions
+of it, so they are built once per analysis hash with st.cache_data and
+reused on every rerun.
+
+The category chart can be drawn with plotly or with Streamlit's native
+bar chart. Plotly's frontend bundle is several MB, which dwarfs the rest
+of the page, so CHART_BACKEND=native (or a CHART_PAGE_BUDGET_KB smaller
+than that bundle) switches to the lighter chart.
+"""
+import glob
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+CHART_COLORS = ['#FF6B9D', '#FFC371', '#A8E6CF', '#56CCF2', '#FFD89B', '#CE93D8', '#84FAB0']
+
+_PLOTLY_BUNDLE_KB = 4600  # Streamlit's PlotlyChart chunk, if it can't be measured
+
+
+def analysis_key(result):
+    """Stable content hash of an analysis result"""
+    payload = json.dumps(result, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def plotly_bundle_kb():
+    """Size of the plotly chunk the browser downloads for the first plotly chart"""
+    static = os.path.join(os.path.dirname(st.__file__), "static", "static", "js")
+    chunks = glob.glob(os.path.join(static, "PlotlyChart*.js"))
+    if not chunks:
+        return _PLOTLY_BUNDLE_KB
+    return os.path.getsize(chunks[0]) // 1024
+
+
+@lru_cache(maxsize=1)
+def chart_backend():
+    """'plotly' or 'native', from CHART_BACKEND (plotly | native | auto)"""
+    backend = os.getenv("CHART_BACKEND", "auto").lower()
+    if backend in ("plotly", "native"):
+        return backend
+
+    try:
+        import plotly  # noqa: F401
+    except ImportError:
+        return "native"
+
+    budget = os.getenv("CHART_PAGE_BUDGET_KB")
+    if budget and plotly_bundle_kb() > int(budget):
+        print(f"📉 Plotly bundle ({plotly_bundle_kb()} KB) is over the page budget; using native charts")
+        return "native"
+    return "plotly"
+
+
+# ---------------- CATEGORY CHART ----------------
+
+@st.cache_data(show_spinner=False, max_entries=50)
+def category_pie_spec(key, _scores):
+    """Plotly pie of the category scores, as a figure dict (cheap to copy out of the cache)"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Pie(
+        labels=list(_scores.keys()),
+        values=list(_scores.values()),
+        hole=.35,
+        textinfo='label+percent',
+        textposition='outside',
+        textfont=dict(size=16, family="Inter", color='#2c3e50'),
+        marker=dict(
+            colors=CHART_COLORS,
+            line=dict(color='#FFFFFF', width=3)
+        ),
+        pull=[0.05] * len(_scores),
+        hovertemplate='<b>%{label}</b><br>Score: %{value}<br>Percentage: %{percent}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        showlegend=True,
+        height=650,
+        width=800,
+        margin=dict(t=40, b=40, l=40, r=200),
+        paper_bgcolor='rgba(0,0,0,0)',
+        legend=dict(
+            orientation="v",
+            yanchor="middle",
+            y=0.5,
+            xanchor="left",
+            x=1.05,
+            font=dict(size=14, family="Inter", color='#2c3e50'),
+            bgcolor='rgba(255, 255, 255, 0.95)',
+            bordercolor='#e0e0e0',
+            borderwidth=2
+        ),
+        font=dict(family="Inter", size=14)
+    )
+    return fig.to_dict()
+
+
+@st.cache_data(show_spinner=False, max_entries=50)
+def category_bar_data(key, _scores):
+    import pandas as pd
+
+    return pd.DataFrame({"Category": list(_scores.keys()), "Score": list(_scores.values())})
+
+
+def render_category_chart(scores, key):
+    """Draw the category score chart with the configured backend"""
+    if chart_backend() == "plotly":
+        st.plotly_chart(category_pie_spec(key, scores), use_container_width=True)
+    else:
+        st.bar_chart(category_bar_data(key, scores), x="Category", y="Score",
+                     color=CHART_COLORS[0], horizontal=True, height=320)
+
+
+# ---------------- DETAILED ANALYSIS ----------------
+
+def _score_band(overall_score):
+    if overall_score >= 80:
+        return "linear-gradient(135deg, #84FAB0 0%, #8FD3F4 100%)", "🌟", "Excellent"
+    if overall_score >= 60:
+        return "linear-gradient(135deg, #A8E6CF 0%, #56CCF2 100%)", "⭐", "Good"
+    if overall_score >= 40:
+        return "linear-gradient(135deg, #FFD89B 0%, #FF9A8B 100%)", "📊", "Fair"
+    return "linear-gradient(135deg, #FF9A9E 0%, #FECFEF 100%)", "📈", "Needs Work"
+
+
+def _item_html(css_class, delay, marker, text):
+    return f"""
+        <div class="{css_class} fade-in-up" style="animation-delay: {delay}s;">
+            <strong style='font-size: 18px;'>{marker}</strong> {text}
+        </div>
+        """
+
+
+def _summary_card_html(title, count, note, gradient, shadow, duration):
+    return f"""
+    <div style='padding: 30px 20px; background: {gradient};
+                border-radius: 25px; text-align: center; color: white;
+                box-shadow: 0 8px 30px {shadow};
+                transition: all 0.3s ease; animation: fadeInUp {duration}s ease;'>
+        <h3 style='margin: 0; font-size: 18px;'>{title}</h3>
+        <h1 style='margin: 15px 0 10px 0; font-size: 56px; font-weight: 800;'>{count}</h1>
+        <p style='margin: 0; font-size: 16px; opacity: 0.9;'>{note}</p>
+    </div>
+    """
+
+
+@st.cache_data(show_spinner=False, max_entries=50)
+def detailed_analysis_html(key, _result):
+    """
+    Every HTML block of the Detailed Analysis page for one analysis result.
+    Returns a dict of sections; weakness groups are (heading, [html]) pairs.
+    """
+    overall_score = _result.get('Overall_Score', 0)
+    score_color, score_emoji, score_label = _score_band(overall_score)
+
+    score_card = f"""
+<div style='padding: 40px; background: {score_color}; border-radius: 30px;
+            text-align: center; color: white; box-shadow: 0 15px 45px rgba(0, 0, 0, 0.3);
+            margin: 30px 0; position: relative; overflow: hidden;
+            animation: fadeInUp 0.8s ease;'>
+    <div style='position: relative; z-index: 1;'>
+        <h1 style='margin: 0; font-size: 72px; font-weight: 900;'>{score_emoji} {overall_score}/100</h1>
+        <p style='margin: 15px 0 0 0; font-size: 24px; font-weight: 600;'>{score_label} Resume Score</p>
+    </div>
+    <div style='position: absolute; top: -50%; left: -50%; width: 200%; height: 200%;
+                background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
+                animation: shimmer 3s infinite;'></div>
+</div>
+
+<style>
+@keyframes shimmer {{
+    0%, 100% {{ transform: translate(-50%, -50%) scale(1); opacity: 0; }}
+    50% {{ transform: translate(0%, 0%) scale(1.5); opacity: 1; }}
+}}
+</style>
+"""
+
+    strengths = _result.get("Strengths", [])
+    strength_items = [_item_html("strength-item", idx * 0.1, "✓", strength)
+                      for idx, strength in enumerate(strengths[:5], 1)]
+
+    weaknesses = _result.get("Weaknesses", {})
+    weakness_groups = []
+    if weaknesses.get("Critical"):
+        weakness_groups.append(("#### 🔴 Critical Issues (Fix Immediately)", [
+            _item_html("critical-item", idx * 0.1, "!", item)
+            for idx, item in enumerate(weaknesses["Critical"][:3], 1)]))
+    if weaknesses.get("Medium"):
+        weakness_groups.append(("#### 🟡 Medium Priority", [
+            _item_html("medium-item", (idx + 3) * 0.1, "→", item)
+            for idx, item in enumerate(weaknesses["Medium"][:3], 1)]))
+    if weaknesses.get("Low"):
+        weakness_groups.append(("#### 🟢 Low Priority (Optional)", [
+            _item_html("suggestion-item", (idx + 6) * 0.1, "•", item)
+            for idx, item in enumerate(weaknesses["Low"][:2], 1)]))
+
+    suggestions = _result.get("Suggestions", {})
+    all_suggestions = (
+        [("🔴 High Priority", item, "#FF9A9E") for item in (suggestions.get("Critical") or [])[:2]]
+        + [("🟡 Medium Priority", item, "#FFD89B") for item in (suggestions.get("Medium") or [])[:3]]
+        + [("🟢 Optional", item, "#84FAB0") for item in (suggestions.get("Low") or [])[:2]]
+    )
+    suggestion_items = [f"""
+        <div class="suggestion-item fade-in-up" style="animation-delay: {idx * 0.1}s; border-left-color: {color};">
+            <strong style='font-size: 18px; color: {color};'>{idx}. {priority}</strong><br>
+            <span style='font-size: 16px; margin-top: 8px; display: block;'>{suggestion}</span>
+        </div>
+        """ for idx, (priority, suggestion, color) in enumerate(all_suggestions, 1)]
+
+    strength_count = len(strengths)
+    total_weaknesses = len(weaknesses.get("Critical", [])) + len(weaknesses.get("Medium", []))
+    action_count = len(all_suggestions)
+    summary_cards = [
+        _summary_card_html("Strengths", strength_count, 'Great!' if strength_count > 3 else 'Build More',
+                           "linear-gradient(135deg, #84FAB0 0%, #8FD3F4 100%)", "rgba(132, 250, 176, 0.4)", 1),
+        _summary_card_html("Improvements", total_weaknesses, 'Focus Here' if total_weaknesses > 0 else 'Perfect!',
+                           "linear-gradient(135deg, #FFD89B 0%, #FF9A8B 100%)", "rgba(255, 216, 155, 0.4)", 1.2),
+        _summary_card_html("Action Items", action_count, 'Start Now' if action_count > 0 else 'All Set!',
+                           "linear-gradient(135deg, #FF6B9D 0%, #FFC371 100%)", "rgba(255, 107, 157, 0.4)", 1.4),
+    ]
+
+    return {
+        "score_card": score_card,
+        "strengths": strength_items,
+        "weakness_groups": weakness_groups,
+        "no_major_weaknesses": not weaknesses.get("Critical") and not weaknesses.get("Medium"),
+        "suggestions": suggestion_items,
+        "summary_cards": summary_cards,
+    }
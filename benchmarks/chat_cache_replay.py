@@ -0,0 +1,138 @@
+"""
+Chat Answer Cache Replay
+Replays a chat log through the old exact-prefix cache key and the
+near-duplicate services.SemanticCache, and reports hit ratio, wrong hits
+(answers reused across different questions), lookup latency and memory.
+
+The default log is synthetic: paraphrases of common career questions,
+asked by users with different roles. Pass --log with a real export (one
+question per line, or JSON lines with "question" and optional "role") to
+replay that instead; wrong hits need the synthetic labels.
+
+Run from the project root:
+    python -m benchmarks.chat_cache_replay
+    python -m benchmarks.chat_cache_replay --messages 5000 --threshold 0.75
+    python -m benchmarks.chat_cache_replay --log chat_log.jsonl
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from services.SemanticCache import SemanticCache
+
+_PARAPHRASES = {
+    "salary": ["How do I negotiate salary?", "tips for salary negotiation", "how to negotiate my salary offer",
+               "Salary negotiation advice please", "how should I negotiate a higher salary"],
+    "resume": ["How can I improve my resume?", "resume improvement tips", "how do I make my resume better",
+               "ways to improve my resume", "Improve my resume"],
+    "tech_interview": ["How do I prepare for technical interviews?", "technical interview preparation",
+                       "preparing for a technical interview", "how to prepare for technical interview rounds"],
+    "behavioral": ["How do I answer behavioral interview questions?", "behavioral interview tips",
+                   "answering behavioral questions in interviews", "tips for behavioral interview questions"],
+    "skills": ["What skills should I learn?", "which skills should I learn next", "skills to learn for my career",
+               "what skills do I need to learn"],
+    "job_search": ["How do I find a job?", "tips for finding a job", "how to search for jobs effectively",
+                   "job search strategy"],
+    "career_change": ["How do I switch careers?", "career switch advice", "tips for switching careers",
+                      "how should I approach a career switch"],
+    "portfolio": ["What projects should I put in my portfolio?", "portfolio project ideas",
+                  "which portfolio projects impress recruiters", "best projects for my portfolio"],
+    "cover_letter": ["How do I write a cover letter?", "cover letter writing tips", "writing a good cover letter",
+                     "how to write a strong cover letter"],
+    "linkedin": ["How do I improve my LinkedIn profile?", "LinkedIn profile tips", "improving my linkedin profile",
+                 "make my LinkedIn profile stand out"],
+}
+_ROLES = ["Software Engineer", "Data Analyst", "Product Manager"]
+
+
+def synthetic_log(n, seed):
+    """(question, role, label) triples; popular topics come up more often"""
+    rng = random.Random(seed)
+    labels = list(_PARAPHRASES)
+    weights = [1 / (i + 1) for i in range(len(labels))]
+    log = []
+    for _ in range(n):
+        label = rng.choices(labels, weights)[0]
+        log.append((rng.choice(_PARAPHRASES[label]), rng.choice(_ROLES), label))
+    return log
+
+
+def load_log(path):
+    log = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                log.append((record["question"], record.get("role", ""), None))
+            else:
+                log.append((line, "", None))
+    return log
+
+
+def exact_key(question, role):
+    """The chatbot's original cache key (question prefix + role)"""
+    return question.lower().strip()[:100], role[:50] if role else ""
+
+
+def replay(log, threshold, max_bytes):
+    exact = {}
+    cache = SemanticCache(threshold=threshold, max_bytes=max_bytes)
+    stats = {"exact_hits": 0, "semantic_hits": 0, "wrong_hits": 0, "lookups": []}
+
+    for question, role, label in log:
+        answer = f"{label}|{role}|{question}"
+
+        if exact_key(question, role) in exact:
+            stats["exact_hits"] += 1
+        exact[exact_key(question, role)] = answer
+
+        start = time.perf_counter()
+        cached = cache.get(question, scope=role)
+        stats["lookups"].append(time.perf_counter() - start)
+        if cached is None:
+            cache.put(question, answer, scope=role)
+        else:
+            stats["semantic_hits"] += 1
+            if label is not None and cached.split("|", 1)[0] != label:
+                stats["wrong_hits"] += 1
+
+    stats["entries"] = len(cache)
+    stats["bytes"] = cache.size
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threshold", type=float, default=None, help="similarity threshold (default: service default)")
+    parser.add_argument("--max-kb", type=int, default=2048, help="semantic cache memory cap")
+    parser.add_argument("--log", help="replay a real chat log instead of the synthetic one")
+    args = parser.parse_args()
+
+    log = load_log(args.log) if args.log else synthetic_log(args.messages, args.seed)
+    thresholds = [args.threshold] if args.threshold is not None else [0.6, 0.7, 0.8, 0.9]
+
+    print(f"{len(log)} messages, {len({(q, r) for q, r, _ in log})} distinct (question, role) pairs\n")
+    print(f"{'threshold':>10}{'exact hit%':>12}{'calls':>7}{'semantic hit%':>15}{'calls':>7}{'wrong hits':>12}"
+          f"{'p50 us':>9}{'p99 us':>9}{'entries':>9}{'KB':>7}")
+    for threshold in thresholds:
+        stats = replay(log, threshold, args.max_kb * 1024)
+        lookups = sorted(stats["lookups"])
+        p50 = statistics.median(lookups) * 1e6
+        p99 = lookups[int(0.99 * (len(lookups) - 1))] * 1e6
+        wrong = "n/a" if args.log else str(stats["wrong_hits"])
+        print(f"{threshold:>10.2f}{stats['exact_hits'] / len(log):>12.1%}{len(log) - stats['exact_hits']:>7}"
+              f"{stats['semantic_hits'] / len(log):>15.1%}{len(log) - stats['semantic_hits']:>7}"
+              f"{wrong:>12}{p50:>9.1f}{p99:>9.1f}{stats['entries']:>9}{stats['bytes'] / 1024:>7.0f}")
+
+    print("\n'calls' are the model calls each cache lets through; wrong hits are answers reused for a different question.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Agent vs Direct Engine Overhead
+Times interview turns and resume analyses through the tool-less react
+agent (LangGraph routing, checkpoint writes, streaming callbacks) and
+through the direct chat-model path. The model is a stub that answers
+instantly, so the difference is framework overhead per call.
+
+"msgs" is how many messages the model received on the last call: both
+interview engines should send the same rolling window, and both resume
+engines just the two analysis messages.
+
+Run from the project root:
+    python -m benchmarks.engine_overhead
+    python -m benchmarks.engine_overhead --turns 12 --sessions 10 --analyses 50
+"""
+import argparse
+import statistics
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from pydantic import Field
+
+from services import InterviewModel, ResumeModel
+
+MODEL = "stub-model"
+QUESTION = "Thanks. Can you walk me through how you scaled that service and what you would change today?"
+ANALYSIS = '{"Overall_Score": 72, "Strengths": ["Clear impact"], "Weaknesses": {}, "Suggestions": {}}'
+ANSWER = ("In turn %d I led the migration of our order service to Kubernetes, cut p95 latency "
+          "from 900 ms to 250 ms and set up tracing so regressions were caught before release.")
+
+
+class StubChat(FakeListChatModel):
+    """Instant chat model that records how many messages each call received"""
+    seen: list = Field(default_factory=list)
+
+    def _call(self, messages, *args, **kwargs):
+        self.seen.append(len(messages))
+        return super()._call(messages, *args, **kwargs)
+
+    def _stream(self, messages, *args, **kwargs):
+        self.seen.append(len(messages))
+        yield from super()._stream(messages, *args, **kwargs)
+
+
+_stub = StubChat(responses=[QUESTION])
+
+
+def _stub_model(model, temperature=0.2, **kwargs):
+    return _stub
+
+
+def interview_session(turns, stream):
+    """Run one interview of `turns` answers; returns per-call seconds"""
+    session = InterviewModel.InterviewSession()
+    times = []
+    for turn in range(turns + 1):
+        if turn == 0:
+            new = [SystemMessage(content="You are a professional interviewer."),
+                   HumanMessage(content="Candidate Information:\nJob Role: Backend Engineer\nResume: " + ANSWER % 0)]
+        else:
+            new = [HumanMessage(content=ANSWER % turn)]
+        start = time.perf_counter()
+        if stream:
+            reply = "".join(InterviewModel._chunk_text(chunk)
+                            for chunk, _ in InterviewModel._turn_stream(MODEL, session, new))
+        else:
+            reply = InterviewModel._interview_turn(MODEL, session, new)
+        session.record(*new, AIMessage(content=reply))  # As the service callers do
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def resume_analyses(count):
+    times = []
+    messages = [SystemMessage(content="You are a resume analysis expert."),
+                HumanMessage(content="Analyze this resume for a Backend Engineer role.\n" + ANSWER % 0)]
+    for _ in range(count):
+        start = time.perf_counter()
+        ResumeModel._analysis_reply(MODEL, messages)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarise(name, engine, times):
+    ordered = sorted(times)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    return name, engine, len(times), statistics.median(times) * 1000, p95 * 1000, _stub.seen[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=8, help="candidate answers per interview")
+    parser.add_argument("--sessions", type=int, default=5, help="interviews per engine")
+    parser.add_argument("--analyses", type=int, default=30, help="resume analyses per engine")
+    args = parser.parse_args()
+
+    InterviewModel.get_chat_model = _stub_model
+    ResumeModel.get_chat_model = _stub_model
+    ResumeModel.ANALYSIS_AVAILABLE = True
+
+    rows = []
+    for engine in ("agent", "direct"):
+        InterviewModel.INTERVIEW_ENGINE = engine
+        ResumeModel.RESUME_ENGINE = engine
+        for name, stream in (("interview turn", False), ("interview turn (stream)", True)):
+            interview_session(1, stream)  # Warm up: agent compile, lazy imports
+            times = []
+            for _ in range(args.sessions):
+                times.extend(interview_session(args.turns, stream))
+            rows.append(summarise(name, engine, times))
+        resume_analyses(1)
+        rows.append(summarise("resume analysis", engine, resume_analyses(args.analyses)))
+
+    print(f"{'call':<26}{'engine':<8}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'msgs':>6}")
+    for name, engine, calls, p50, p95, seen in sorted(rows, key=lambda r: r[0]):
+        print(f"{name:<26}{engine:<8}{calls:>7}{p50:>9.2f}{p95:>9.2f}{seen:>6}")
+
+    print()
+    by_key = {(r[0], r[1]): r[3] for r in rows}
+    for name in dict.fromkeys(r[0] for r in rows):
+        agent, direct = by_key[(name, "agent")], by_key[(name, "direct")]
+        print(f"{name}: direct saves {agent - direct:.2f} ms per call ({agent / max(direct, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Page Import-Time Budget
+Runs each page's module-level imports in a fresh interpreter under
+`python -X importtime`, records the cold-import time per page and exits
+non-zero if any page goes over its budget.
+
+Streamlit itself is imported before the page's imports and not counted
+(the server has it loaded already); pass --include-streamlit to count it.
+
+Run from the project root:
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 250 --repeat 5
+    python -m benchmarks.import_budget --record import_times.json
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_BUDGET_MS = 150
+PAGE_BUDGETS_MS = {}  # Per-page overrides, e.g. {"pages/MockInterview.py": 500}
+
+_MARKER = "@@page-imports"
+
+
+def pages():
+    return ["Home.py"] + sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))
+
+
+def page_imports(page):
+    """Source of the page's module-level import statements (including those in try blocks)"""
+    tree = ast.parse((ROOT / page).read_text(encoding="utf-8"))
+    imports = []
+    for node in tree.body:
+        candidates = [node]
+        if isinstance(node, ast.Try):
+            candidates = node.body
+        imports.extend(n for n in candidates if isinstance(n, (ast.Import, ast.ImportFrom)))
+    return "\n".join(ast.unparse(n) for n in imports)
+
+
+def parse_importtime(stderr):
+    """[(module, cumulative_us)] for the top-level imports after the marker"""
+    _, _, after = stderr.partition(_MARKER)
+    rows = []
+    for line in after.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name[1:]  # One separator space; deeper imports are indented further
+        if name.startswith(" ") or not cumulative.strip().isdigit():
+            continue
+        rows.append((name.strip(), int(cumulative)))
+    return rows
+
+
+def measure(page, include_streamlit):
+    prelude = "" if include_streamlit else "import streamlit\n"
+    code = (f"{prelude}import sys\nsys.stderr.write({_MARKER!r} + '\\n')\nsys.stderr.flush()\n"
+            + page_imports(page))
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "exit %d" % proc.returncode
+        return None, [], error
+    rows = parse_importtime(proc.stderr)
+    return sum(us for _, us in rows) / 1000, rows, ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help=f"budget for every page (default {DEFAULT_BUDGET_MS} ms, or PAGE_BUDGETS_MS)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per page (median reported)")
+    parser.add_argument("--include-streamlit", action="store_true", help="count streamlit's own import time")
+    parser.add_argument("--record", help="write the measurements to this JSON file")
+    args = parser.parse_args()
+
+    results, failed = {}, False
+    print(f"{'page':<28}{'import ms':>10}{'budget':>8}  heaviest imports")
+    for page in pages():
+        budget = args.budget_ms or PAGE_BUDGETS_MS.get(page, DEFAULT_BUDGET_MS)
+        runs, rows, error = [], [], ""
+        for _ in range(args.repeat):
+            total, rows, error = measure(page, args.include_streamlit)
+            if error:
+                break
+            runs.append(total)
+
+        if error:
+            failed = True
+            results[page] = {"error": error, "budget_ms": budget}
+            print(f"{page:<28}{'error':>10}{budget:>8.0f}  ❌ {error}")
+            continue
+
+        total = statistics.median(runs)
+        heaviest = ", ".join(f"{name} {us / 1000:.0f}" for name, us in sorted(rows, key=lambda r: -r[1])[:3])
+        status = "✅" if total <= budget else "❌"
+        failed |= total > budget
+        results[page] = {"import_ms": round(total, 1), "budget_ms": budget,
+                         "imports": {name: round(us / 1000, 1) for name, us in rows}}
+        print(f"{page:<28}{total:>10.0f}{budget:>8.0f}  {status} {heaviest}")
+
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📝 Recorded to {args.record}")
+
+    if failed:
+        print("\n❌ Import-time budget exceeded")
+        sys.exit(1)
+    print("\n✅ All pages within budget")
+
+
+if __name__ == "__main__":
+    main()
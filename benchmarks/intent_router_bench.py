@@ -0,0 +1,195 @@
+"""
+Intent Router Benchmark
+Classifies synthetic chat messages with the old chain of substring scans
+(lists rebuilt per message, then the fallback topic chain for questions
+that reach the model, as chatbot_reply used to) and with the compiled
+services.IntentRouter, and exits non-zero if any decision (intent, or
+fallback topic where the old chain computed one) differs.
+
+Two corpora are timed: "templated" repeats a few typical questions, while
+"varied" is made mostly of words no other message uses, the way real chat
+text is, so nothing the router could remember between messages helps.
+
+Run from the project root:
+    python -m benchmarks.intent_router_bench
+    python -m benchmarks.intent_router_bench --messages 200000 --seed 7
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+from services.IntentRouter import fallback_topic, route
+
+_OPENERS = ["", "", "", "hi ", "hello, ", "hey there ", "thanks! ", "good morning, ", "so ", "quick question: "]
+_BODIES = [
+    "how do I prepare for a technical interview",
+    "can you review my resume for a data analyst job",
+    "what skills should I learn to become a backend developer",
+    "where can I find a remote job and how should I search",
+    "how should I negotiate my salary offer",
+    "I want to switch from teaching to product management",
+    "what is a good portfolio project for a junior engineer",
+    "recommend a movie for tonight",
+    "what's the weather like tomorrow",
+    "tell me about politics this week",
+    "thank you so much for the help",
+    "this highlights the gap in my cv",
+    "which networking events are worth it",
+    "explain the difference between tcp and udp",
+    "is a masters degree worth it",
+]
+_PADDING = ["", "", " please", " in 2025", " for a fresher", " with 3 years of experience",
+            " at a startup", " - I'm nervous about it", " and what are the common mistakes"]
+
+
+def make_varied_corpus(n, seed):
+    """Chat-length messages where most words are new: random words mixed with question words"""
+    rng = random.Random(seed)
+    question_words = [w for body in _BODIES for w in body.split()]
+    return [
+        (rng.choice(_OPENERS) + " ".join(rng.choice(question_words) if rng.random() < 0.3 else _words(1, rng)
+                                         for _ in range(rng.randint(4, 18)))
+         + rng.choice(["?", ".", "", "!"])).strip()
+        for _ in range(n)
+    ]
+
+
+def make_corpus(n, seed):
+    rng = random.Random(seed)
+    return [
+        (rng.choice(_OPENERS) + rng.choice(_BODIES) + rng.choice(_PADDING) + rng.choice(["?", ".", "", "!"])).strip()
+        for _ in range(n)
+    ]
+
+
+def legacy_topic(question_lower):
+    """The if/elif chain that picked a canned answer in _get_fallback_response"""
+    if "interview" in question_lower:
+        return "interview"
+    elif "resume" in question_lower or "cv" in question_lower:
+        return "resume"
+    elif "skill" in question_lower or "learn" in question_lower:
+        return "skill"
+    elif "job" in question_lower and ("find" in question_lower or "search" in question_lower):
+        return "job_search"
+    elif "salary" in question_lower or "negotiate" in question_lower:
+        return "salary"
+    elif "career change" in question_lower or "switch" in question_lower or "transition" in question_lower:
+        return "career_change"
+    return "general"
+
+
+def _words(n, rng):
+    return " ".join("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+                    for _ in range(n))
+
+
+def make_edge_cases(n, seed):
+    """Vocabulary terms inside and across other words, plus random words, to check equivalence"""
+    rng = random.Random(seed)
+    terms = ["networking", "highlight", "homework", "career change", "careerchange", "jobsearch",
+             "thankful", "gamer", "cvs", "growth", "learned", "hi", "good morning"]
+    terms += [t for body in _BODIES for t in body.split()]
+    return [
+        rng.choice(["", " ", "\t"]).join(rng.choice(terms) if rng.random() < 0.6 else _words(1, rng)
+                                         for _ in range(rng.randint(1, 8)))
+        for _ in range(n)
+    ]
+
+
+def legacy_route(message):
+    """The substring chain as it was in chatbot_reply, returning (intent, topic)"""
+    question_lower = message.lower().strip()
+    greeting_words = ["hi", "hello", "hey", "good morning", "good evening", "greetings"]
+    if any(question_lower.startswith(word) for word in greeting_words):
+        return "greeting", None
+    thank_words = ["thank", "thanks", "appreciate"]
+    if any(word in question_lower for word in thank_words):
+        return "thanks", None
+    career_keywords = [
+        "job", "career", "resume", "cv", "interview", "skill", "experience",
+        "work", "professional", "employment", "application", "salary",
+        "qualification", "training", "education", "portfolio", "project",
+        "technical", "programming", "developer", "engineer", "prepare",
+        "improve", "learn", "switch", "transition", "advance", "grow"
+    ]
+    is_career_question = any(keyword in question_lower for keyword in career_keywords)
+    blocked_topics = [
+        "love", "dating", "relationship", "movie", "politics",
+        "religion", "game", "recipe", "weather", "horoscope"
+    ]
+    if not is_career_question and any(topic in question_lower for topic in blocked_topics):
+        return "blocked", None
+    return ("career" if is_career_question else "general"), legacy_topic(question_lower)
+
+
+def _timed(fn, corpus, repeat):
+    """Best of `repeat` runs: (seconds, results)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(m) for m in corpus]
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, results
+
+
+def _decisions_differ(old, new):
+    (intent, topic) = old
+    return intent != new.name or (topic is not None and topic != new.topic)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per router (best reported)")
+    args = parser.parse_args()
+
+    corpora = {
+        "templated": make_corpus(args.messages, args.seed),
+        "varied": make_varied_corpus(args.messages, args.seed),
+    }
+
+    print(f"{'corpus':<12}{'router':<10}{'msgs/s':>12}{'us/msg':>10}")
+    results = {}
+    for corpus_name, corpus in corpora.items():
+        legacy_s, legacy = _timed(legacy_route, corpus, args.repeat)
+        router_s, routed = _timed(route, corpus, args.repeat)
+        results[corpus_name] = (legacy, routed)
+        for name, seconds in (("legacy", legacy_s), ("compiled", router_s)):
+            print(f"{corpus_name:<12}{name:<10}{len(corpus) / seconds:>12,.0f}{seconds / len(corpus) * 1e6:>10.2f}")
+        print(f"{corpus_name:<12}speedup: {legacy_s / router_s:.2f}x")
+
+    routed = results["templated"][1]
+    print("\nintents:", dict(Counter(i.name for i in routed)))
+    print("topics: ", dict(Counter(i.topic for i in routed)))
+
+    edge_cases = make_edge_cases(args.messages, args.seed)
+    checked = corpora["templated"] + corpora["varied"] + edge_cases
+    legacy = results["templated"][0] + results["varied"][0] + [legacy_route(m) for m in edge_cases]
+    routed = results["templated"][1] + results["varied"][1] + [route(m) for m in edge_cases]
+    diffs = Counter(
+        (old, (new.name, new.topic), m)
+        for m, old, new in zip(checked, legacy, routed)
+        if _decisions_differ(old, new)
+    )
+    diffs.update(
+        (("topic", old), ("topic", new), m)
+        for m in checked
+        for old, new in [(legacy_topic(m.lower().strip()), fallback_topic(m))]
+        if old != new
+    )
+    if diffs:
+        print(f"\n❌ {sum(diffs.values())} of {len(checked)} messages routed differently, e.g.:")
+        for (old, new, message), count in diffs.most_common(5):
+            print(f"  {old} -> {new} x{count:<5} {message!r}")
+        sys.exit(1)
+    print(f"\n✅ Same decisions as the old chain on all {len(checked):,} messages "
+          f"({len(edge_cases):,} edge cases)")
+
+
+if __name__ == "__main__":
+    main()
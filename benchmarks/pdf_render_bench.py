@@ -0,0 +1,136 @@
+"""
+PDF Render Benchmark
+Times Q&A exports of 10 to 500 questions: the old builder (styles rebuilt
+per call, df.iterrows) against services.PdfGenerator in-thread and in the
+worker process.
+
+The worker never renders faster; what it buys is the GIL. The second
+table runs a stand-in for another user's script rerun (a ~1 ms Python task,
+repeated) during each export and reports how long those reruns take with
+the export in-thread and in the worker.
+
+Run from the project root:
+    python -m benchmarks.pdf_render_bench
+    python -m benchmarks.pdf_render_bench --sizes 10 100 500 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from datetime import datetime
+from io import BytesIO
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from services import PdfGenerator
+
+
+def legacy_qna_pdf(df, role):
+    """The builder as it was before the rendering service"""
+    pdf_buffer = BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle("title_style", parent=styles["Heading1"],
+                                 textColor=colors.HexColor("#1E88E5"), spaceAfter=12)
+    q_style = ParagraphStyle("q_style", parent=styles["Heading4"],
+                             textColor=colors.HexColor("#0D47A1"), spaceAfter=6)
+    a_style = ParagraphStyle("a_style", parent=styles["BodyText"], spaceAfter=12, leading=14)
+    meta_style = ParagraphStyle("meta_style", parent=styles["Normal"],
+                                textColor=colors.gray, fontSize=9, spaceAfter=12)
+
+    content = [
+        Paragraph(f"Interview Q&A Set for {role.title()}", title_style),
+        Paragraph(f"Generated on {datetime.now().strftime('%d %b %Y, %I:%M %p')}", meta_style),
+        Spacer(1, 10),
+    ]
+    for i, row in df.iterrows():
+        content.append(Paragraph(f"Q{i+1}. ({row.get('Category', 'General')})", q_style))
+        content.append(Paragraph(f"<b>Question:</b> {row.get('Question', '')}", styles["BodyText"]))
+        content.append(Paragraph(f"<b>Answer:</b> {row.get('Answer', '')}", a_style))
+        content.append(Spacer(1, 6))
+    doc.build(content)
+    return pdf_buffer.getvalue()
+
+
+def make_qna(n):
+    categories = ["Technical", "Behavioral", "Situational", "Role-specific"]
+    return pd.DataFrame({
+        "Category": [categories[i % len(categories)] for i in range(n)],
+        "Question": [f"How would you approach problem number {i} in a production system?" for i in range(n)],
+        "Answer": [
+            f"I would start by clarifying requirements for case {i}, then profile the system, "
+            "isolate the bottleneck, ship a small fix behind a flag and measure the result."
+            for i in range(n)
+        ],
+    })
+
+
+def time_it(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs) * 1000
+
+
+def _other_session(stop, latencies):
+    """Another session's script rerun, over and over: a ~1 ms pure-Python task"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(i * i for i in range(20_000))
+        latencies.append(time.perf_counter() - start)
+
+
+def rerun_latency(fn):
+    """p95 ms of the other session's reruns while fn() runs"""
+    stop, latencies = threading.Event(), []
+    thread = threading.Thread(target=_other_session, args=(stop, latencies))
+    thread.start()
+    try:
+        fn()
+    finally:
+        stop.set()
+        thread.join()
+    latencies.sort()
+    return latencies[int(0.95 * (len(latencies) - 1))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 250, 500])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median reported)")
+    args = parser.parse_args()
+
+    # Start the worker process before timing so spawn cost isn't counted
+    PdfGenerator.generate_qna_pdf(make_qna(1), "warm up", in_process=True)
+
+    print(f"{'questions':>10}{'legacy ms':>12}{'service ms':>12}{'worker ms':>12}{'speedup':>10}")
+    for n in args.sizes:
+        df = make_qna(n)
+        legacy = time_it(lambda: legacy_qna_pdf(df, "Software Engineer"), args.repeat)
+        service = time_it(lambda: PdfGenerator.generate_qna_pdf(df, "Software Engineer", in_process=False),
+                          args.repeat)
+        worker = time_it(lambda: PdfGenerator.generate_qna_pdf(df, "Software Engineer", in_process=True),
+                         args.repeat)
+        print(f"{n:>10}{legacy:>12.1f}{service:>12.1f}{worker:>12.1f}{legacy / service:>9.2f}x")
+
+    idle = rerun_latency(lambda: time.sleep(0.5))
+    print(f"\nOther session's rerun p95 during an export ({os.cpu_count()} CPUs, {idle:.1f} ms when idle)")
+    print(f"{'questions':>10}{'in-thread ms':>14}{'worker ms':>12}")
+    for n in args.sizes:
+        df = make_qna(n)
+        in_thread = rerun_latency(lambda: PdfGenerator.generate_qna_pdf(df, "Software Engineer", in_process=False))
+        worker = rerun_latency(lambda: PdfGenerator.generate_qna_pdf(df, "Software Engineer", in_process=True))
+        print(f"{n:>10}{in_thread:>14.1f}{worker:>12.1f}")
+
+    print(f"\nThe page uses the worker process above {PdfGenerator.LARGE_QNA_THRESHOLD} questions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Rate Limiter Simulation
+Drives the adaptive limiter against a local fake endpoint that enforces a
+per-minute quota, on a virtual clock, and reports the throughput reached.
+
+By default the quota resets at each minute boundary, as Gemini's
+requests-per-minute quota does, and a 429 says how long until the reset:
+that is the case where honouring Retry-After beats probing blind. With
+--sliding the quota is a sliding window, whose hint is usually shorter
+than the interval AIMD already backs off to, so both AIMD rows match.
+A fixed spacing only does well when it is tuned to the quota it runs at.
+
+Run from the project root:
+    python -m benchmarks.rate_limit_sim
+    python -m benchmarks.rate_limit_sim --quota 15 --minutes 30
+    python -m benchmarks.rate_limit_sim --sliding
+"""
+import argparse
+import io
+from collections import deque
+from contextlib import redirect_stdout
+
+from services.RateLimiter import AdaptiveRateLimiter, is_quota_error, parse_retry_after
+
+
+class VirtualClock:
+    """Monotonic clock whose sleep() just advances time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0)
+
+
+class FakeQuotaError(Exception):
+    pass
+
+
+class FakeQuotaEndpoint:
+    """
+    Accepts `quota` calls per `window` seconds and 429s the rest. The
+    window resets on its boundaries, or slides with sliding=True.
+    """
+
+    def __init__(self, clock, quota=15, window=60.0, send_retry_after=True, sliding=False):
+        self.clock = clock
+        self.quota = quota
+        self.window = window
+        self.send_retry_after = send_retry_after
+        self.sliding = sliding
+        self._accepted = deque()
+
+    def _in_window(self, accepted_at, now):
+        if self.sliding:
+            return now - accepted_at < self.window
+        return accepted_at // self.window == now // self.window
+
+    def call(self):
+        now = self.clock.time()
+        while self._accepted and not self._in_window(self._accepted[0], now):
+            self._accepted.popleft()
+
+        if len(self._accepted) >= self.quota:
+            # Seconds until a slot frees up: the oldest call ages out, or the window resets
+            if self.sliding:
+                retry_after = self._accepted[0] + self.window - now
+            else:
+                retry_after = self.window - now % self.window
+            hint = f" Please retry in {retry_after:.1f}s." if self.send_retry_after else ""
+            raise FakeQuotaError(f"429 RESOURCE_EXHAUSTED: quota exceeded.{hint}")
+
+        self._accepted.append(now)
+        return "ok"
+
+
+def run_adaptive(quota, minutes, send_retry_after=True, sliding=False):
+    clock = VirtualClock()
+    endpoint = FakeQuotaEndpoint(clock, quota=quota, send_retry_after=send_retry_after, sliding=sliding)
+    limiter = AdaptiveRateLimiter(name="sim", clock=clock.time, sleep=clock.sleep)
+
+    ok = throttled = 0
+    while clock.time() < minutes * 60:
+        wait = limiter.reserve()
+        clock.sleep(wait)
+        try:
+            endpoint.call()
+            limiter.record_success()
+            ok += 1
+        except FakeQuotaError as e:
+            if is_quota_error(e):
+                limiter.record_throttle(parse_retry_after(e))
+            throttled += 1
+
+    return ok, throttled, limiter.calls_per_minute
+
+
+def run_fixed(quota, minutes, interval=10.0, sliding=False):
+    """The old behaviour: a hand-tuned fixed spacing"""
+    clock = VirtualClock()
+    endpoint = FakeQuotaEndpoint(clock, quota=quota, sliding=sliding)
+    ok = throttled = 0
+    while clock.time() < minutes * 60:
+        try:
+            endpoint.call()
+            ok += 1
+        except FakeQuotaError:
+            throttled += 1
+        clock.sleep(interval)
+    return ok, throttled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quota", type=int, default=15, help="calls per minute the fake endpoint allows")
+    parser.add_argument("--minutes", type=float, default=20, help="simulated minutes to run")
+    parser.add_argument("--sliding", action="store_true", help="sliding-window quota instead of per-minute resets")
+    args = parser.parse_args()
+
+    window = "sliding window" if args.sliding else "resets each minute"
+    print(f"Fake endpoint quota: {args.quota} calls/minute ({window}), {args.minutes:.0f} simulated minutes\n")
+    print(f"{'strategy':<28}{'ok/min':>10}{'429s':>8}{'learned rpm':>14}")
+
+    for interval in (10.0, 5.0, 3.0):
+        ok, throttled = run_fixed(args.quota, args.minutes, interval, args.sliding)
+        print(f"{f'fixed {interval:.0f}s interval':<28}{ok / args.minutes:>10.1f}{throttled:>8}{'-':>14}")
+
+    adaptive = {}
+    for retry_after in (True, False):
+        with redirect_stdout(io.StringIO()):  # keep limiter logs out of the table
+            ok, throttled, rpm = run_adaptive(args.quota, args.minutes, retry_after, args.sliding)
+        adaptive[retry_after] = (ok, throttled)
+        label = "AIMD + Retry-After" if retry_after else "AIMD (no hint)"
+        print(f"{label:<28}{ok / args.minutes:>10.1f}{throttled:>8}{rpm:>14.1f}")
+
+    (hint_ok, hint_429), (blind_ok, blind_429) = adaptive[True], adaptive[False]
+    print(f"\nRetry-After: {(hint_ok - blind_ok) / args.minutes:+.1f} ok/min, "
+          f"{hint_429 - blind_429:+d} 429s vs AIMD without the hint")
+
+
+if __name__ == "__main__":
+    main()
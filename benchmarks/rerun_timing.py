@@ -0,0 +1,160 @@
+"""
+Rerun Timing Harness
+Replays widget interactions on Home and the Mock Interview page with
+Streamlit's AppTest and reports the script time per interaction: before
+(every interaction reruns the whole page) and after (an interaction inside
+an st.fragment reruns only that fragment).
+
+AppTest always executes the whole script, so fragments are timed by
+wrapping st.fragment, and AppTest's own per-run overhead (measured on an
+empty script) is subtracted from whole-page times.
+
+The background warm-up pages start (services.WarmUp) is turned off with
+WARMUP=0, so its imports and client builds are excluded from the timings.
+
+Run from the project root:
+    python -m benchmarks.rerun_timing
+    python -m benchmarks.rerun_timing --repeat 7
+"""
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_fragment_times = defaultdict(list)
+_real_fragment = st.fragment
+
+
+def _timed_fragment(func=None, **kwargs):
+    """st.fragment that also records how long each run of the body takes"""
+    def decorate(f):
+        def timed(*args, **kw):
+            start = time.perf_counter()
+            try:
+                return f(*args, **kw)
+            finally:
+                _fragment_times[f.__name__].append(time.perf_counter() - start)
+        timed.__name__ = f.__name__
+        return _real_fragment(timed, **kwargs)
+    return decorate(func) if func is not None else decorate
+
+
+ANALYSIS = {
+    "Category_Scores": {"Skills": 7, "Experience": 6, "Education": 8, "Projects": 5, "Formatting": 9},
+    "resume_skills": ["python", "django", "sql", "docker", "redis", "aws", "git"],
+    "job_required_skills": ["python", "kubernetes", "postgresql", "aws", "terraform"],
+    "skills_to_improve": ["kubernetes", "postgresql", "terraform"],
+}
+RESUME = "Jane Doe\njane@example.com\n+1 555 010 2030\n\nSKILLS\npython, django, sql, docker\n\n" + (
+    "Built and ran Django services handling 2M requests/day. " * 20)
+
+
+def home_state(at):
+    at.session_state.resume = RESUME
+    at.session_state.role = "Backend Engineer"
+    at.session_state.job_description = "Backend engineer with Python, Kubernetes and PostgreSQL."
+    at.session_state.analysis_result = ANALYSIS
+    at.session_state.analysis_signature = 1
+    at.session_state.job_match_result = {"match_score": 7, "actionable_tip": "Add a Kubernetes project."}
+    at.session_state.allow_mock = True
+
+
+def interview_state(at):
+    at.session_state.allow_mock = True
+    at.session_state.resume = RESUME
+    at.session_state.role = "Backend Engineer"
+    at.session_state.interview_active = True
+    at.session_state.chat_history = [
+        ("Interviewer" if i % 2 == 0 else "Candidate", f"Turn {i}: " + "a fairly long interview line " * 12)
+        for i in range(16)
+    ]
+
+
+# (page, state setup, [(interaction, action, fragment that reruns or None)])
+SCENARIOS = [
+    ("Home.py", home_state, [
+        ("edit job role", lambda at: at.text_input[0].set_value("Data Engineer"), "input_panel"),
+        ("edit job description", lambda at: at.text_area[0].set_value("Data engineer, Spark, Airflow."), "input_panel"),
+    ]),
+    ("pages/MockInterview.py", interview_state, [
+        ("type an answer", lambda at: at.text_input(key="manual_input").set_value("I would profile it first"),
+         "response_panel"),
+        ("toggle streamed speech", lambda at: at.toggle(key="pipelined_tts").set_value(False), "response_panel"),
+    ]),
+]
+
+
+def appt_overhead(repeat):
+    """Median wall time AppTest needs to run an (almost) empty script"""
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write("import streamlit as st\nst.write('')\n")
+    try:
+        at = AppTest.from_file(f.name, default_timeout=60)
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            at.run()
+            runs.append(time.perf_counter() - start)
+        return statistics.median(runs)
+    finally:
+        os.unlink(f.name)
+
+
+def time_interactions(page, setup, interactions, repeat, overhead):
+    at = AppTest.from_file(str(ROOT / page), default_timeout=60)
+    setup(at)
+    at.run()
+    rows = []
+    for name, action, fragment in interactions:
+        whole, parts = [], []
+        for _ in range(repeat):
+            _fragment_times.clear()
+            action(at)
+            start = time.perf_counter()
+            at.run()
+            whole.append(max(0.0, time.perf_counter() - start - overhead))
+            if fragment:
+                parts.append(sum(_fragment_times[fragment]))
+        before = statistics.median(whole) * 1000
+        after = statistics.median(parts) * 1000 if fragment else before
+        error = at.exception[0].message if at.exception else ""
+        rows.append((page, name, before, after, fragment or "whole page", error))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per interaction (median reported)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    os.environ["WARMUP"] = "0"  # Read when the pages first import services.WarmUp
+    st.fragment = _timed_fragment
+    overhead = appt_overhead(args.repeat)
+
+    rows = []
+    # The pages print a lot (TTS, routing); keep the table readable
+    with redirect_stdout(io.StringIO()):
+        for page, setup, interactions in SCENARIOS:
+            rows.extend(time_interactions(page, setup, interactions, args.repeat, overhead))
+
+    print(f"AppTest overhead subtracted: {overhead * 1000:.1f} ms per run\n")
+    print(f"{'page':<24}{'interaction':<24}{'before ms':>10}{'after ms':>10}  reruns")
+    for page, name, before, after, scope, error in rows:
+        print(f"{page:<24}{name:<24}{before:>10.1f}{after:>10.1f}  {scope}")
+        if error:
+            print(f"    ⚠️ script error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ Chatbot is now accessible only from Home page
 
 import streamlit as st
 
+from services import WarmUp
+
 
 def render_back_button():
     """Renders animated back to home button"""
@@ -20,6 +22,14 @@ def render_back_button():
     """, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False)
+def start_warm_up():
+    """Build LLM clients and agents in the background, once per server process"""
+    WarmUp.start()
+    return True
+
+
 def render_page_components():
     """Renders back button - call this in every page except Home"""
+    start_warm_up()
     render_back_button()
\ No newline at end of file
@@ -1,6 +1,8 @@
 import streamlit as st
 from pathlib import Path
 from services.ChatBotModel import chatbot_reply
+from services.ChatStore import ChatStore
+from chatbot_component import start_warm_up
 
 st.set_page_config(
     page_title="Career Assistant",
@@ -16,6 +18,7 @@ def load_css():
             st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
 load_css()
+start_warm_up()
 
 # Back button
 st.markdown("""
@@ -42,131 +45,9 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Initialize chat history
-if "bot_chat_history" not in st.session_state:
-    st.session_state.bot_chat_history = []
-
-# Welcome card
-if not st.session_state.bot_chat_history:
-    st.markdown("""
-    <div style='padding: 30px; 
-                background: linear-gradient(135deg, #FFE5EC 0%, #FFF9E6 100%);
-                border-radius: 25px; 
-                margin: 30px 0;
-                box-shadow: 0 10px 35px rgba(255, 107, 157, 0.2);
-                border: 2px solid rgba(255, 107, 157, 0.2);
-                animation: fadeInUp 0.8s ease;'>
-        <h2 style='color: #FF6B9D; margin: 0 0 20px 0; font-size: 28px;'>
-            👋 Welcome! I'm here to help you succeed
-        </h2>
-        <div style='background: white; padding: 20px; border-radius: 15px; margin: 15px 0;'>
-            <h4 style='color: #56CCF2; margin: 0 0 10px 0;'>💼 I can assist you with:</h4>
-            <ul style='margin: 10px 0; padding-left: 25px; color: #555; line-height: 2;'>
-                <li><strong>Resume Analysis:</strong> Get feedback on your resume content and structure</li>
-                <li><strong>Interview Preparation:</strong> Practice common questions and get tips</li>
-                <li><strong>Career Guidance:</strong> Explore career paths and opportunities</li>
-                <li><strong>Skill Development:</strong> Learn what skills to focus on</li>
-                <li><strong>Job Search Tips:</strong> Strategies for finding the right opportunities</li>
-            </ul>
-        </div>
-        <div style='background: linear-gradient(135deg, #A8E6CF 0%, #56CCF2 100%); 
-                    padding: 15px; border-radius: 15px; margin-top: 20px;'>
-            <p style='color: white; margin: 0; font-size: 16px; text-align: center;'>
-                💡 <strong>Tip:</strong> Ask specific questions for the best guidance!
-            </p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# Chat container
-st.markdown("<br>", unsafe_allow_html=True)
-
-# Display chat history with proper formatting
-if st.session_state.bot_chat_history:
-    st.markdown("### 💭 Conversation History")
-    
-    for sender, msg in st.session_state.bot_chat_history:
-        if sender == "You":
-            with st.chat_message("user", avatar="👤"):
-                st.markdown(msg)
-        else:
-            with st.chat_message("assistant", avatar="🤖"):
-                st.markdown(msg)
-
-# Chat input
-st.markdown("<br>", unsafe_allow_html=True)
-
-user_message = st.chat_input("💬 Ask me anything about your career journey...")
-
-if user_message:
-    # Add user message
-    st.session_state.bot_chat_history.append(("You", user_message))
-    
-    # Get bot response
-    with st.spinner("🤔 Thinking..."):
-        try:
-            response = chatbot_reply(
-                user_question=user_message,
-                resume=st.session_state.get("resume"),
-                role=st.session_state.get("role"),
-                job_description=st.session_state.get("job_description")
-            )
-            
-            # Validate response
-            if not response or len(response.strip()) < 10:
-                response = (
-                    "I understand your question! Let me help:\n\n"
-                    "For career advice, I recommend:\n"
-                    "• Research your target role requirements\n"
-                    "• Build relevant skills through practice\n"
-                    "• Network with professionals in your field\n"
-                    "• Tailor your application materials\n\n"
-                    "Could you provide more specific details?"
-                )
-        except Exception as e:
-            response = (
-                "I'm experiencing a temporary issue. Here's some quick guidance:\n\n"
-                "• Focus on relevant skill development\n"
-                "• Practice interview questions\n"
-                "• Optimize your resume for ATS\n"
-                "• Build a strong portfolio\n\n"
-                "Please try asking again in a moment! 😊"
-            )
-            print(f"Chatbot error: {e}")
-    
-    # Add bot response
-    st.session_state.bot_chat_history.append(("Bot", response))
-    st.rerun()
-
-# Action buttons
-if st.session_state.bot_chat_history:
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("🔄 New Conversation", use_container_width=True):
-            st.session_state.bot_chat_history = []
-            st.rerun()
-    
-    with col2:
-        if st.button("📥 Download Chat", use_container_width=True):
-            chat_text = "\n\n".join([f"{sender}: {msg}" for sender, msg in st.session_state.bot_chat_history])
-            st.download_button(
-                label="💾 Save as TXT",
-                data=chat_text,
-                file_name="career_assistant_chat.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-    
-    with col3:
-        if st.button("🏠 Back to Home", use_container_width=True):
-            st.switch_page("Home.py")
-
-# Quick question suggestions
-st.markdown("---")
-st.markdown("### 💡 Quick Questions to Get Started")
+# Initialize chat history (bounded: older turns are kept compressed)
+if "bot_chat_store" not in st.session_state:
+    st.session_state.bot_chat_store = ChatStore()
 
 suggestions = [
     "How can I improve my resume?",
@@ -176,30 +57,162 @@ suggestions = [
     "How do I negotiate salary?"
 ]
 
-cols = st.columns(2)
-for idx, suggestion in enumerate(suggestions):
-    with cols[idx % 2]:
-        if st.button(f"💬 {suggestion}", use_container_width=True, key=f"sugg_{idx}"):
-            st.session_state.bot_chat_history.append(("You", suggestion))
-            
+
+def get_reply(message):
+    """Ask the chatbot, falling back to general guidance on errors"""
+    try:
+        response = chatbot_reply(
+            user_question=message,
+            resume=st.session_state.get("resume"),
+            role=st.session_state.get("role"),
+            job_description=st.session_state.get("job_description")
+        )
+        
+        # Validate response
+        if not response or len(response.strip()) < 10:
+            response = (
+                "I understand your question! Let me help:\n\n"
+                "For career advice, I recommend:\n"
+                "• Research your target role requirements\n"
+                "• Build relevant skills through practice\n"
+                "• Network with professionals in your field\n"
+                "• Tailor your application materials\n\n"
+                "Could you provide more specific details?"
+            )
+    except Exception as e:
+        response = (
+            "I'm experiencing a temporary issue. Here's some quick guidance:\n\n"
+            "• Focus on relevant skill development\n"
+            "• Practice interview questions\n"
+            "• Optimize your resume for ATS\n"
+            "• Build a strong portfolio\n\n"
+            "Please try asking again in a moment! 😊"
+        )
+        print(f"Chatbot error: {e}")
+    return response
+
+
+def render_turn(sender, msg):
+    if sender == "You":
+        with st.chat_message("user", avatar="👤"):
+            st.markdown(msg)
+    else:
+        with st.chat_message("assistant", avatar="🤖"):
+            st.markdown(msg)
+
+
+store = st.session_state.bot_chat_store
+
+# Welcome card
+welcome = st.empty()
+if not store:
+    with welcome.container():
+        st.markdown("""
+        <div style='padding: 30px; 
+                    background: linear-gradient(135deg, #FFE5EC 0%, #FFF9E6 100%);
+                    border-radius: 25px; 
+                    margin: 30px 0;
+                    box-shadow: 0 10px 35px rgba(255, 107, 157, 0.2);
+                    border: 2px solid rgba(255, 107, 157, 0.2);
+                    animation: fadeInUp 0.8s ease;'>
+            <h2 style='color: #FF6B9D; margin: 0 0 20px 0; font-size: 28px;'>
+                👋 Welcome! I'm here to help you succeed
+            </h2>
+            <div style='background: white; padding: 20px; border-radius: 15px; margin: 15px 0;'>
+                <h4 style='color: #56CCF2; margin: 0 0 10px 0;'>💼 I can assist you with:</h4>
+                <ul style='margin: 10px 0; padding-left: 25px; color: #555; line-height: 2;'>
+                    <li><strong>Resume Analysis:</strong> Get feedback on your resume content and structure</li>
+                    <li><strong>Interview Preparation:</strong> Practice common questions and get tips</li>
+                    <li><strong>Career Guidance:</strong> Explore career paths and opportunities</li>
+                    <li><strong>Skill Development:</strong> Learn what skills to focus on</li>
+                    <li><strong>Job Search Tips:</strong> Strategies for finding the right opportunities</li>
+                </ul>
+            </div>
+            <div style='background: linear-gradient(135deg, #A8E6CF 0%, #56CCF2 100%); 
+                        padding: 15px; border-radius: 15px; margin-top: 20px;'>
+                <p style='color: white; margin: 0; font-size: 16px; text-align: center;'>
+                    💡 <strong>Tip:</strong> Ask specific questions for the best guidance!
+                </p>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Chat container: drawn on full runs only; the chat panel appends new turns to it
+st.markdown("<br>", unsafe_allow_html=True)
+history = st.container()
+
+if store:
+    with history:
+        st.markdown("### 💭 Conversation History")
+        if store.spilled:
+            st.caption(f"🗂️ {store.spilled} earlier messages are included in the download.")
+        for sender, msg in store.recent():
+            render_turn(sender, msg)
+
+
+@st.fragment
+def chat_panel(history, welcome):
+    """
+    Input, suggestions and actions. Sending a message reruns only this
+    fragment and appends the new exchange to the history container from the
+    last full run, so earlier turns are not redrawn (elements a fragment
+    writes outside itself stay until the next full run).
+    """
+    store = st.session_state.bot_chat_store
+
+    # Chat input
+    st.markdown("<br>", unsafe_allow_html=True)
+    user_message = st.chat_input("💬 Ask me anything about your career journey...")
+    actions = st.container()
+
+    # Quick question suggestions
+    st.markdown("---")
+    st.markdown("### 💡 Quick Questions to Get Started")
+    cols = st.columns(2)
+    for idx, suggestion in enumerate(suggestions):
+        with cols[idx % 2]:
+            if st.button(f"💬 {suggestion}", use_container_width=True, key=f"sugg_{idx}"):
+                user_message = suggestion
+
+    if user_message:
+        welcome.empty()
+        with history:
+            if not store:
+                st.markdown("### 💭 Conversation History")
+            render_turn("You", user_message)
+            store.append("You", user_message)
             with st.spinner("🤔 Thinking..."):
-                try:
-                    response = chatbot_reply(
-                        user_question=suggestion,
-                        resume=st.session_state.get("resume"),
-                        role=st.session_state.get("role"),
-                        job_description=st.session_state.get("job_description")
-                    )
-                    
-                    # Validate response
-                    if not response or len(response.strip()) < 10:
-                        response = "That's a great topic! Could you provide more details about your specific situation?"
-                except Exception as e:
-                    response = "I'm having a brief issue. Please try the question again in a moment! 😊"
-                    print(f"Chatbot error: {e}")
+                response = get_reply(user_message)
+            render_turn("Bot", response)
+            store.append("Bot", response)
+
+    # Action buttons
+    if store:
+        with actions:
+            st.markdown("<br>", unsafe_allow_html=True)
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                if st.button("🔄 New Conversation", use_container_width=True):
+                    store.clear()
+                    st.rerun()
             
-            st.session_state.bot_chat_history.append(("Bot", response))
-            st.rerun()
+            with col2:
+                # Transcript is only rebuilt (from the compressed log) when downloaded
+                st.download_button(
+                    label="📥 Download Chat",
+                    data=store.export_text,
+                    file_name="career_assistant_chat.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+            
+            with col3:
+                if st.button("🏠 Back to Home", use_container_width=True):
+                    st.switch_page("Home.py")
+
+
+chat_panel(history, welcome)
 
 # Tips section
 st.markdown("---")
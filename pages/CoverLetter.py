@@ -1,13 +1,11 @@
 import streamlit as st
 from services.CoverLetterModel import generate_cover_letter
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.units import inch
-from datetime import datetime
+from services.Deadline import DeadlineExceeded
+from services.PdfGenerator import generate_cover_letter_pdf
+from chatbot_component import start_warm_up
 
 st.set_page_config(page_title="Cover Letter Generator", page_icon="✉️", layout="centered")
+start_warm_up()
 
 st.markdown("""
 <div style='text-align: center; padding: 20px 0; animation: fadeInUp 0.6s ease;'>
@@ -47,15 +45,18 @@ if st.button("Generate Cover Letter", type="primary", use_container_width=True):
     if not job_role.strip():
         st.error("Please enter a job role.")
     else:
-        with st.spinner("Generating your cover letter..."):
-            cover_letter = generate_cover_letter(
-                resume_text=st.session_state.resume,
-                job_role=job_role,
-                company_name=company_name
-            )
-            st.session_state.cover_letter = cover_letter
-        st.success("Cover letter generated!")
-        st.rerun()
+        try:
+            with st.spinner("Generating your cover letter..."):
+                cover_letter = generate_cover_letter(
+                    resume_text=st.session_state.resume,
+                    job_role=job_role,
+                    company_name=company_name
+                )
+                st.session_state.cover_letter = cover_letter
+            st.success("Cover letter generated!")
+            st.rerun()
+        except DeadlineExceeded:
+            st.error("The AI service is taking too long right now. Please try again in a moment.")
 
 # Display cover letter
 if st.session_state.cover_letter:
@@ -70,80 +71,20 @@ if st.session_state.cover_letter:
         label_visibility="collapsed"
     )
     
-    # Function to generate PDF
-    def generate_cover_letter_pdf(cover_letter_text, job_role, company_name=""):
-        """Generate a professional PDF cover letter"""
-        pdf_buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            pdf_buffer,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
-        
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor='#2C3E50',
-            spaceAfter=30,
-            alignment=1
-        )
-        
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['BodyText'],
-            fontSize=11,
-            leading=16,
-            spaceAfter=12,
-            alignment=0
-        )
-        
-        content = []
-        
-        # Title
-        company_text = f" - {company_name}" if company_name else ""
-        title = Paragraph(f"Cover Letter: {job_role}{company_text}", title_style)
-        content.append(title)
-        content.append(Spacer(1, 0.2 * inch))
-        
-        # Date
-        date_text = datetime.now().strftime("%B %d, %Y")
-        date_para = Paragraph(f"<i>{date_text}</i>", body_style)
-        content.append(date_para)
-        content.append(Spacer(1, 0.3 * inch))
-        
-        # Cover letter content
-        paragraphs = cover_letter_text.split('\n\n')
-        for para in paragraphs:
-            if para.strip():
-                p = Paragraph(para.strip().replace('\n', '<br/>'), body_style)
-                content.append(p)
-                content.append(Spacer(1, 0.15 * inch))
-        
-        doc.build(content)
-        pdf_buffer.seek(0)
-        return pdf_buffer.getvalue()
-    
-    # Generate PDF data
-    pdf_data = generate_cover_letter_pdf(
-        st.session_state.cover_letter,
-        job_role,
-        company_name
-    )
+    # PDF export, memoised on the letter's content
+    @st.cache_data(show_spinner=False, max_entries=20)
+    def cover_letter_pdf(cover_letter_text, job_role, company_name):
+        return generate_cover_letter_pdf(cover_letter_text, job_role, company_name)
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Download button
+        cover_letter_text = st.session_state.cover_letter
         st.download_button(
             label="📄 Download as PDF",
-            data=pdf_data,
+            # Rendered only when clicked
+            data=lambda: cover_letter_pdf(cover_letter_text, job_role, company_name),
             file_name=f"Cover_Letter_{job_role.replace(' ', '_')}.pdf",
             mime="application/pdf",
             use_container_width=True
@@ -1,14 +1,9 @@
 import streamlit as st
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-import os
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from services.ResumeModel import analyze_resume_langgraph, analyze_job_fit
+from services.ResumeModel import analyze_resume_and_job_fit
+from services.PdfGenerator import generate_resume_pdf
+from services.Deadline import with_deadline
+from services.ModelRouter import invoke_prompt
 from pathlib import Path
 from chatbot_component import render_page_components
 import time
@@ -100,27 +95,12 @@ if st.session_state.original_score:
 st.markdown("---")
 
 # Rate-limited LLM
-_last_llm_call = 0
-
-def rate_limited_llm_invoke(prompt, min_interval=3):
-    """Call LLM with rate limiting"""
-    global _last_llm_call
-    current_time = time.time()
-    time_since_last = current_time - _last_llm_call
-    
-    if time_since_last < min_interval:
-        time.sleep(min_interval - time_since_last)
-    
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash-lite",
-        google_api_key=os.getenv("GEMINI_API_KEY"),
-        temperature=0.2
-    )
-    
-    _last_llm_call = time.time()
-    return llm.invoke(prompt)
+def rate_limited_llm_invoke(prompt):
+    """Call LLM through the model router (rate limited, within the current deadline)"""
+    return invoke_prompt("resume_fix", prompt, temperature=0.2)
 
 # Fix resume function
+@with_deadline("resume_fix")
 def fix_resume_with_ai(resume_text, role, job_description=""):
     prompt = f"""
     You are an expert resume writer. Rewrite this resume to be professional, ATS-friendly, and impactful.
@@ -144,6 +124,7 @@ def fix_resume_with_ai(resume_text, role, job_description=""):
     response = rate_limited_llm_invoke(prompt)
     return response.content.strip()
 
+@with_deadline("resume_fix")
 def generate_fix_suggestions(original_resume, fixed_resume):
     prompt = f"""
     Compare these resumes and list TOP 5 improvements made.
@@ -213,66 +194,10 @@ if st.session_state.fixed_resume:
     
     st.markdown("</div>", unsafe_allow_html=True)
     
-    # Generate PDF function
-    def generate_resume_pdf(resume_text, role):
-        pdf_buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            pdf_buffer,
-            pagesize=letter,
-            rightMargin=54,
-            leftMargin=54,
-            topMargin=54,
-            bottomMargin=36
-        )
-        
-        styles = getSampleStyleSheet()
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#1E3A8A'),
-            spaceAfter=12,
-            spaceBefore=16,
-            fontName='Helvetica-Bold'
-        )
-        
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['BodyText'],
-            fontSize=10,
-            leading=14,
-            spaceAfter=6,
-            fontName='Helvetica'
-        )
-        
-        content = []
-        sections = resume_text.split('\n\n')
-        
-        for section in sections:
-            if section.strip():
-                lines = section.split('\n')
-                first_line = lines[0].strip()
-                common_headings = ['SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS', 'PROJECTS', 
-                                 'CERTIFICATIONS', 'ACHIEVEMENTS', 'CONTACT']
-                
-                is_heading = (first_line.isupper() or 
-                            any(heading in first_line.upper() for heading in common_headings))
-                
-                if is_heading:
-                    content.append(Paragraph(first_line, heading_style))
-                    if len(lines) > 1:
-                        body_text = '<br/>'.join(lines[1:])
-                        content.append(Paragraph(body_text, body_style))
-                else:
-                    body_text = '<br/>'.join(lines)
-                    content.append(Paragraph(body_text, body_style))
-                
-                content.append(Spacer(1, 0.1 * inch))
-        
-        doc.build(content)
-        pdf_buffer.seek(0)
-        return pdf_buffer.getvalue()
+    # PDF export, memoised on the resume's content
+    @st.cache_data(show_spinner=False, max_entries=20)
+    def resume_pdf(resume_text, role):
+        return generate_resume_pdf(resume_text, role)
     
     # ============== ACTION BUTTONS ==============
     st.markdown("### 📥 Next Steps")
@@ -280,14 +205,12 @@ if st.session_state.fixed_resume:
     col1, col2 = st.columns(2)
     
     with col1:
-        pdf_data = generate_resume_pdf(
-            st.session_state.fixed_resume,
-            st.session_state.get('role', 'Resume')
-        )
-        
+        fixed_resume = st.session_state.fixed_resume
+        resume_role = st.session_state.get('role', 'Resume')
         st.download_button(
             label="📄 Download PDF",
-            data=pdf_data,
+            # Rendered only when clicked
+            data=lambda: resume_pdf(fixed_resume, resume_role),
             file_name=f"Improved_Resume.pdf",
             mime="application/pdf",
             use_container_width=True
@@ -305,22 +228,13 @@ if st.session_state.auto_analyzing:
             # Update to fixed resume
             st.session_state.resume = st.session_state.fixed_resume
             
-            # Re-analyze
-            new_analysis = analyze_resume_langgraph(
+            # Re-analyze + new job match in a single model call
+            new_analysis, new_job_match = analyze_resume_and_job_fit(
                 st.session_state.fixed_resume,
                 st.session_state.role,
                 st.session_state.job_description
             )
             
-            # Calculate new job match
-            new_job_match = None
-            if st.session_state.job_description:
-                time.sleep(2)  # Rate limiting
-                new_job_match = analyze_job_fit(
-                    st.session_state.fixed_resume,
-                    st.session_state.job_description
-                )
-            
             # Store improved scores
             st.session_state.improved_score = {
                 'overall': new_analysis.get('Overall_Score', 0),
@@ -1,11 +1,15 @@
+import base64
 import streamlit as st
-import asyncio
-import edge_tts
-import speech_recognition as sr
+import streamlit.components.v1 as components
 from pathlib import Path
-from services.InterviewModel import start_interview_langchain, continue_interview, get_interview_feedback
+from services.InterviewModel import (
+    start_interview_langchain, continue_interview, continue_interview_stream, get_interview_feedback,
+    scripted_lines, speculate_follow_ups, take_speculative_question, speculation_report, InterviewSession
+)
+from services.TextToSpeech import AudioCache, speak_later, speak_stream, wait_for_audio, warm_up
+from services.SpeechInput import transcribe
+from services.InterviewScoring import InterviewScorecard
 from chatbot_component import render_page_components
-import time
 
 st.set_page_config(page_title="AI Mock Interview", page_icon="🤖", layout="centered")
 
@@ -47,76 +51,140 @@ if "interview_active" not in st.session_state:
     st.session_state.interview_active = False
 if "interview_isOver" not in st.session_state:
     st.session_state.interview_isOver = False
-if "audio_counter" not in st.session_state:
-    st.session_state.audio_counter = 0
+if "tts_cache" not in st.session_state:
+    st.session_state.tts_cache = AudioCache()
+if "last_audio_key" not in st.session_state:
+    st.session_state.last_audio_key = None
+if "pending_audio" not in st.session_state:
+    st.session_state.pending_audio = None
+if "interview_session" not in st.session_state:
+    st.session_state.interview_session = InterviewSession()
+if "interview_scorecard" not in st.session_state:
+    st.session_state.interview_scorecard = InterviewScorecard()
+if "speculation" not in st.session_state:
+    st.session_state.speculation = None
+    st.session_state.speculation_turn = None
 if "interview_feedback" not in st.session_state:
     st.session_state.interview_feedback = None
+if "transcription" not in st.session_state:
+    st.session_state.transcription = None  # (recording id, text, error) of the last recording
 
-# TTS Function with rate limiting
-_last_tts_call = 0
+# Pre-render the scripted interviewer lines once per server process, so
+# fallback turns play instantly when the API is unavailable
+@st.cache_resource(show_spinner=False)
+def warm_scripted_audio():
+    warm_up(scripted_lines())
+    return True
 
-async def speak_async(text, filename="qn.mp3", voice="en-GB-RyanNeural", rate="+25%"):
-    global _last_tts_call
-    current_time = time.time()
-    if current_time - _last_tts_call < 1:
-        await asyncio.sleep(1 - (current_time - _last_tts_call))
+warm_scripted_audio()
+
+# TTS: synthesised on the background worker while the page renders;
+# audio lives in this session's cache, keyed by the line's content
+def queue_speech(text):
+    key, future = speak_later(text, st.session_state.tts_cache)
+    st.session_state.last_audio_key = key
+    st.session_state.pending_audio = future
+
+# Sentences of a streamed reply join a play queue kept by the browser page,
+# so each starts when the one before it ends and the script never waits
+# for playback
+_QUEUE_AUDIO_JS = """
+<script>
+const page = window.parent;
+const clip = "data:audio/mp3;base64,%s";
+page.interviewAudioQueue = (page.interviewAudioQueue || Promise.resolve()).then(() => new Promise(done => {
+    const audio = new page.Audio(clip);
+    audio.onended = audio.onerror = done;
+    audio.play().catch(done);
+}));
+</script>
+"""
+
+def queue_audio(audio):
+    components.html(_QUEUE_AUDIO_JS % base64.b64encode(audio).decode("ascii"), height=0)
+
+def play_streamed_reply(candidate_answer, container, chunks):
+    """
+    Pipelined turn: show and play the reply sentence by sentence while the
+    rest is still being generated/synthesised. Returns the full reply.
+    """
+    sentences = []
+    with container:
+        with st.chat_message("user", avatar="👤"):
+            st.write(candidate_answer)
+        with st.chat_message("assistant", avatar="🧑‍💼"):
+            text_slot = st.empty()
+            text_slot.write("...")
+            for sentence, future in speak_stream(chunks, st.session_state.tts_cache):
+                sentences.append(sentence)
+                text_slot.write(" ".join(sentences))
+                audio = wait_for_audio(future)
+                if audio:
+                    queue_audio(audio)
+    # Already played; don't replay it after the rerun
+    st.session_state.last_audio_key = None
+    st.session_state.pending_audio = None
+    return " ".join(sentences)
+
+def answer_turn(candidate_answer, container):
+    """Record the answer, get the interviewer's reply and detect the end"""
+    question = next((text for speaker, text in reversed(st.session_state.chat_history) if speaker == "Interviewer"), "")
+    # Scored in the background while the interviewer replies
+    st.session_state.interview_scorecard.submit(question, candidate_answer)
+    st.session_state.chat_history.append(("Candidate", candidate_answer))
     
-    try:
-        communicate = edge_tts.Communicate(text, voice=voice, rate=rate)
-        await communicate.save(filename)
-        _last_tts_call = time.time()
-        return True
-    except Exception as e:
-        print(f"TTS Error: {e}")
-        return False
-
-def speak_sync(text, filename="qn.mp3"):
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        success = loop.run_until_complete(speak_async(text, filename))
-        loop.close()
-        return success
-    except:
-        return False
-
-# Speech Recognition
-def get_audio_input():
-    r = sr.Recognizer()
-    r.energy_threshold = 4000
-    r.dynamic_energy_threshold = True
-    r.pause_threshold = 1.0
+    # A follow-up drafted while the candidate was answering, if one fits
+    drafted = None
+    if st.session_state.get("speculative_followups", False):
+        drafted = take_speculative_question(
+            candidate_answer, st.session_state.speculation, session=st.session_state.interview_session
+        )
+    st.session_state.speculation = None
     
-    try:
-        with sr.Microphone() as source:
-            st.info("🎤 Listening... Speak clearly and pause when done...")
-            with st.spinner("Calibrating..."):
-                r.adjust_for_ambient_noise(source, duration=1)
+    if st.session_state.get("pipelined_tts", True):
+        chunks = [drafted] if drafted else continue_interview_stream(
+            candidate_answer, session=st.session_state.interview_session
+        )
+        reply = play_streamed_reply(candidate_answer, container, chunks)
+    else:
+        if drafted:
+            reply = drafted
+        else:
+            with st.spinner("AI is thinking..."):
+                reply = continue_interview(candidate_answer, session=st.session_state.interview_session)
+        queue_speech(reply)
+    st.session_state.chat_history.append(("Interviewer", reply))
+    
+    if any(phrase in reply.lower() for phrase in ["not selected", "selected", "moving forward", "we will not"]):
+        st.session_state.interview_isOver = True
+
+# Speech Recognition (audio is recorded in the browser)
+def get_audio_input(recording):
+    """Transcribe a recording once; reruns reuse its text or its failure"""
+    last = st.session_state.transcription
+    if last is None or last[0] != recording.file_id:
+        text, error = "", None
+        with st.spinner("Processing..."):
             try:
-                audio = r.listen(source, timeout=3, phrase_time_limit=15)
-            except sr.WaitTimeoutError:
-                st.error("⚠️ No speech detected. Try again.")
-                return ""
-        
-        st.info("Processing...")
-        try:
-            text = r.recognize_google(audio, language="en-US")
-            st.success(f"✓ You said: {text}")
-            return text
-        except sr.UnknownValueError:
-            st.error("⚠️ Could not understand. Speak more clearly.")
-            return ""
-        except sr.RequestError:
-            st.error("⚠️ Recognition service error.")
-            return ""
-    except Exception as e:
-        st.error(f"⚠️ Microphone error: {e}")
+                text = transcribe(recording.getvalue())
+            except Exception as e:
+                print(f"Speech recognition error: {e}")
+                error = "⚠️ Recognition service error."
+        if not text and error is None:
+            error = "⚠️ Could not understand. Speak more clearly."
+        st.session_state.transcription = last = (recording.file_id, text, error)
+    
+    _, text, error = last
+    if error:
+        st.error(error)
         return ""
+    st.success(f"✓ You said: {text}")
+    return text
 
-# ============== START INTERVIEW ==============
-if not st.session_state.interview_active and not st.session_state.interview_feedback:
-    st.markdown("### 🎯 Interview Setup")
-    
+# ============== PANELS ==============
+# Typing and toggling rerun only these fragments, not the whole page
+@st.fragment
+def setup_panel():
     role = st.text_input(
         "Enter the job role:",
         value=st.session_state.get('role', ''),
@@ -125,23 +193,89 @@ if not st.session_state.interview_active and not st.session_state.interview_feed
     
     if st.button("🚀 Start Interview", use_container_width=True, type="primary"):
         if role.strip():
+            # Role-specific scripted lines render while the first question is generated
+            warm_up(scripted_lines(role.strip()), st.session_state.tts_cache)
             with st.spinner("Starting interview..."):
                 try:
-                    first_q = start_interview_langchain(role.strip(), st.session_state.resume.strip())
+                    # Fresh agent thread and question count for this interview
+                    st.session_state.interview_session = InterviewSession()
+                    first_q = start_interview_langchain(
+                        role.strip(), st.session_state.resume.strip(),
+                        session=st.session_state.interview_session
+                    )
                     st.session_state.chat_history = [("Interviewer", first_q)]
                     st.session_state.interview_active = True
                     st.session_state.interview_isOver = False
                     st.session_state.interview_feedback = None
-                    st.session_state.audio_counter += 1
-                    
-                    filename = f"qn_{st.session_state.audio_counter}.mp3"
-                    speak_sync(first_q, filename)
+                    st.session_state.interview_scorecard = InterviewScorecard(role.strip())
+                    st.session_state.interview_role = role.strip()
+                    queue_speech(first_q)
                     st.rerun()
                 except Exception as e:
                     st.error(f"Failed to start: {e}")
         else:
             st.warning("⚠️ Please enter a role first.")
 
+@st.fragment
+def response_panel(live_turn):
+    """
+    Answer controls. Toggles and typing don't redraw the transcript or
+    replay the last question; a submitted answer reruns the whole page.
+    """
+    st.markdown("---")
+    st.markdown("### 💭 Your Response")
+    st.toggle("⚡ Speak replies while they're generated", value=True, key="pipelined_tts")
+    st.toggle("🔮 Draft follow-ups while I answer", value=False, key="speculative_followups",
+              help="Uses extra API calls to cut the wait after each answer")
+
+    if st.session_state.speculative_followups:
+        # Start drafting once per interviewer question
+        turn = len(st.session_state.chat_history)
+        if st.session_state.speculation_turn != turn:
+            st.session_state.speculation = speculate_follow_ups(
+                st.session_state.get("interview_role", st.session_state.get("role", "")),
+                st.session_state.resume,
+                st.session_state.chat_history,
+                session=st.session_state.interview_session
+            )
+            st.session_state.speculation_turn = turn
+        report = speculation_report()
+        if report["hits"] + report["misses"] + report["not_ready"]:
+            st.caption(
+                f"🔮 Drafted follow-ups used {report['hit_rate']:.0%} of the time "
+                f"(~{report['saved_p50']:.1f}s saved per hit)"
+            )
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+
+    with col1:
+        # New widget per turn, so a recording is only submitted once
+        recording = st.audio_input(
+            "🎤 Record Answer", key=f"answer_audio_{len(st.session_state.chat_history)}",
+            label_visibility="collapsed"
+        )
+        if recording is not None:
+            candidate_answer = get_audio_input(recording)
+            if candidate_answer:
+                answer_turn(candidate_answer, live_turn)
+                st.rerun()
+
+    with col2:
+        manual_answer = st.text_input("Or type:", key="manual_input", label_visibility="collapsed", placeholder="Type your answer...")
+        if st.button("📤 Send", use_container_width=True) and manual_answer:
+            answer_turn(manual_answer, live_turn)
+            st.rerun()
+
+    with col3:
+        if st.button("🛑 Stop", use_container_width=True, type="secondary"):
+            st.session_state.interview_isOver = True
+            st.rerun()
+
+# ============== START INTERVIEW ==============
+if not st.session_state.interview_active and not st.session_state.interview_feedback:
+    st.markdown("### 🎯 Interview Setup")
+    setup_panel()
+
 # ============== INTERVIEW IN PROGRESS ==============
 if st.session_state.interview_active and not st.session_state.interview_feedback:
     st.markdown("---")
@@ -156,67 +290,42 @@ if st.session_state.interview_active and not st.session_state.interview_feedback
             with st.chat_message("user", avatar="👤"):
                 st.write(text)
 
+    # A streamed turn renders here, below the conversation so far
+    live_turn = st.container()
+
     # Play audio
     if st.session_state.chat_history and st.session_state.chat_history[-1][0] == "Interviewer":
-        audio_file = f"qn_{st.session_state.audio_counter}.mp3"
-        try:
-            st.audio(audio_file, autoplay=True)
-        except:
-            pass
+        audio_bytes = None
+        pending = st.session_state.pending_audio
+        if pending is not None:
+            # The transcript above is already on screen while we wait
+            if pending.done():
+                audio_bytes = wait_for_audio(pending)
+            else:
+                with st.spinner("🔊 Preparing audio..."):
+                    audio_bytes = wait_for_audio(pending)
+            st.session_state.pending_audio = None
+        elif st.session_state.last_audio_key:
+            audio_bytes = st.session_state.tts_cache.get(st.session_state.last_audio_key)
+        if audio_bytes:
+            st.audio(audio_bytes, format="audio/mp3", autoplay=True)
 
     # Input Options
     if not st.session_state.interview_isOver:
-        st.markdown("---")
-        st.markdown("### 💭 Your Response")
-        
-        col1, col2, col3 = st.columns([2, 2, 1])
-        
-        with col1:
-            if st.button("🎤 Record Answer", use_container_width=True):
-                candidate_answer = get_audio_input()
-                if candidate_answer:
-                    st.session_state.chat_history.append(("Candidate", candidate_answer))
-                    with st.spinner("AI is thinking..."):
-                        time.sleep(2)
-                        reply = continue_interview(candidate_answer)
-                    st.session_state.chat_history.append(("Interviewer", reply))
-                    st.session_state.audio_counter += 1
-                    filename = f"qn_{st.session_state.audio_counter}.mp3"
-                    speak_sync(reply, filename)
-                    
-                    if any(phrase in reply.lower() for phrase in ["not selected", "selected", "moving forward", "we will not"]):
-                        st.session_state.interview_isOver = True
-                    st.rerun()
-        
-        with col2:
-            manual_answer = st.text_input("Or type:", key="manual_input", label_visibility="collapsed", placeholder="Type your answer...")
-            if st.button("📤 Send", use_container_width=True) and manual_answer:
-                st.session_state.chat_history.append(("Candidate", manual_answer))
-                with st.spinner("AI thinking..."):
-                    time.sleep(2)
-                    reply = continue_interview(manual_answer)
-                st.session_state.chat_history.append(("Interviewer", reply))
-                st.session_state.audio_counter += 1
-                filename = f"qn_{st.session_state.audio_counter}.mp3"
-                speak_sync(reply, filename)
-                
-                if any(phrase in reply.lower() for phrase in ["not selected", "selected", "moving forward", "we will not"]):
-                    st.session_state.interview_isOver = True
-                st.rerun()
-        
-        with col3:
-            if st.button("🛑 Stop", use_container_width=True, type="secondary"):
-                st.session_state.interview_isOver = True
-                st.rerun()
+        response_panel(live_turn)
 
     # Generate Feedback
     if st.session_state.interview_isOver and not st.session_state.interview_feedback:
         with st.spinner("📊 Generating detailed feedback..."):
-            time.sleep(2)
-            feedback = get_interview_feedback(
-                st.session_state.chat_history,
+            # Answers were scored as the interview went; aggregating is instant
+            feedback = st.session_state.interview_scorecard.summary(
                 st.session_state.get('role', 'Unknown Role')
             )
+            if feedback is None:
+                feedback = get_interview_feedback(
+                    st.session_state.chat_history,
+                    st.session_state.get('role', 'Unknown Role')
+                )
             st.session_state.interview_feedback = feedback
         st.rerun()
 
@@ -309,7 +418,10 @@ if st.session_state.interview_feedback:
         st.session_state.interview_active = False
         st.session_state.interview_isOver = False
         st.session_state.interview_feedback = None
-        st.session_state.audio_counter = 0
+        st.session_state.last_audio_key = None
+        st.session_state.pending_audio = None
+        st.session_state.speculation = None
+        st.session_state.speculation_turn = None
         st.rerun()
 
 # ============== TIPS ==============
@@ -1,9 +1,11 @@
 import streamlit as st
-import pandas as pd
 from services.QnAGeneratorModel import generate_qna_from_resume
 from services.PdfGenerator import generate_qna_pdf
 from pathlib import Path
 from chatbot_component import render_page_components
+from services.LazyImport import lazy_import
+
+pd = lazy_import("pandas")  # Loaded when the first Q&A set is shown
 
 st.set_page_config(page_title="AI Q&A Generator", page_icon="📘", layout="wide")
 
@@ -16,6 +18,11 @@ def load_css():
 
 load_css()
 
+# PDF export, memoised on the Q&A content so reruns never re-run ReportLab
+@st.cache_data(show_spinner=False, max_entries=20)
+def qna_pdf(df, role):
+    return generate_qna_pdf(df, role)
+
 # Add specific CSS for Q&A display with proper text visibility
 st.markdown("""
 <style >
@@ -154,14 +161,13 @@ if st.session_state.qa_set:
     st.markdown("---")
     st.markdown("### 📥 Export & Actions")
     
-    pdf_data = generate_qna_pdf(df, role)
-    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.download_button(
             label="📄 Download PDF",
-            data=pdf_data,
+            # Rendered only when clicked, then memoised on the Q&A content
+            data=lambda: qna_pdf(df, role),
             file_name=f"{role.replace(' ', '_')}_QnA.pdf",
             mime="application/pdf",
             use_container_width=True
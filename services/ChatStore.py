@@ -0,0 +1,84 @@
+"""
+Windowed Chat History
+Keeps the most recent turns of a conversation in a ring buffer and spills
+older ones into a zlib-compressed log held by the same session, so memory
+stays bounded however long the chat runs. Pages render only the window;
+the full conversation is rebuilt only when it is exported.
+"""
+import json
+import threading
+import zlib
+from collections import deque
+
+DEFAULT_WINDOW = 40  # Turns kept uncompressed (20 exchanges)
+
+
+class ChatStore:
+    """
+    Ring buffer of (sender, message) turns plus a compressed spill log of
+    everything that has scrolled out of it. Keep one per Streamlit session
+    (in st.session_state).
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._reset_spill()
+
+    def _reset_spill(self):
+        self._compressor = zlib.compressobj(level=6)
+        self._spill = []  # Compressed chunks of JSON lines, in order
+        self.spilled = 0
+
+    def append(self, sender, message):
+        with self._lock:
+            self._recent.append((sender, message))
+            # Oldest turns leave the window and go to the compressed log
+            while len(self._recent) > self.window:
+                line = json.dumps(self._recent.popleft(), ensure_ascii=False) + "\n"
+                chunk = self._compressor.compress(line.encode("utf-8"))
+                if chunk:
+                    self._spill.append(chunk)
+                self.spilled += 1
+
+    def __len__(self):
+        return self.spilled + len(self._recent)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def recent(self, n=None):
+        """The last n turns (default: the whole window), oldest first"""
+        with self._lock:
+            turns = list(self._recent)
+        return turns if n is None else turns[-n:]
+
+    def _spilled_turns(self):
+        with self._lock:
+            # Flush a copy so the live compressor can keep appending
+            data = b"".join(self._spill) + self._compressor.copy().flush()
+        if not data:
+            return []
+        return [tuple(json.loads(line)) for line in zlib.decompress(data).decode("utf-8").splitlines()]
+
+    def all_turns(self):
+        """Every turn of the conversation, oldest first"""
+        spilled = self._spilled_turns()
+        return spilled + self.recent()
+
+    def export_text(self):
+        """Plain-text transcript of the whole conversation"""
+        return "\n\n".join(f"{sender}: {message}" for sender, message in self.all_turns())
+
+    @property
+    def memory_bytes(self):
+        """Rough in-memory size: window text plus compressed log"""
+        with self._lock:
+            recent = sum(len(m) + len(s) for s, m in self._recent)
+            return recent + sum(len(c) for c in self._spill)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._reset_spill()
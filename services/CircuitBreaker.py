@@ -0,0 +1,165 @@
+"""
+Shared Circuit Breaker for Gemini API Calls
+Opens after repeated quota / timeout errors so callers skip straight to
+their local fallbacks instead of waiting on rate-limit sleeps and timeouts
+"""
+import threading
+import time
+from functools import wraps
+
+from services.Deadline import DeadlineExceeded
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Errors that mean "the API cannot serve us right now"
+_TRIP_MARKERS = [
+    "429", "resource_exhausted", "resource exhausted", "quota", "rate limit",
+    "timeout", "timed out", "deadline exceeded", "deadline_exceeded", "504"
+]
+
+
+def is_trip_error(error):
+    """Return True for errors that should count towards opening the breaker"""
+    if isinstance(error, DeadlineExceeded):
+        # The caller's own budget ran out; that says nothing about the API
+        return False
+    if isinstance(error, TimeoutError):
+        return True
+    error_msg = f"{type(error).__name__} {error}".lower()
+    return any(marker in error_msg for marker in _TRIP_MARKERS)
+
+
+class CircuitBreaker:
+    """
+    Closed -> Open after `failure_threshold` consecutive trip errors.
+    Open -> Half-open once `cooldown` seconds have passed; exactly one
+    probe call is let through. Probe success closes the breaker, probe
+    failure re-opens it for another cool-down.
+    """
+
+    def __init__(self, name="gemini", failure_threshold=3, cooldown=60.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe = None
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def allow_request(self):
+        """
+        Return False to use the fallback, otherwise a truthy ticket: True
+        while closed, or the half-open probe's own ticket for release_probe()
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.cooldown:
+                    return False
+                self._state = HALF_OPEN
+                self._probe = None
+
+            # Half-open: a single probe at a time
+            if self._probe is not None:
+                return False
+            self._probe = object()
+            print(f"🔌 Circuit '{self.name}' half-open: sending probe call")
+            return self._probe
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                print(f"✅ Circuit '{self.name}' closed: API is responding again")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe = None
+
+    def record_failure(self, error):
+        """Count a failed call; non quota/timeout errors only release a probe"""
+        with self._lock:
+            if not is_trip_error(error):
+                self._probe = None
+                return
+
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._trip()
+
+    def release_probe(self, ticket):
+        """Free the half-open probe slot if `ticket` (from allow_request) still holds it"""
+        with self._lock:
+            if self._probe is ticket:
+                self._probe = None
+
+    def reset(self):
+        """Force the breaker closed (useful for testing)"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = 0.0
+            self._probe = None
+
+    def _trip(self):
+        # Caller must hold the lock
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe = None
+        print(f"🚨 Circuit '{self.name}' open: skipping API calls for {self.cooldown:.0f}s")
+
+
+# Shared breaker used by every Gemini-backed service
+gemini_breaker = CircuitBreaker()
+
+# Per-model breakers used by the model router to spill over between models
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Return the breaker for one model (created on first use)"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name=name)
+        return _breakers[name]
+
+
+def circuit_breaker(fallback, breaker=None):
+    """
+    Decorator that returns `fallback(*args, **kwargs)` without calling the
+    wrapped function while the breaker is open. Place it above @cached and
+    the routed call so an open circuit also skips the rate-limit waits.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            active = breaker or gemini_breaker
+            ticket = active.allow_request()
+            if not ticket:
+                print(f"⚡ Circuit open - using fallback for {func.__name__}")
+                return fallback(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Cache hits never report an outcome; don't hold the probe
+                # slot (only frees it if this call is the probe)
+                active.release_probe(ticket)
+        return wrapper
+    return decorator
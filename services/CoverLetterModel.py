@@ -1,18 +1,12 @@
 #  ------------- old claude version without ui ----------
-import os
 from dotenv import load_dotenv
-from services.RateLimiter import rate_limit, cached
-from langchain_google_genai import ChatGoogleGenerativeAI
+from services.RateLimiter import cached
+from services.Deadline import with_deadline
+from services.ModelRouter import invoke_prompt
 
 load_dotenv()
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash-lite",
-    google_api_key=os.getenv("GEMINI_API_KEY"),
-    temperature=0.2
-)
-
-@rate_limit 
+@with_deadline("cover_letter")
 @cached
 def generate_cover_letter(resume_text, job_role, company_name=""):
     """
@@ -22,6 +16,7 @@ def generate_cover_letter(resume_text, job_role, company_name=""):
         resume_text (str): Full resume content
         job_role (str): Target job role
         company_name (str): Company name (optional)
+        timeout (float): Latency budget in seconds (optional, keyword only)
     
     Returns:
         str: Cover letter text
@@ -54,5 +49,5 @@ def generate_cover_letter(resume_text, job_role, company_name=""):
     Write ONLY the cover letter content.
     """
     
-    response = llm.invoke(prompt)
+    response = invoke_prompt("cover_letter", prompt, temperature=0.2)
     return response.content.strip()
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Deadline Propagation for Service Calls
+Each feature gets a latency budget; the rate-limiter wait, retries and the
+network call all draw from it. When it runs out the service returns its
+fallback and the stage that used up the time is recorded.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from functools import wraps
+
+from services import Metrics
+
+# ============= LATENCY SLOs (seconds) =============
+FEATURE_SLOS = {
+    "chat": 8.0,
+    "interview_question": 10.0,
+    "analysis": 30.0,
+    "job_fit": 10.0,
+    "qna": 45.0,
+    "cover_letter": 30.0,
+    "resume_fix": 45.0,
+    "interview_feedback": 20.0,
+}
+DEFAULT_BUDGET = 30.0
+
+_TRANSIENT_MARKERS = ["500", "502", "503", "unavailable", "internal error", "connection reset"]
+
+_current_deadline = contextvars.ContextVar("current_deadline", default=None)
+
+# Network calls run here so the caller can stop waiting when the budget ends
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-call")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a feature's latency budget runs out"""
+
+    def __init__(self, feature, stage, budget, stages):
+        self.feature = feature
+        self.stage = stage
+        self.budget = budget
+        self.stages = dict(stages)
+        super().__init__(f"'{feature}' used up its {budget:.1f}s budget during '{stage}'")
+
+
+class Deadline:
+    """
+    Latency budget for one service call. Use as a context manager so nested
+    helpers can find it with current_deadline(); a nested deadline never
+    outlives the one around it.
+    """
+
+    def __init__(self, feature, budget=None, clock=time.monotonic):
+        self.feature = feature
+        self.budget = budget if budget is not None else FEATURE_SLOS.get(feature, DEFAULT_BUDGET)
+        parent = _current_deadline.get()
+        if parent is not None:
+            self.budget = min(self.budget, parent.remaining())
+        self._clock = clock
+        self._start = clock()
+        self._token = None
+        self.stages = {}
+        self.exceeded_stage = None
+
+    def elapsed(self):
+        return self._clock() - self._start
+
+    def remaining(self):
+        return max(0.0, self.budget - self.elapsed())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    @contextmanager
+    def stage(self, name):
+        """Attribute the time spent in this block to `name`"""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (self._clock() - start)
+
+    def exceeded(self, stage):
+        """Record the overrun and return the exception for the caller to raise"""
+        self.exceeded_stage = stage
+        Metrics.increment("deadline_exceeded", feature=self.feature, stage=stage)
+        Metrics.record_event("deadline_exceeded", feature=self.feature, stage=stage,
+                             budget=self.budget, stages=dict(self.stages))
+        timings = ", ".join(f"{k}={v:.1f}s" for k, v in self.stages.items())
+        print(f"⏰ {self.feature}: {self.budget:.1f}s budget ran out in '{stage}' ({timings})")
+        return DeadlineExceeded(self.feature, stage, self.budget, self.stages)
+
+    def __enter__(self):
+        self._token = _current_deadline.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_deadline.reset(self._token)
+        elapsed = self.elapsed()
+        Metrics.observe("feature_latency", elapsed, feature=self.feature)
+        if elapsed > self.budget or self.exceeded_stage:
+            Metrics.increment("slo_miss", feature=self.feature)
+        return False
+
+
+def current_deadline():
+    """Return the Deadline of the service call in progress, if any"""
+    return _current_deadline.get()
+
+
+def with_deadline(feature, fallback=None):
+    """
+    Decorator adding a `timeout=` keyword (seconds) to a service function.
+    Defaults to the feature's SLO. On overrun returns `fallback(*args, **kwargs)`
+    or re-raises DeadlineExceeded when the service has no fallback.
+    Place it outermost so every other decorator runs inside the budget.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, timeout=None, **kwargs):
+            with Deadline(feature, timeout):
+                try:
+                    return func(*args, **kwargs)
+                except DeadlineExceeded:
+                    if fallback is None:
+                        raise
+                    return fallback(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _is_transient(error):
+    error_msg = str(error).lower()
+    return any(marker in error_msg for marker in _TRANSIENT_MARKERS)
+
+
+def call_with_deadline(fn, *args, retries=1, **kwargs):
+    """
+    Run a network call within the current deadline (no deadline = plain call).
+    Transient 5xx-style errors are retried while budget remains.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return fn(*args, **kwargs)
+
+    attempt = 0
+    while True:
+        stage = "network" if attempt == 0 else "retry"
+        if deadline.expired:
+            raise deadline.exceeded(stage)
+
+        timed_out = False
+        with deadline.stage(stage):
+            future = _executor.submit(fn, *args, **kwargs)
+            try:
+                return future.result(timeout=deadline.remaining())
+            except FutureTimeout:
+                # The call keeps running in the pool; we just stop waiting
+                future.cancel()
+                timed_out = True
+            except Exception as e:
+                if attempt >= retries or not _is_transient(e) or deadline.remaining() < 1.0:
+                    raise
+                print(f"🔁 Transient error, retrying within budget: {e}")
+
+        if timed_out:
+            raise deadline.exceeded(stage)
+        attempt += 1
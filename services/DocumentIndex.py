@@ -0,0 +1,85 @@
+"""
+Resume / Job Description Retrieval for the Chatbot
+The user's resume and job description are split into small overlapping
+chunks and indexed with BM25, once per content hash. Each chat question
+pulls only the few chunks relevant to it into the prompt, so answers are
+personalised without sending whole documents to the model.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from services.KnowledgeBase import BM25Index
+from services.SemanticCache import tokenize
+
+_CHUNK_WORDS = 60      # Words per chunk
+_CHUNK_OVERLAP = 15    # Words shared by neighbouring chunks
+_MAX_CHUNK_CHARS = 400
+_MAX_INDEXES = 32      # Distinct (resume, JD) pairs kept in memory
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def chunk_document(text, max_words=_CHUNK_WORDS, overlap=_CHUNK_OVERLAP):
+    """Split on blank lines (resume sections), then into overlapping word windows"""
+    chunks = []
+    for section in re.split(r"\n\s*\n", text or ""):
+        words = section.split()
+        if not words:
+            continue
+        step = max(1, max_words - overlap)
+        for start in range(0, len(words), step):
+            chunks.append(" ".join(words[start:start + max_words])[:_MAX_CHUNK_CHARS])
+            if start + max_words >= len(words):
+                break
+    return chunks
+
+
+class DocumentIndex:
+    """BM25 over the chunks of one resume and job description"""
+
+    def __init__(self, resume="", job_description=""):
+        self.chunks = (
+            [("Resume", c) for c in chunk_document(resume)]
+            + [("Job description", c) for c in chunk_document(job_description)]
+        )
+        self._index = BM25Index([tokenize(text) for _, text in self.chunks])
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def search(self, question, k=3):
+        """Top-k (source, chunk) pairs for the question, best first"""
+        if not self.chunks:
+            return []
+        return [self.chunks[i] for i, _ in self._index.search(tokenize(question), k)]
+
+
+def content_key(resume, job_description):
+    return hashlib.sha256(f"{resume or ''}\x00{job_description or ''}".encode("utf-8")).hexdigest()
+
+
+def get_index(resume, job_description=None):
+    """Index for this resume/JD pair, built on first use and kept LRU"""
+    key = content_key(resume, job_description)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+
+    index = DocumentIndex(resume or "", job_description or "")
+    with _lock:
+        _indexes[key] = index
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def relevant_chunks(question, resume=None, job_description=None, k=3):
+    """The k chunks of the user's documents most relevant to the question"""
+    if not resume and not job_description:
+        return []
+    return get_index(resume, job_description).search(question, k)
@@ -0,0 +1,157 @@
+"""
+Compiled Intent Router for the Career Chatbot
+Every keyword the chatbot's no-API paths look for (thanks, career terms,
+off-topic subjects, fallback topics) is compiled at import into one bit
+per term and one mask per label. Terms match anywhere in the message, as
+the old `any(word in question_lower ...)` chain did ("networking" counts
+as career through "work"), and the intent is decided from the mask with
+the same precedence.
+
+All terms are compiled into one regex shaped like a trie (shared prefixes
+merged), so a message is scanned once instead of once per term. At each
+position the regex takes the longest term; the terms inside that match
+come with its mask, and the next search starts one character later so
+overlapping terms are found too. Decisions are cached per mask.
+"""
+import re
+from functools import lru_cache, reduce
+from operator import or_
+
+# ============= VOCABULARY =============
+# Greetings only count at the start of the message
+GREETINGS = ("hi", "hello", "hey", "good morning", "good evening", "greetings")
+
+# label -> terms that count towards it
+_VOCABULARY = {
+    "thanks": ["thank", "thanks", "appreciate"],
+    "career": [
+        "job", "career", "resume", "cv", "interview", "skill", "experience",
+        "work", "professional", "employment", "application", "salary",
+        "qualification", "training", "education", "portfolio", "project",
+        "technical", "programming", "developer", "engineer", "prepare",
+        "improve", "learn", "switch", "transition", "advance", "grow",
+    ],
+    "blocked": [
+        "love", "dating", "relationship", "movie", "politics",
+        "religion", "game", "recipe", "weather", "horoscope",
+    ],
+    # Fallback topics (see TOPIC_RULES)
+    "interview": ["interview"],
+    "resume": ["resume", "cv"],
+    "skill": ["skill", "learn"],
+    "job": ["job"],
+    "search": ["find", "search"],
+    "salary": ["salary", "negotiate"],
+    "career_change": ["career change", "switch", "transition"],
+}
+
+# Checked in order; a topic wins when every group has at least one term
+TOPIC_RULES = [
+    ("interview", ["interview"]),
+    ("resume", ["resume"]),
+    ("skill", ["skill"]),
+    ("job_search", ["job", "search"]),
+    ("salary", ["salary"]),
+    ("career_change", ["career_change"]),
+]
+
+# Every term is one bit; a label's mask is the OR of its terms' bits
+_TERM_BITS = {term: 1 << i for i, term in enumerate(sorted({t for ts in _VOCABULARY.values() for t in ts}))}
+_LABELS = {label: reduce(or_, map(_TERM_BITS.__getitem__, terms)) for label, terms in _VOCABULARY.items()}
+_TOPIC_MASKS = [(topic, [_LABELS[label] for label in groups]) for topic, groups in TOPIC_RULES]
+_THANKS, _CAREER, _BLOCKED = _LABELS["thanks"], _LABELS["career"], _LABELS["blocked"]
+
+
+def _trie_pattern(terms):
+    """Regex matching any of `terms`, longest first, with common prefixes merged"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # A term ends here
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+_ANY_TERM = re.compile(_trie_pattern(_TERM_BITS))
+# A matched term also contains the shorter terms inside it ("thanks" -> "thank")
+_TERM_MASKS = {
+    term: reduce(or_, (bit for inner, bit in _TERM_BITS.items() if inner in term))
+    for term in _TERM_BITS
+}
+
+
+class Intent:
+    """
+    Result of routing one message (shared between messages; don't modify).
+    name: greeting | thanks | blocked | career | general
+    confidence: 0-1, how clearly the message's terms point at `name`
+    topic: fallback topic for canned/offline answers (see TOPIC_RULES)
+    """
+
+    __slots__ = ("name", "confidence", "topic")
+
+    def __init__(self, name, confidence, topic):
+        self.name = name
+        self.confidence = confidence
+        self.topic = topic
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, confidence={self.confidence}, topic={self.topic!r})"
+
+
+def _count(mask):
+    return bin(mask).count("1")
+
+
+# Greetings win before anything else is looked at, as in the old chain
+_GREETING_INTENT = Intent("greeting", 1.0, "general")
+
+
+@lru_cache(maxsize=4096)
+def _decide(mask):
+    """Intent for a message's term mask, with the old chain's precedence"""
+    topic = next((t for t, groups in _TOPIC_MASKS if all(mask & g for g in groups)), "general")
+    career = _count(mask & _CAREER)
+
+    if mask & _THANKS:
+        # Confidence: share of the terms that are thanks rather than career terms
+        thanks = _count(mask & _THANKS)
+        return Intent("thanks", round(thanks / (thanks + career), 2), topic)
+    if mask & _BLOCKED and not career:
+        return Intent("blocked", 1.0, topic)
+    if career:
+        return Intent("career", min(1.0, 0.5 + 0.25 * career), topic)
+    return Intent("general", 0.0, topic)
+
+
+def _mask(text):
+    """Bits of every vocabulary term in the (lower-cased) message, in one scan"""
+    mask = 0
+    search = _ANY_TERM.search
+    found = search(text)
+    while found:
+        mask |= _TERM_MASKS[found.group()]
+        found = search(text, found.start() + 1)
+    return mask
+
+
+def route(message):
+    """Classify a chat message"""
+    text = message.lower().strip()
+    if text.startswith(GREETINGS):
+        return _GREETING_INTENT
+    return _decide(_mask(text))
+
+
+def fallback_topic(message):
+    """Just the fallback topic for a message (greetings included)"""
+    return _decide(_mask(message.lower().strip())).topic
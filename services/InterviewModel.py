@@ -1,44 +1,250 @@
-import os
 import json
+import os
 import re
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from services.RateLimiter import rate_limit, cached
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.prebuilt import create_react_agent
-from langchain_core.messages import HumanMessage, SystemMessage
+from services import Metrics
+from services.RateLimiter import cached
+from services.CircuitBreaker import circuit_breaker, gemini_breaker
+from services.Deadline import Deadline, with_deadline
+from services.LazyImport import lazy_import
+from services.ModelRouter import get_chat_model, invoke_routed, invoke_prompt, route
+
+# LangGraph / LangChain are imported on the first interview turn
+_prebuilt = lazy_import("langgraph.prebuilt")
+_checkpoint = lazy_import("langgraph.checkpoint.memory")
+_messages = lazy_import("langchain_core.messages")
 
 load_dotenv()
 
-# ============= ENHANCED RATE LIMITING =============
-_last_interview_call = 0
-_min_interview_interval = 5  # 5 seconds between interview calls
+# ============= MODEL ROUTING =============
+# The router picks the model (and rate limits it) per turn.
+# INTERVIEW_ENGINE=direct (default): each InterviewSession keeps its own
+# message list and every turn is one chat-model call on it.
+# INTERVIEW_ENGINE=agent: a tool-less react agent per model, all sharing one
+# checkpointer so the conversation carries on whichever model answers. Both
+# are built on first use.
+INTERVIEW_ENGINE = os.getenv("INTERVIEW_ENGINE", "direct").lower()
+memory = None
+_agents = {}
+_agents_lock = threading.Lock()
 
-def _rate_limit_interview():
-    """Enforce 5 second interval between interview API calls"""
-    global _last_interview_call
-    current_time = time.time()
-    time_since_last = current_time - _last_interview_call
-    
-    if time_since_last < _min_interview_interval:
-        sleep_time = _min_interview_interval - time_since_last
-        print(f"⏳ Interview rate limit: waiting {sleep_time:.1f}s")
-        time.sleep(sleep_time)
-    
-    _last_interview_call = time.time()
+# ============= ROLLING MEMORY =============
+# The session (or checkpointer) keeps the full transcript, but the model
+# only sees the system prompt, the candidate info, a running summary of
+# older turns and the last few turns verbatim, capped at a fixed token
+# budget per call.
+ROLLING_MEMORY = os.getenv("INTERVIEW_ROLLING_MEMORY", "1") != "0"
+_RECENT_TURNS = 3              # Question/answer pairs kept verbatim
+_MAX_PROMPT_TOKENS = 1800      # Upper bound on what one turn sends
+_LLM_SUMMARY = os.getenv("INTERVIEW_LLM_SUMMARY", "").lower() in ("1", "true", "yes")
+_SUMMARY_EVERY = 3             # Re-summarise with the model after this many new older turns
 
+_summaries = {}                # thread_id -> (messages covered, summary text)
+_summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interview-summary")
 
-# Use stable model
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.5-flash-8b",  # Most stable free model
-    google_api_key=os.getenv("GEMINI_API_KEY"),
-    temperature=0.3,
-    request_timeout=30
-)
+def _tokens(text):
+    # Rough estimate, good enough for a budget: ~4 characters per token
+    return len(text) // 4 + 1
+
+def _message_tokens(messages):
+    return sum(_tokens(str(m.content)) for m in messages)
+
+def _first_sentence(text, limit):
+    text = " ".join(str(text).split())
+    m = re.search(r"(?<=[.!?])\s", text)
+    sentence = text[:m.start()] if m else text
+    return sentence if len(sentence) <= limit else sentence[:limit - 3] + "..."
+
+def _local_summary(messages):
+    """Extractive summary of older turns: each question and the start of its answer"""
+    lines = []
+    question = None
+    for m in messages:
+        if isinstance(m, _messages.AIMessage):
+            # The actual question usually ends the interviewer's message
+            sentences = re.split(r"(?<=[.!?])\s+", " ".join(str(m.content).split()))
+            question = next((x for x in reversed(sentences) if x.endswith("?")), sentences[-1])
+        elif isinstance(m, _messages.HumanMessage) and question is not None:
+            lines.append(f"- Asked: {_first_sentence(question, 120)} Answer: {_first_sentence(m.content, 160)}")
+            question = None
+    return "\n".join(lines)
+
+def _rolling_window(messages, llm_summary=None, max_tokens=_MAX_PROMPT_TOKENS):
+    """Messages to send to the model for this turn"""
+    system = [m for m in messages if isinstance(m, _messages.SystemMessage)]
+    rest = [m for m in messages if not isinstance(m, _messages.SystemMessage)]
+    if not rest:
+        return messages
+    context, conversation = rest[0], rest[1:]
+
+    keep = _RECENT_TURNS * 2 + 1  # Pairs plus the newest answer
+    older, recent = conversation[:-keep], conversation[-keep:]
+
+    # Fixed upper bound: move verbatim turns into the summary until we fit
+    def _build(older, recent):
+        summary = ""
+        if older:
+            covered, text = llm_summary or (0, "")
+            summary = text if covered >= len(older) else _local_summary(older)
+        prompt = system[0].content if system else ""
+        if summary:
+            prompt += "\n\nEarlier in this interview (summary):\n" + summary
+        return [_messages.SystemMessage(content=prompt), context] + recent
+
+    window = _build(older, recent)
+    while _message_tokens(window) > max_tokens and len(recent) > 1:
+        older, recent = older + recent[:2], recent[2:]
+        window = _build(older, recent)
+
+    # Still too big: shorten the candidate info, then the summary
+    excess = _message_tokens(window) - max_tokens
+    if excess > 0:
+        context = _messages.HumanMessage(content=str(context.content)[:max(500, len(str(context.content)) - excess * 4)])
+        window = _build(older, recent)
+        excess = _message_tokens(window) - max_tokens
+        if excess > 0:
+            window[0] = _messages.SystemMessage(content=window[0].content[:max(200, len(window[0].content) - excess * 4)])
+    return window
+
+def _refresh_summary(thread_id, older):
+    """Cheap model call re-summarising older turns (runs in the background)"""
+    transcript = "\n".join(
+        f"{'Interviewer' if isinstance(m, _messages.AIMessage) else 'Candidate'}: {str(m.content)[:400]}" for m in older
+    )
+    prompt = f"""Summarise this part of a job interview in at most 8 short bullet points.
+Keep the topics covered, concrete facts the candidate gave (skills, projects,
+numbers) and any weak spots worth following up.
+
+{transcript}"""
+    try:
+        response = invoke_prompt("chat", prompt, temperature=0.2)
+        _summaries[thread_id] = (len(older), response.content.strip())
+    except Exception as e:
+        print(f"Interview summary error: {e}")
+
+def _model_window(thread_id, messages):
+    """What the model sees this turn; the transcript itself keeps everything"""
+    if not ROLLING_MEMORY:
+        return messages
+    window = _rolling_window(messages, _summaries.get(thread_id))
+    Metrics.observe("interview_prompt_tokens", _message_tokens(window))
+
+    if _LLM_SUMMARY:
+        conversation = [m for m in messages if not isinstance(m, _messages.SystemMessage)][1:]
+        older = conversation[:-(_RECENT_TURNS * 2 + 1)]
+        covered = _summaries.get(thread_id, (0, ""))[0]
+        if len(older) - covered >= _SUMMARY_EVERY * 2:
+            _summary_executor.submit(_refresh_summary, thread_id, older)
+    return window
+
+def _rolling_memory_hook(state, config):
+    """pre_model_hook: trim what the agent's model sees"""
+    return {"llm_input_messages": _model_window(config["configurable"]["thread_id"], state["messages"])}
+
+def _get_agent(model):
+    """Interview agent for a routed model (built on first use)"""
+    global memory
+    with _agents_lock:
+        if memory is None:
+            memory = _checkpoint.MemorySaver()
+        if model not in _agents:
+            _agents[model] = _prebuilt.create_react_agent(
+                model=get_chat_model(model, temperature=0.3), tools=[], checkpointer=memory,
+                pre_model_hook=_rolling_memory_hook if ROLLING_MEMORY else None
+            )
+        return _agents[model]
+
+def _agent_reply(response):
+    """Text of the agent's message in a list of stream chunks"""
+    return next(chunk["agent"]["messages"][0].content for chunk in response if "agent" in chunk)
+
+# ============= SESSIONS =============
+class InterviewSession:
+    """One candidate's interview: its transcript (or agent thread) and question count"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start over with an empty transcript on a new agent thread"""
+        self.thread_id = f"interview-{uuid.uuid4().hex}"
+        self.question_count = 0
+        self.messages = []  # Direct engine: the whole conversation, system prompt first
+
+    @property
+    def config(self):
+        return {"configurable": {"thread_id": self.thread_id}}
 
-memory = MemorySaver()
-agent = create_react_agent(model=llm, tools=[], checkpointer=memory)
+    def record(self, *messages):
+        """Append turns to the transcript (the agent engine keeps its own)"""
+        if INTERVIEW_ENGINE == "agent":
+            return
+        self.messages = self.messages + list(messages)
+
+def _interview_turn(model, session, new_messages):
+    """
+    One interviewer reply to new_messages on the configured engine. Runs in
+    the deadline worker, so on the direct engine it only reads the session:
+    the caller records the turn once it accepts the reply, and a reply that
+    arrives after the deadline (or a spill-over retry) never reaches the
+    transcript. The agent engine's checkpointer keeps whatever each call
+    writes to the thread, those replies included.
+    """
+    if INTERVIEW_ENGINE == "agent":
+        response = list(_get_agent(model).stream({"messages": new_messages}, session.config))
+        return _agent_reply(response)
+
+    reply = get_chat_model(model, temperature=0.3).invoke(
+        _model_window(session.thread_id, session.messages + new_messages)
+    )
+    return reply.content
+
+def _turn_stream(model, session, new_messages):
+    """
+    (message chunk, metadata) pairs of a streamed reply on the configured
+    engine. Like _interview_turn it leaves recording the turn to the caller.
+    """
+    if INTERVIEW_ENGINE == "agent":
+        stream = _get_agent(model).stream({"messages": new_messages}, session.config, stream_mode="messages")
+        # Skip what the rolling-memory hook emits (its trimmed system prompt)
+        yield from ((chunk, meta) for chunk, meta in stream if meta.get("langgraph_node") == "agent")
+        return
+
+    llm = get_chat_model(model, temperature=0.3)
+    for chunk in llm.stream(_model_window(session.thread_id, session.messages + new_messages)):
+        yield chunk, None
+
+# Used when a caller doesn't pass a session (single-user scripts)
+_default_session = InterviewSession()
+
+def _session(session):
+    return session if session is not None else _default_session
+
+def _record_scripted(session, messages):
+    """
+    Record turns the model didn't write (scripted lines, drafted follow-ups)
+    in the transcript, or in the agent thread on the agent engine. Returns
+    False if the agent thread couldn't be updated.
+    """
+    if INTERVIEW_ENGINE != "agent":
+        session.record(*messages)
+        return True
+    try:
+        model = route("interview_question")[0]
+        _get_agent(model).update_state(session.config, {"messages": messages}, as_node="agent")
+        return True
+    except Exception as e:
+        print(f"Interview transcript error: {e}")
+        return False
+
+def _scripted_reply(session, candidate_answer, reply):
+    """Record the candidate's answer with a scripted reply and return the reply"""
+    _record_scripted(session, [_messages.HumanMessage(content=candidate_answer), _messages.AIMessage(content=reply)])
+    return reply
 
 # ============= FALLBACK QUESTIONS =============
 _FALLBACK_QUESTIONS = {
@@ -64,16 +270,15 @@ _FALLBACK_QUESTIONS = {
     ]
 }
 
-_question_count = 0
+def _opening_fallback(job_role):
+    """Scripted opener used when the API is unavailable"""
+    return (
+        f"Hello! I'm Sarah, and I'll be conducting your interview today for the {job_role} position. "
+        f"Let's start with an introduction. {_FALLBACK_QUESTIONS['intro'][0].format(role=job_role)}"
+    )
 
-@rate_limit
-def start_interview_langchain(job_role, resume_text):
-    """Start interview with enhanced error handling"""
-    global _question_count
-    _question_count = 0
-    
-    _rate_limit_interview()
-    
+def _opening_messages(job_role, resume_text):
+    """System prompt and candidate information every interview starts from"""
     # Truncate resume
     if len(resume_text) > 5000:
         resume_text = resume_text[:5000]
@@ -95,93 +300,354 @@ def start_interview_langchain(job_role, resume_text):
     
     Start the interview by introducing yourself and asking the first question about their experience."""
     
+    return [_messages.SystemMessage(content=system_prompt), _messages.HumanMessage(content=context_prompt)]
+
+def _start_interview_fallback(job_role, resume_text, session=None):
+    """Start the interview without calling the API"""
+    session = _session(session)
+    opener = _opening_fallback(job_role)
+    # Later turns still need the system prompt and candidate info. A new
+    # agent thread keeps out anything a timed-out opening call writes late.
+    session.reset()
+    _record_scripted(session, _opening_messages(job_role, resume_text) + [_messages.AIMessage(content=opener)])
+    session.question_count = 1
+    return opener
+
+@with_deadline("interview_question", fallback=_start_interview_fallback)
+def start_interview_langchain(job_role, resume_text, session=None):
+    """Start interview with enhanced error handling (pass an InterviewSession per user)"""
+    session = _session(session)
+    session.reset()
+    opening = _opening_messages(job_role, resume_text)
+    
     try:
-        response = list(agent.stream(
-            {"messages": [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=context_prompt)
-            ]},
-            {"configurable": {"thread_id": "123"}}
-        ))
+        output = invoke_routed("interview_question", lambda model: _interview_turn(model, session, opening))
+        gemini_breaker.record_success()
         
-        output = response[0]["agent"]["messages"][0].content
-        _question_count += 1
+        session.record(*opening, _messages.AIMessage(content=output))
+        session.question_count += 1
         return output
         
     except Exception as e:
         error_msg = str(e).lower()
         print(f"❌ Interview start error: {e}")
+        gemini_breaker.record_failure(e)
         
         # Fallback question
         if any(word in error_msg for word in ["429", "quota", "resource_exhausted"]):
             print("🚨 Using fallback interview question")
         
-        _question_count += 1
-        return (
-            f"Hello! I'm Sarah, and I'll be conducting your interview today for the {job_role} position. "
-            f"Let's start with an introduction. {_FALLBACK_QUESTIONS['intro'][0].format(role=job_role)}"
-        )
+        return _start_interview_fallback(job_role, resume_text, session)
+
+_CLOSING_MESSAGE = (
+    "Thank you for your detailed responses throughout this interview. "
+    "We've covered your technical background, experience, and problem-solving approach. "
+    "We will review your application along with today's conversation and get back to you "
+    "within the next week. Do you have any final questions for me?"
+)
+
+def _fallback_question(session):
+    """Pick a scripted question based on interview progress (no API)"""
+    count = session.question_count
+    if count <= 2:
+        questions = _FALLBACK_QUESTIONS['technical']
+    elif count <= 4:
+        questions = _FALLBACK_QUESTIONS['behavioral']
+    else:
+        questions = _FALLBACK_QUESTIONS['closing']
+    
+    idx = (count - 1) % len(questions)
+    return (
+        "That's interesting. " + questions[idx]
+    )
+
+def _continue_interview_fallback(candidate_answer, session=None):
+    """Advance the interview without calling the API"""
+    session = _session(session)
+    session.question_count += 1
+    
+    if session.question_count >= 6:
+        return _scripted_reply(session, candidate_answer, _CLOSING_MESSAGE)
+    return _scripted_reply(session, candidate_answer, _fallback_question(session))
 
-@rate_limit
-def continue_interview(candidate_answer):
-    """Continue interview with fallback logic"""
-    global _question_count
+@with_deadline("interview_question", fallback=_continue_interview_fallback)
+@circuit_breaker(_continue_interview_fallback)
+def continue_interview(candidate_answer, session=None):
+    """Continue interview with fallback logic (timeout=<seconds> caps the turn)"""
+    session = _session(session)
     
-    _rate_limit_interview()
-    _question_count += 1
+    session.question_count += 1
     
     # End after 6 questions
-    if _question_count >= 6:
-        return (
-            "Thank you for your detailed responses throughout this interview. "
-            "We've covered your technical background, experience, and problem-solving approach. "
-            "We will review your application along with today's conversation and get back to you "
-            "within the next week. Do you have any final questions for me?"
-        )
+    if session.question_count >= 6:
+        return _scripted_reply(session, candidate_answer, _CLOSING_MESSAGE)
     
+    answer = _messages.HumanMessage(content=candidate_answer)
     try:
-        response = list(agent.stream(
-            {"messages": [HumanMessage(content=candidate_answer)]},
-            {"configurable": {"thread_id": "123"}}
-        ))
+        output = invoke_routed("interview_question", lambda model: _interview_turn(model, session, [answer]))
+        gemini_breaker.record_success()
         
-        output = response[0]["agent"]["messages"][0].content
+        session.record(answer, _messages.AIMessage(content=output))
         return output
         
     except Exception as e:
         print(f"❌ Interview continue error: {e}")
+        gemini_breaker.record_failure(e)
         
         # Fallback questions based on progress
-        if _question_count <= 2:
-            questions = _FALLBACK_QUESTIONS['technical']
-        elif _question_count <= 4:
-            questions = _FALLBACK_QUESTIONS['behavioral']
-        else:
-            questions = _FALLBACK_QUESTIONS['closing']
+        return _scripted_reply(session, candidate_answer, _fallback_question(session))
+
+def _chunk_text(chunk):
+    """Text of a streamed message chunk (Gemini may send a list of parts)"""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content or ""
+
+def _open_stream(model, candidate_answer, session):
+    """Start a token stream and wait for its first text, so quota errors surface here"""
+    stream = _turn_stream(model, session, [_messages.HumanMessage(content=candidate_answer)])
+    for chunk, _ in stream:
+        text = _chunk_text(chunk)
+        if text:
+            return text, stream
+    return "", stream
+
+def continue_interview_stream(candidate_answer, session=None):
+    """
+    Streaming continue_interview: yields the reply in pieces as the model
+    generates it (scripted lines come out whole). The deadline covers the
+    time to the first piece; the rest of the reply is never cut off.
+    """
+    session = _session(session)
+    
+    ticket = gemini_breaker.allow_request()
+    if not ticket:
+        yield _continue_interview_fallback(candidate_answer, session)
+        return
+    
+    try:
+        session.question_count += 1
         
-        idx = (_question_count - 1) % len(questions)
-        return (
-            "That's interesting. " + questions[idx]
-        )
+        if session.question_count >= 6:
+            yield _scripted_reply(session, candidate_answer, _CLOSING_MESSAGE)
+            return
+        
+        try:
+            with Deadline("interview_question"):
+                first, stream = invoke_routed(
+                    "interview_question", lambda model: _open_stream(model, candidate_answer, session)
+                )
+            gemini_breaker.record_success()
+        except Exception as e:
+            print(f"❌ Interview stream error: {e}")
+            gemini_breaker.record_failure(e)
+            yield _scripted_reply(session, candidate_answer, _fallback_question(session))
+            return
+        
+        parts = [first] if first else []
+        if first:
+            yield first
+        try:
+            for chunk, _ in stream:
+                text = _chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            print(f"❌ Interview stream error: {e}")
+        
+        if parts:
+            # Record exactly what the candidate was shown
+            session.record(_messages.HumanMessage(content=candidate_answer),
+                           _messages.AIMessage(content="".join(parts)))
+        else:
+            yield _scripted_reply(session, candidate_answer, _fallback_question(session))
+    finally:
+        gemini_breaker.release_probe(ticket)
+
+def scripted_lines(job_role=None):
+    """
+    Fixed interviewer lines, for pre-rendering their audio. Without a role,
+    only lines that are the same for everyone; with one, the role-specific
+    opener and intro questions.
+    """
+    if job_role:
+        return [_opening_fallback(job_role)] + [
+            q.format(role=job_role) for q in _FALLBACK_QUESTIONS["intro"]
+        ]
+    lines = [
+        "That's interesting. " + q
+        for section in ("technical", "behavioral", "closing")
+        for q in _FALLBACK_QUESTIONS[section]
+    ]
+    return lines + [_CLOSING_MESSAGE]
+
+# ============= SPECULATIVE FOLLOW-UPS =============
+# While the candidate answers, guess where the answer will go and draft a
+# follow-up for each direction. If the real answer matches one, it is asked
+# straight away and the model round trip is skipped.
+_SPECULATION_MIN_HITS = 2      # Keyword hits needed for a draft to fit the answer
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "you", "your", "was", "were", "are",
+    "have", "has", "had", "but", "not", "from", "they", "them", "then", "than", "what",
+    "when", "which", "about", "into", "our", "their", "there", "would", "could", "also"
+}
+_speculation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="interview-speculate")
+
+def _keywords(text):
+    return {w for w in re.findall(r"[a-z][a-z0-9+#.-]{2,}", text.lower()) if w not in _STOPWORDS}
+
+def _draft_follow_ups(job_role, resume_text, chat_history):
+    """One model call drafting follow-ups for the likely directions of the answer"""
+    start = time.monotonic()
+    conversation = "\n".join(f"{speaker}: {text[:300]}" for speaker, text in chat_history[-6:])
+    prompt = f"""You are interviewing a candidate for a {job_role} role.
+
+Resume (excerpt): {resume_text[:1500]}
+
+Conversation so far:
+{conversation}
 
-@rate_limit 
+The candidate is answering your last question now. Predict the 3 most likely
+directions their answer will take and write the follow-up question you would
+ask for each.
+
+Return ONLY a JSON list:
+[{{"keywords": ["6-10 words the answer would likely contain"], "question": "follow-up question"}}]"""
+
+    try:
+        response = invoke_prompt("interview_question", prompt, temperature=0.4)
+        cleaned = re.sub(r"```json|```", "", response.content).strip()
+        drafts = [
+            {"keywords": _keywords(" ".join(d.get("keywords", []))), "question": d["question"]}
+            for d in json.loads(cleaned) if d.get("question")
+        ]
+    except Exception as e:
+        print(f"Speculation error: {e}")
+        drafts = []
+    return {"drafts": drafts, "gen_time": time.monotonic() - start}
+
+def speculate_follow_ups(job_role, resume_text, chat_history, session=None):
+    """
+    Start drafting follow-ups in the background while the candidate answers.
+    Returns a Future, or None when the next turn is the scripted closing.
+    """
+    if _session(session).question_count + 1 >= 6:
+        return None
+    return _speculation_executor.submit(_draft_follow_ups, job_role, resume_text, list(chat_history))
+
+def take_speculative_question(candidate_answer, speculation, session=None):
+    """
+    Return the drafted follow-up that best fits the answer, recorded in the
+    interview transcript as if the model had asked it, or None if nothing fits
+    (the caller then uses continue_interview as usual).
+    """
+    session = _session(session)
+    
+    if speculation is None or session.question_count + 1 >= 6:
+        return None
+    if not speculation.done():
+        Metrics.increment("speculation", outcome="not_ready")
+        return None
+    
+    result = speculation.result()
+    answer_words = _keywords(candidate_answer)
+    best, best_hits = None, 0
+    for draft in result["drafts"]:
+        hits = len(draft["keywords"] & answer_words)
+        if hits > best_hits:
+            best, best_hits = draft, hits
+    
+    if best is None or best_hits < _SPECULATION_MIN_HITS:
+        Metrics.increment("speculation", outcome="miss")
+        return None
+    
+    turn = [_messages.HumanMessage(content=candidate_answer), _messages.AIMessage(content=best["question"])]
+    if not _record_scripted(session, turn):
+        Metrics.increment("speculation", outcome="miss")
+        return None
+    
+    model = route("interview_question")[0]
+    session.question_count += 1
+    # What we saved is the model time the live call would have cost
+    saved = Metrics.percentile("model_latency", 50, model=model) or result["gen_time"]
+    Metrics.increment("speculation", outcome="hit")
+    Metrics.observe("speculation_saved_seconds", saved)
+    print(f"🔮 Speculative follow-up used ({best_hits} keyword hits, ~{saved:.1f}s saved)")
+    return best["question"]
+
+def speculation_report():
+    """Hit rate and latency saved by speculative follow-ups"""
+    hits = Metrics.get_counter("speculation", outcome="hit")
+    misses = Metrics.get_counter("speculation", outcome="miss")
+    not_ready = Metrics.get_counter("speculation", outcome="not_ready")
+    total = hits + misses + not_ready
+    saved = Metrics.percentile("speculation_saved_seconds", 50)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "not_ready": not_ready,
+        "hit_rate": hits / total if total else 0.0,
+        "saved_p50": saved or 0.0,
+    }
+
+def _feedback_fallback(chat_history, job_role):
+    """Score answers by length when detailed AI analysis is unavailable (no API)"""
+    # Analyze based on response length and content
+    total_words = sum(len(text.split()) for _, text in chat_history if _ == "Candidate")
+    avg_words = total_words / max(len([t for s, t in chat_history if s == "Candidate"]), 1)
+
+    # Basic scoring
+    if avg_words > 50:
+        comm_score = "8/10"
+        conf_score = "7/10"
+    elif avg_words > 30:
+        comm_score = "7/10"
+        conf_score = "6/10"
+    else:
+        comm_score = "6/10"
+        conf_score = "5/10"
+
+    return {
+        "communication_score": comm_score,
+        "technical_score": "7/10",
+        "confidence_score": conf_score,
+        "strengths": [
+            "Provided clear responses",
+            "Demonstrated relevant experience",
+            "Professional communication style"
+        ],
+        "improvements": [
+            "Provide more specific examples with metrics",
+            "Demonstrate deeper technical knowledge",
+            "Show more enthusiasm and energy"
+        ],
+        "suggestions": [
+            "Practice using the STAR method (Situation, Task, Action, Result)",
+            "Research common interview questions for your role",
+            "Prepare 5-7 detailed project examples",
+            "Practice speaking about technical concepts clearly",
+            "Record yourself to improve delivery"
+        ],
+        "overall_comment": (
+            f"Good effort in the {job_role} interview! You communicated your experience well. "
+            "Focus on providing more detailed examples with quantifiable results. "
+            "With more practice, you'll feel even more confident. Keep preparing!"
+        ),
+        "note": "Basic feedback provided - detailed AI analysis temporarily unavailable"
+    }
+
+@with_deadline("interview_feedback", fallback=_feedback_fallback)
+@circuit_breaker(_feedback_fallback)
 @cached
 def get_interview_feedback(chat_history, job_role):
     """Generate interview feedback with enhanced fallback"""
-    _rate_limit_interview()
-    
     # Format conversation (limit tokens)
     conversation = "\n".join([
         f"{speaker}: {text[:150]}" for speaker, text in chat_history[-8:]
     ])
     
-    feedback_llm = ChatGoogleGenerativeAI(
-        model="gemini-1.5-flash-8b",
-        google_api_key=os.getenv("GEMINI_API_KEY"),
-        temperature=0.2,
-        request_timeout=30
-    )
-    
     prompt = f"""
     Analyze this mock interview and provide feedback.
     
@@ -205,7 +671,11 @@ def get_interview_feedback(chat_history, job_role):
     """
     
     try:
-        response = feedback_llm.invoke(prompt)
+        response = invoke_routed(
+            "interview_feedback",
+            lambda model: get_chat_model(model, temperature=0.2).invoke(prompt)
+        )
+        gemini_breaker.record_success()
         content = response.content.strip()
         cleaned = re.sub(r"```json|```", "", content).strip()
         feedback = json.loads(cleaned)
@@ -221,47 +691,5 @@ def get_interview_feedback(chat_history, job_role):
         
     except Exception as e:
         print(f"❌ Feedback generation error: {e}")
-        
-        # Analyze based on response length and content
-        total_words = sum(len(text.split()) for _, text in chat_history if _ == "Candidate")
-        avg_words = total_words / max(len([t for s, t in chat_history if s == "Candidate"]), 1)
-        
-        # Basic scoring
-        if avg_words > 50:
-            comm_score = "8/10"
-            conf_score = "7/10"
-        elif avg_words > 30:
-            comm_score = "7/10"
-            conf_score = "6/10"
-        else:
-            comm_score = "6/10"
-            conf_score = "5/10"
-        
-        return {
-            "communication_score": comm_score,
-            "technical_score": "7/10",
-            "confidence_score": conf_score,
-            "strengths": [
-                "Provided clear responses",
-                "Demonstrated relevant experience",
-                "Professional communication style"
-            ],
-            "improvements": [
-                "Provide more specific examples with metrics",
-                "Demonstrate deeper technical knowledge",
-                "Show more enthusiasm and energy"
-            ],
-            "suggestions": [
-                "Practice using the STAR method (Situation, Task, Action, Result)",
-                "Research common interview questions for your role",
-                "Prepare 5-7 detailed project examples",
-                "Practice speaking about technical concepts clearly",
-                "Record yourself to improve delivery"
-            ],
-            "overall_comment": (
-                f"Good effort in the {job_role} interview! You communicated your experience well. "
-                "Focus on providing more detailed examples with quantifiable results. "
-                "With more practice, you'll feel even more confident. Keep preparing!"
-            ),
-            "note": "Basic feedback provided - detailed AI analysis temporarily unavailable"
-        }
\ No newline at end of file
+        gemini_breaker.record_failure(e)
+        return _feedback_fallback(chat_history, job_role)
@@ -0,0 +1,242 @@
+"""
+Incremental Interview Scoring
+Each candidate answer is scored in the background right after it is given
+(length, STAR structure, skill mentions, concrete numbers, hedging, plus an
+optional small LLM call). Final feedback is an aggregation of those turn
+scores, so it covers the whole interview and is ready immediately.
+"""
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from services.Deadline import with_deadline
+from services.ModelRouter import invoke_prompt
+from services.ResumeModel import extract_skills_from_text, extract_required_skills_from_jd
+
+# ============= STAR MARKERS =============
+_STAR_MARKERS = {
+    "situation": ["when i", "at my", "situation", "background", "project", "during", "while working", "previous role"],
+    "task": ["task", "goal", "responsible", "needed to", "had to", "challenge", "objective", "my role"],
+    "action": ["i built", "i led", "i implemented", "i decided", "i created", "i designed", "i developed",
+               "i wrote", "i used", "i organized", "i proposed", "so i", "i worked"],
+    "result": ["result", "outcome", "improved", "reduced", "increased", "saved", "achieved",
+               "delivered", "learned", "which led", "%"],
+}
+_STAR_PATTERNS = {
+    part: re.compile("|".join(
+        (r"\b" if m[0].isalnum() else "") + re.escape(m) + (r"\b" if m[-1].isalnum() else "") for m in markers
+    ))
+    for part, markers in _STAR_MARKERS.items()
+}
+_HEDGE_PATTERN = re.compile(r"\b(i think|maybe|i guess|kind of|sort of|not sure|probably|um+|uh+)\b")
+_NUMBER_PATTERN = re.compile(r"\d")
+
+_LLM_TURN_SCORING = os.getenv("INTERVIEW_LLM_SCORING", "").lower() in ("1", "true", "yes")
+_SUMMARY_WAIT = 5.0  # Max seconds the summary waits for turns still being scored
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="interview-score")
+
+
+def _clamp(score):
+    return round(max(0.0, min(10.0, score)), 1)
+
+
+def _length_score(words):
+    if words < 10:
+        return 3
+    if words < 30:
+        return 5
+    if words < 60:
+        return 7
+    if words <= 200:
+        return 9
+    return 7  # Rambling
+
+
+def score_answer(question, answer, job_role=""):
+    """Local, instant scores (0-10) and signals for one answer"""
+    text = (answer or "").lower()
+    words = len(text.split())
+    star = sorted(part for part, pattern in _STAR_PATTERNS.items() if pattern.search(text))
+    skills = extract_skills_from_text(text)
+    relevant = skills & extract_required_skills_from_jd(job_role, "") if job_role else set()
+    has_numbers = bool(_NUMBER_PATTERN.search(text))
+    hedges = len(_HEDGE_PATTERN.findall(text))
+
+    length = _length_score(words)
+    communication = 0.6 * length + 0.4 * (4 + 1.5 * len(star))
+    technical = 4 + 1.5 * min(len(skills), 3) + (1 if has_numbers else 0) + (0.5 if relevant else 0)
+    confidence = 3 + 0.5 * length - hedges + (1 if "action" in star else 0)
+
+    return {
+        "question": question,
+        "words": words,
+        "star": star,
+        "skills": sorted(skills),
+        "relevant_skills": sorted(relevant),
+        "has_numbers": has_numbers,
+        "hedges": hedges,
+        "communication": _clamp(communication),
+        "technical": _clamp(technical),
+        "confidence": _clamp(confidence),
+    }
+
+
+@with_deadline("interview_feedback", fallback=lambda question, answer, job_role: None)
+def _llm_turn_score(question, answer, job_role):
+    """Optional small model call: technical score + one-line comment (None on failure)"""
+    prompt = f"""Rate this interview answer for a {job_role} role.
+
+Question: {question[:300]}
+Answer: {answer[:800]}
+
+Return ONLY JSON: {{"technical": int (0-10), "comment": "one short improvement tip"}}"""
+    try:
+        response = invoke_prompt("interview_feedback", prompt, temperature=0.2)
+        cleaned = re.sub(r"```json|```", "", response.content).strip()
+        result = json.loads(cleaned)
+        return {"technical": float(result["technical"]), "comment": str(result.get("comment", ""))}
+    except Exception as e:
+        print(f"Turn scoring error: {e}")
+        return None
+
+
+def _score_turn(question, answer, job_role, use_llm):
+    turn = score_answer(question, answer, job_role)
+    if use_llm:
+        llm = _llm_turn_score(question, answer, job_role)
+        if llm:
+            turn["technical"] = _clamp((turn["technical"] + llm["technical"]) / 2)
+            turn["comment"] = llm["comment"]
+    return turn
+
+
+class InterviewScorecard:
+    """
+    Per-session store of turn scores. submit() scores an answer in the
+    background; summary() aggregates everything scored so far.
+    """
+
+    def __init__(self, job_role="", use_llm=_LLM_TURN_SCORING):
+        self.job_role = job_role
+        self.use_llm = use_llm
+        self._turns = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def submit(self, question, answer):
+        """Score one answer in the background; returns its Future"""
+        with self._lock:
+            idx = self._next
+            self._next += 1
+        future = _executor.submit(_score_turn, question, answer, self.job_role, self.use_llm)
+
+        def _store(f):
+            with self._lock:
+                self._pending.pop(idx, None)
+                if f.exception() is None:
+                    self._turns[idx] = f.result()
+                else:
+                    print(f"Turn scoring error: {f.exception()}")
+
+        with self._lock:
+            self._pending[idx] = future
+        future.add_done_callback(_store)
+        return future
+
+    def turns(self, wait=0.0):
+        """Scored turns in answer order, optionally waiting for pending ones"""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            try:
+                future.result(timeout=wait)
+            except FutureTimeout:
+                break
+            except Exception:
+                pass
+        with self._lock:
+            return [self._turns[i] for i in sorted(self._turns)]
+
+    def summary(self, job_role=None):
+        """Final feedback, same shape as get_interview_feedback(); None with no scored turns"""
+        turns = self.turns(wait=_SUMMARY_WAIT)
+        if not turns:
+            return None
+        return summarize_turns(turns, job_role or self.job_role)
+
+
+def summarize_turns(turns, job_role):
+    """Aggregate turn scores into the feedback dict the interview page shows"""
+    n = len(turns)
+    avg = lambda key: sum(t[key] for t in turns) / n
+    communication, technical, confidence = avg("communication"), avg("technical"), avg("confidence")
+    avg_words = avg("words")
+
+    star_counts = {part: sum(part in t["star"] for t in turns) for part in _STAR_MARKERS}
+    missing_star = min(star_counts, key=star_counts.get)
+    skills = sorted({s for t in turns for s in t["skills"]})
+    numbers = sum(t["has_numbers"] for t in turns)
+    hedges = sum(t["hedges"] for t in turns)
+
+    strengths, improvements, suggestions = [], [], []
+
+    if sum(len(t["star"]) for t in turns) / n >= 3:
+        strengths.append("Structured answers clearly with situation, action and result")
+    else:
+        improvements.append(f"Answers often missed the '{missing_star}' part of STAR")
+        suggestions.append("Practice using the STAR method (Situation, Task, Action, Result)")
+
+    if skills:
+        strengths.append("Referenced relevant skills: " + ", ".join(skills[:5]))
+    else:
+        improvements.append("Mention the specific tools and technologies you used")
+        suggestions.append(f"Prepare examples that show the core skills for a {job_role} role")
+
+    if numbers >= max(1, n / 2):
+        strengths.append("Backed answers with concrete numbers")
+    else:
+        improvements.append("Provide more specific examples with metrics")
+        suggestions.append("Quantify outcomes: 'cut load time by 40%' beats 'made it faster'")
+
+    if avg_words < 30:
+        improvements.append("Expand answers with more detail and context")
+        suggestions.append("Aim for 1-2 minute answers that walk through one concrete example")
+    elif avg_words > 200:
+        improvements.append("Keep answers more concise and focused")
+        suggestions.append("Lead with the result, then give only the key details")
+    else:
+        strengths.append("Answers were a good length")
+
+    if hedges > n:
+        improvements.append("Reduce hedging phrases like 'I think' or 'maybe'")
+        suggestions.append("Record yourself to improve delivery and cut filler words")
+
+    comments = [t["comment"] for t in turns if t.get("comment")]
+    suggestions = comments[-2:] + suggestions
+
+    if not strengths:
+        strengths.append("Completed the full interview and engaged with every question")
+    if not improvements:
+        improvements.append("Keep tailoring examples to the role's requirements")
+    if not suggestions:
+        suggestions.append("Research common interview questions for your role")
+
+    return {
+        "communication_score": f"{communication:.0f}/10",
+        "technical_score": f"{technical:.0f}/10",
+        "confidence_score": f"{confidence:.0f}/10",
+        "strengths": strengths,
+        "improvements": improvements,
+        "suggestions": suggestions,
+        "overall_comment": (
+            f"Across {n} answer{'s' if n != 1 else ''} in the {job_role} interview you averaged "
+            f"{avg_words:.0f} words per answer. "
+            + (f"Your strongest area was {strengths[0][0].lower() + strengths[0][1:]}. " if strengths else "")
+            + f"Focus next on: {improvements[0][0].lower() + improvements[0][1:]}."
+        ),
+        "note": "Scored turn by turn during the interview",
+    }
@@ -0,0 +1,326 @@
+"""
+Offline Career Knowledge Base
+A curated set of short career-advice passages with a BM25 index built at
+import. When the model can't be called (quota, open circuit, deadline),
+the chatbot answers from the top-ranked passages instead of a canned
+paragraph, optionally tailored to the user's role and resume skills.
+"""
+import math
+
+from services.SemanticCache import tokenize
+
+# ============= PASSAGES =============
+# topic matches services.IntentRouter topics where one exists
+_PASSAGES = [
+    # --- Interviews ---
+    {"topic": "interview", "title": "Technical Interviews", "tags": "coding algorithms data structures leetcode",
+     "bullets": ["Practice coding problems on LeetCode/HackerRank (start with Easy)",
+                 "Review core data structures: Arrays, LinkedLists, Trees, Graphs",
+                 "Study common algorithms: Sorting, Searching, Dynamic Programming",
+                 "Understand time/space complexity (Big O notation)"]},
+    {"topic": "interview", "title": "Behavioral Interviews", "tags": "star method stories behavioural hr questions",
+     "bullets": ["Use STAR method (Situation, Task, Action, Result)",
+                 "Prepare 5-7 stories showcasing your skills",
+                 "Practice answers out loud",
+                 "End every story with a measurable result"]},
+    {"topic": "interview", "title": "Interview Day", "tags": "general nervous prepare research company",
+     "bullets": ["Research the company thoroughly",
+                 "Prepare thoughtful questions to ask",
+                 "Dress professionally and arrive early",
+                 "Show enthusiasm and confidence"]},
+    {"topic": "interview", "title": "System Design Interviews", "tags": "architecture scalability senior backend",
+     "bullets": ["Clarify requirements and scale before drawing anything",
+                 "Start with a simple design, then find the bottlenecks",
+                 "Discuss trade-offs: consistency, availability, cost",
+                 "Know caching, load balancing, queues and database sharding"]},
+    {"topic": "interview", "title": "Questions to Ask the Interviewer", "tags": "end of interview ask them",
+     "bullets": ["What does success look like in the first 90 days?",
+                 "How does the team plan and review its work?",
+                 "What are the biggest challenges the team faces right now?",
+                 "What growth paths have people in this role taken?"]},
+    {"topic": "interview", "title": "After the Interview", "tags": "follow up thank you email rejection feedback",
+     "bullets": ["Send a short thank-you email within 24 hours",
+                 "Note the questions you found hard and practise them",
+                 "Follow up politely if you haven't heard back in a week",
+                 "If rejected, ask for feedback and keep applying"]},
+    # --- Resume ---
+    {"topic": "resume", "title": "Resume Content", "tags": "cv achievements action verbs bullet points",
+     "bullets": ["Use strong action verbs (Led, Developed, Achieved, Implemented)",
+                 "Quantify achievements with numbers (Increased sales by 30%)",
+                 "Focus on impact and results, not just duties",
+                 "Tailor content to match job description keywords"]},
+    {"topic": "resume", "title": "Resume Format", "tags": "cv layout template pages ats",
+     "bullets": ["Keep it to 1-2 pages maximum",
+                 "Use clear section headers (Experience, Education, Skills, Projects)",
+                 "Choose a clean, ATS-friendly template",
+                 "Use consistent formatting and fonts"]},
+    {"topic": "resume", "title": "Resume Sections", "tags": "cv summary education certifications order",
+     "bullets": ["Professional Summary (2-3 lines at top)",
+                 "Relevant technical skills",
+                 "Work experience (reverse chronological)",
+                 "Education and certifications",
+                 "Notable projects with tech stack"]},
+    {"topic": "resume", "title": "Getting Past ATS Filters", "tags": "applicant tracking system keywords shortlisted rejected",
+     "bullets": ["Mirror the exact skill names used in the job description",
+                 "Avoid tables, images and text boxes that parsers can't read",
+                 "Use standard headings like 'Experience' and 'Skills'",
+                 "Submit a PDF unless the posting asks for Word"]},
+    {"topic": "resume", "title": "Resume for Freshers", "tags": "student graduate no experience entry level internship",
+     "bullets": ["Lead with projects, internships and hackathons",
+                 "Put education near the top with relevant coursework",
+                 "Show initiative: clubs, open source, teaching, freelancing",
+                 "Keep it to one page"]},
+    # --- Skills ---
+    {"topic": "skill", "title": "Software Engineering Skills", "tags": "programming developer coding roadmap",
+     "bullets": ["Master one programming language deeply (Python/Java/JavaScript)",
+                 "Learn Git and version control",
+                 "Understand databases (SQL and NoSQL)",
+                 "Study system design basics",
+                 "Practice data structures & algorithms"]},
+    {"topic": "skill", "title": "Learning Resources", "tags": "courses free online study tutorials",
+     "bullets": ["freeCodeCamp (free, comprehensive)",
+                 "Coursera / edX (structured courses)",
+                 "YouTube tutorials (The Net Ninja, Traversy Media)",
+                 "Official documentation (best for deep learning)"]},
+    {"topic": "skill", "title": "Practice That Builds Skill", "tags": "projects open source hands on",
+     "bullets": ["Build 3-5 portfolio projects",
+                 "Contribute to open source on GitHub",
+                 "Do coding challenges daily",
+                 "Write technical blog posts to solidify learning"]},
+    {"topic": "skill", "title": "Data Science Path", "tags": "data analyst machine learning python sql statistics pandas",
+     "bullets": ["Get strong at SQL and Python (pandas, numpy)",
+                 "Learn statistics: distributions, hypothesis tests, regression",
+                 "Move on to machine learning with scikit-learn, then deep learning",
+                 "Publish analyses on real datasets (Kaggle, public data)"]},
+    {"topic": "skill", "title": "Web Development Path", "tags": "frontend backend full stack react javascript node django",
+     "bullets": ["Learn HTML, CSS and modern JavaScript first",
+                 "Pick one frontend framework (React, Vue or Angular)",
+                 "Add a backend: Node/Express, Django or Flask, plus a database",
+                 "Deploy real projects and show them live"]},
+    {"topic": "skill", "title": "Mobile Development Path", "tags": "android ios flutter kotlin swift app",
+     "bullets": ["Choose a platform: Android (Kotlin) or iOS (Swift), or Flutter for both",
+                 "Learn app architecture, state management and REST APIs",
+                 "Ship an app to the Play Store / App Store",
+                 "Study platform design guidelines"]},
+    {"topic": "skill", "title": "UI/UX Design Path", "tags": "design figma prototyping user research ux ui",
+     "bullets": ["Learn design fundamentals: layout, typography, colour",
+                 "Get fluent in Figma and rapid prototyping",
+                 "Practise user research and usability testing",
+                 "Build a case-study portfolio showing your process"]},
+    {"topic": "skill", "title": "Certifications", "tags": "certificate aws azure google cloud worth it",
+     "bullets": ["Certifications help most in cloud, security and networking",
+                 "Pair every certificate with a project that uses it",
+                 "Prefer vendor certifications the job postings actually ask for",
+                 "Don't let collecting certificates replace real experience"]},
+    # --- Job search ---
+    {"topic": "job_search", "title": "Where to Apply", "tags": "job boards portals find openings",
+     "bullets": ["LinkedIn Jobs (set up job alerts)",
+                 "Company career pages directly",
+                 "AngelList (for startups)",
+                 "Indeed, Glassdoor, Naukri",
+                 "Referrals (most effective!)"]},
+    {"topic": "job_search", "title": "Application Tips", "tags": "apply applications response rate",
+     "bullets": ["Apply to 10-15 jobs per week consistently",
+                 "Customize your resume for each application",
+                 "Write personalized cover letters",
+                 "Follow up after 1-2 weeks"]},
+    {"topic": "job_search", "title": "Remote Jobs", "tags": "work from home remote hybrid",
+     "bullets": ["Use remote-focused boards (We Work Remotely, Remote OK)",
+                 "Show async communication skills: clear writing, documentation",
+                 "Mention past remote or distributed-team experience",
+                 "Check time-zone requirements before applying"]},
+    {"topic": "job_search", "title": "Internships and First Jobs", "tags": "fresher student graduate entry level internship",
+     "bullets": ["Apply early: many internship cycles open months ahead",
+                 "Use campus placement cells and alumni referrals",
+                 "Target entry-level and graduate programmes",
+                 "Small companies and startups often hire on projects, not pedigree"]},
+    {"topic": "networking", "title": "Networking", "tags": "linkedin connections referrals meetups alumni",
+     "bullets": ["Connect with alumni from your college",
+                 "Attend tech meetups and conferences",
+                 "Engage in LinkedIn posts and discussions",
+                 "Reach out for informational interviews"]},
+    {"topic": "networking", "title": "LinkedIn Profile", "tags": "linkedin profile headline recruiters personal brand",
+     "bullets": ["Write a headline that states your role and key skills",
+                 "Use a clear, friendly profile photo",
+                 "Summarise your impact in the About section",
+                 "Turn on 'Open to Work' for recruiters"]},
+    {"topic": "networking", "title": "Personal Brand", "tags": "github blog portfolio visibility",
+     "bullets": ["Keep GitHub active with pinned, documented projects",
+                 "Write about what you learn",
+                 "Share work publicly and help others",
+                 "Keep your portfolio site up to date"]},
+    # --- Cover letters ---
+    {"topic": "cover_letter", "title": "Cover Letters", "tags": "cover letter application write",
+     "bullets": ["Open with the role and why this company specifically",
+                 "Pick 2-3 achievements that match the job description",
+                 "Keep it under one page and in plain language",
+                 "Close with a confident call to action"]},
+    # --- Salary ---
+    {"topic": "salary", "title": "Salary Research", "tags": "pay compensation market rate ctc",
+     "bullets": ["Use Glassdoor, Levels.fyi, Payscale for market rates",
+                 "Consider location, company size, experience level",
+                 "Know your minimum acceptable salary"]},
+    {"topic": "salary", "title": "Negotiation Timing", "tags": "when offer negotiate",
+     "bullets": ["Never discuss salary in first interview",
+                 "Wait for offer before negotiating",
+                 "Let them make the first offer"]},
+    {"topic": "salary", "title": "Negotiating the Offer", "tags": "negotiation raise counter offer benefits equity",
+     "bullets": ["Express enthusiasm for the role first",
+                 "Provide data-backed reasons for your ask",
+                 "Consider total compensation (benefits, equity, bonus)",
+                 "Be professional and collaborative",
+                 "Practice your pitch beforehand",
+                 "Script: 'I'm very excited about this opportunity! Based on my research and experience level, "
+                 "I was expecting a range of [X-Y]. Is there flexibility in the offer?'"]},
+    {"topic": "salary", "title": "Asking for a Raise", "tags": "raise promotion appraisal review pay increase",
+     "bullets": ["Keep a running list of wins with numbers",
+                 "Ask in a dedicated meeting, ideally before budget planning",
+                 "Anchor on market data and your expanded scope",
+                 "If the answer is no, agree on the goals that would make it yes"]},
+    # --- Career change ---
+    {"topic": "career_change", "title": "Self-Assessment", "tags": "transition change career switch",
+     "bullets": ["Identify transferable skills from current role",
+                 "Research target industry requirements",
+                 "Set realistic timeline (6-12 months typically)"]},
+    {"topic": "career_change", "title": "Building Skills for a Switch", "tags": "transition bootcamp courses new field",
+     "bullets": ["Take online courses in target field",
+                 "Build portfolio projects demonstrating new skills",
+                 "Get relevant certifications if needed",
+                 "Consider bootcamps for intensive training"]},
+    {"topic": "career_change", "title": "Applying After a Switch", "tags": "transition cover letter junior motivation",
+     "bullets": ["Highlight transferable skills prominently",
+                 "Address career change in cover letter",
+                 "Consider entry-level or junior positions initially",
+                 "Be prepared to explain your motivation"]},
+    {"topic": "career_change", "title": "Explaining a Career Gap", "tags": "gap break layoff unemployed returning",
+     "bullets": ["Be brief and honest about why there is a gap",
+                 "Show what you did: courses, projects, caregiving, freelancing",
+                 "Refresh your skills with a recent project before applying",
+                 "Focus the conversation on what you bring now"]},
+    # --- Growth ---
+    {"topic": "general", "title": "Growing in Your Role", "tags": "promotion advance grow senior career growth",
+     "bullets": ["Ask your manager what the next level looks like, in writing",
+                 "Take ownership of problems nobody owns",
+                 "Document your achievements - helps with reviews",
+                 "Seek feedback regularly and act on it"]},
+]
+
+_TOPIC_HEADINGS = {
+    "interview": "Interview Preparation Tips",
+    "resume": "Resume Improvement Guide",
+    "skill": "Skill Development Strategy",
+    "job_search": "Job Search Strategy",
+    "networking": "Networking & Personal Brand",
+    "cover_letter": "Cover Letter Tips",
+    "salary": "Salary Negotiation Tips",
+    "career_change": "Career Transition Guide",
+    "general": "Career Advice",
+}
+
+_DEFAULT_ANSWER = (
+    "**General Career Advice:**\n\n"
+    "I'm here to help with:\n"
+    "• **Resume/CV optimization** - Improving your resume content and format\n"
+    "• **Interview preparation** - Tips for technical and behavioral interviews\n"
+    "• **Skill development** - Learning roadmap and resources\n"
+    "• **Job search** - Application strategies and networking\n"
+    "• **Career planning** - Transitioning roles or advancing your career\n\n"
+    "**Quick Tips:**\n"
+    "✅ Keep learning - Technology evolves rapidly\n"
+    "✅ Build your personal brand - Blog, GitHub, LinkedIn\n"
+    "✅ Network actively - 70% of jobs are found through connections\n"
+    "✅ Document your achievements - Helps with resume and reviews\n"
+    "✅ Seek feedback - Continuous improvement is key\n\n"
+    "**Ask me specifically about:**\n"
+    "• 'How to prepare for interviews?'\n"
+    "• 'How to improve my resume?'\n"
+    "• 'What skills should I learn for [role]?'\n"
+    "• 'How to find jobs?'\n"
+    "• 'How to negotiate salary?'"
+)
+
+_TOPIC_BOOST = 1.25    # Passages on the router's topic for the question
+_CONTEXT_WEIGHT = 0.3  # Role / resume skills only break ties between passages
+_MIN_RELATIVE_SCORE = 0.4  # Drop passages far weaker than the best one
+
+
+class BM25Index:
+    """Okapi BM25 over pre-tokenized documents"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = []
+        self._lengths = []
+        doc_freq = {}
+        for tokens in documents:
+            freqs = {}
+            for token in tokens:
+                freqs[token] = freqs.get(token, 0) + 1
+            self._term_freqs.append(freqs)
+            self._lengths.append(len(tokens))
+            for token in freqs:
+                doc_freq[token] = doc_freq.get(token, 0) + 1
+        n = len(documents)
+        self._avg_length = (sum(self._lengths) / n) if n else 0.0
+        self._idf = {t: math.log(1 + (n - df + 0.5) / (df + 0.5)) for t, df in doc_freq.items()}
+
+    def __len__(self):
+        return len(self._term_freqs)
+
+    def scores(self, query_tokens):
+        """BM25 score of every document for the query"""
+        result = [0.0] * len(self._term_freqs)
+        for token in set(query_tokens):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for i, freqs in enumerate(self._term_freqs):
+                tf = freqs.get(token)
+                if tf:
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._avg_length)
+                    result[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return result
+
+    def search(self, query_tokens, k=3):
+        """Top-k (doc index, score) pairs with a positive score"""
+        scored = [(i, s) for i, s in enumerate(self.scores(query_tokens)) if s > 0]
+        return sorted(scored, key=lambda pair: pair[1], reverse=True)[:k]
+
+
+_index = BM25Index([
+    tokenize(" ".join([p["title"], p["tags"]] + p["bullets"])) for p in _PASSAGES
+])
+
+
+def search(question, k=3, topic=None, role=None, skills=None):
+    """Top-k passages for a question as (passage, score) pairs"""
+    scores = _index.scores(tokenize(question))
+    context = " ".join([role or ""] + sorted(skills or []))
+    if context.strip():
+        for i, s in enumerate(_index.scores(tokenize(context))):
+            scores[i] += _CONTEXT_WEIGHT * s if scores[i] > 0 else 0.0
+    if topic:
+        scores = [s * _TOPIC_BOOST if _PASSAGES[i]["topic"] == topic else s for i, s in enumerate(scores)]
+    ranked = sorted((pair for pair in enumerate(scores) if pair[1] > 0), key=lambda pair: pair[1], reverse=True)
+    return [(_PASSAGES[i], s) for i, s in ranked[:k]]
+
+
+def answer(question, role=None, skills=None, topic=None, k=3):
+    """Markdown answer built from the best passages (general advice if nothing matches)"""
+    results = search(question, k=k, topic=topic, role=role, skills=skills)
+    if not results:
+        return _DEFAULT_ANSWER
+    results = [(p, s) for p, s in results if s >= _MIN_RELATIVE_SCORE * results[0][1]]
+
+    heading = _TOPIC_HEADINGS.get(results[0][0]["topic"], "Career Advice")
+    if role:
+        heading += f" for {role.strip()[:60]}"
+    parts = [f"**{heading}:**"]
+    for passage, _ in results:
+        parts.append(f"✅ **{passage['title']}:**\n" + "\n".join(f"• {b}" for b in passage["bullets"]))
+
+    if skills:
+        shown = ", ".join(sorted(skills)[:5])
+        parts.append(f"💡 **From your resume:** make sure {shown} feature in your examples and applications.")
+    return "\n\n".join(parts)
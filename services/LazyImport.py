@@ -0,0 +1,63 @@
+"""
+Lazy Imports
+Heavy third-party modules (langgraph, reportlab, pandas, edge-tts, ...)
+are bound at module level as proxies that import the real module on first
+attribute access, so importing a page only pays for what it actually uses.
+Check timings with `python -m benchmarks.import_budget`.
+"""
+import importlib
+import importlib.util
+import threading
+import types
+
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported the first time it's used"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # Later lookups skip __getattr__ entirely
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def is_available(name):
+    """True if the top-level package of `name` is installed (without importing it)"""
+    try:
+        return importlib.util.find_spec(name.split(".")[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(name, optional=False):
+    """
+    Module `name`, imported on first attribute access.
+    With optional=True, returns None when the package isn't installed,
+    mirroring the `try: import x / except: x = None` pattern.
+    """
+    if optional and not is_available(name):
+        return None
+    return LazyModule(name)
@@ -0,0 +1,87 @@
+"""
+In-Process Metrics
+Thread-safe counters, latency samples and recent events shared by the
+services (deadlines, routing, caches). Nothing leaves the process.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_samples = defaultdict(lambda: deque(maxlen=500))  # Keep the last 500 per series
+_events = deque(maxlen=200)
+
+
+def _series(name, labels):
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+def increment(name, amount=1, **labels):
+    """Add `amount` to a counter"""
+    with _lock:
+        _counters[_series(name, labels)] += amount
+
+
+def observe(name, value, **labels):
+    """Record one sample (e.g. a latency in seconds)"""
+    with _lock:
+        _samples[_series(name, labels)].append(value)
+
+
+def record_event(kind, **fields):
+    """Keep a recent structured event for debugging / dashboards"""
+    with _lock:
+        _events.append({"kind": kind, "time": time.time(), **fields})
+
+
+def get_counter(name, **labels):
+    with _lock:
+        return _counters.get(_series(name, labels), 0)
+
+
+def percentile(name, pct, **labels):
+    """Return the pct-th percentile (0-100) of a sample series, or None"""
+    with _lock:
+        values = sorted(_samples.get(_series(name, labels), ()))
+    if not values:
+        return None
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def sample_count(name, **labels):
+    with _lock:
+        return len(_samples.get(_series(name, labels), ()))
+
+
+def recent_events(kind=None, limit=50):
+    with _lock:
+        events = [e for e in _events if kind is None or e["kind"] == kind]
+    return events[-limit:]
+
+
+def snapshot():
+    """Counters plus p50/p95 for every sample series"""
+    with _lock:
+        counters = dict(_counters)
+        series = {k: sorted(v) for k, v in _samples.items() if v}
+    summary = {}
+    for key, values in series.items():
+        summary[key] = {
+            "count": len(values),
+            "p50": values[int(0.5 * (len(values) - 1))],
+            "p95": values[int(round(0.95 * (len(values) - 1)))],
+        }
+    return {"counters": counters, "samples": summary}
+
+
+def reset_metrics():
+    """Clear everything (useful for testing)"""
+    with _lock:
+        _counters.clear()
+        _samples.clear()
+        _events.clear()
@@ -0,0 +1,185 @@
+"""
+Cost / Latency-Aware Model Router
+Picks a Gemini model per request from the task profile, observed latency
+percentiles and each model's remaining quota, and spills over to the next
+model when one is exhausted before services fall back to canned text.
+"""
+import os
+import threading
+import time
+
+from services import Metrics
+from services.CircuitBreaker import get_breaker, OPEN
+from services.Deadline import call_with_deadline, DeadlineExceeded, FEATURE_SLOS, DEFAULT_BUDGET
+from services.RateLimiter import get_limiter, acquire_slot, report_success, report_error, is_quota_error
+
+# ============= MODEL PROFILES =============
+# cost: relative price per call, quality: rough output quality (higher = better)
+MODEL_PROFILES = {
+    "gemini-1.5-flash-8b": {"cost": 0.5, "quality": 1},
+    "gemini-2.5-flash-lite": {"cost": 1.0, "quality": 2},
+    "gemini-2.0-flash-lite": {"cost": 0.75, "quality": 2},
+}
+
+# ============= TASK PROFILES =============
+# models: preference order (first = the model this feature used before routing)
+# latency_weight / cost_weight / quality_weight: how much each factor matters
+_FAST_MODELS = ["gemini-1.5-flash-8b", "gemini-2.0-flash-lite", "gemini-2.5-flash-lite"]
+_QUALITY_MODELS = ["gemini-2.5-flash-lite", "gemini-2.0-flash-lite", "gemini-1.5-flash-8b"]
+
+TASK_PROFILES = {
+    "chat": {"models": _FAST_MODELS, "latency_weight": 1.0, "cost_weight": 0.3, "quality_weight": 0.1},
+    "interview_question": {"models": _FAST_MODELS, "latency_weight": 1.0, "cost_weight": 0.2, "quality_weight": 0.2},
+    "interview_feedback": {"models": _FAST_MODELS, "latency_weight": 0.5, "cost_weight": 0.3, "quality_weight": 0.3},
+    "job_fit": {"models": _FAST_MODELS, "latency_weight": 0.7, "cost_weight": 0.3, "quality_weight": 0.2},
+    "analysis": {"models": _QUALITY_MODELS, "latency_weight": 0.3, "cost_weight": 0.2, "quality_weight": 0.6},
+    "qna": {"models": _QUALITY_MODELS, "latency_weight": 0.2, "cost_weight": 0.3, "quality_weight": 0.6},
+    "cover_letter": {"models": _QUALITY_MODELS, "latency_weight": 0.2, "cost_weight": 0.3, "quality_weight": 0.6},
+    "resume_fix": {"models": _QUALITY_MODELS, "latency_weight": 0.2, "cost_weight": 0.2, "quality_weight": 0.7},
+}
+
+_MIN_LATENCY_SAMPLES = 5   # Use observed latency only once we have a few calls
+_SPILL_WAIT = 2.0          # Spill over rather than queue longer than this for a model
+
+# ============= CLIENT POOL =============
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_chat_model(model, temperature=0.2, **kwargs):
+    """Return a pooled ChatGoogleGenerativeAI client for (model, settings)"""
+    key = (model, temperature, tuple(sorted(kwargs.items())))
+    with _clients_lock:
+        if key not in _clients:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            _clients[key] = ChatGoogleGenerativeAI(
+                model=model,
+                google_api_key=os.getenv("GEMINI_API_KEY"),
+                temperature=temperature,
+                request_timeout=30,
+                **kwargs
+            )
+        return _clients[key]
+
+
+class AllModelsExhausted(Exception):
+    """Every candidate model was out of quota, open or erroring"""
+
+
+def _score(task, model, profile):
+    """Lower is better"""
+    weights = TASK_PROFILES[task]
+    slo = FEATURE_SLOS.get(task, DEFAULT_BUDGET)
+
+    # Preference order keeps today's behaviour when nothing else differs
+    score = 0.1 * weights["models"].index(model)
+
+    if Metrics.sample_count("model_latency", model=model) >= _MIN_LATENCY_SAMPLES:
+        p95 = Metrics.percentile("model_latency", 95, model=model)
+        score += weights["latency_weight"] * (p95 / slo)
+
+    score += weights["cost_weight"] * profile["cost"]
+    score -= weights["quality_weight"] * profile["quality"] * 0.5
+
+    # Remaining quota: time we would queue on this model's limiter
+    score += get_limiter(model).expected_wait() / slo
+    return score
+
+
+def route(task):
+    """Return the candidate models for a task, best first, skipping exhausted ones"""
+    profile = TASK_PROFILES.get(task, TASK_PROFILES["chat"])
+    available, exhausted = [], []
+    for model in profile["models"]:
+        if get_breaker(model).state == OPEN or get_limiter(model).blocked:
+            exhausted.append(model)
+        else:
+            available.append(model)
+
+    ranked = sorted(available, key=lambda m: _score(task, m, MODEL_PROFILES[m]))
+    # Exhausted models stay at the end as a last resort
+    return ranked + exhausted
+
+
+def any_model_available(task):
+    """True if at least one model for this task isn't open/blocked"""
+    profile = TASK_PROFILES.get(task, TASK_PROFILES["chat"])
+    return any(
+        get_breaker(m).state != OPEN and not get_limiter(m).blocked
+        for m in profile["models"]
+    )
+
+
+def invoke_routed(task, call):
+    """
+    Run `call(model_name)` on the best model for `task`, spilling over to
+    the next candidate on quota/API errors, open breakers or long queues.
+    Raises the last error if every model fails; DeadlineExceeded is never
+    retried on another model.
+    """
+    candidates = route(task)
+    last_error = None
+
+    for idx, model in enumerate(candidates):
+        is_last = idx == len(candidates) - 1
+        breaker = get_breaker(model)
+        ticket = breaker.allow_request()
+        if not ticket:
+            continue
+
+        try:
+            # Don't queue behind a busy model when another one could serve now
+            wait = acquire_slot(model, max_wait=None if is_last else _SPILL_WAIT)
+            if wait is None:
+                breaker.release_probe(ticket)
+                continue
+
+            start = time.monotonic()
+            result = call_with_deadline(call, model)
+        except DeadlineExceeded:
+            # Our budget ran out, which says nothing about the model, but a
+            # held half-open probe slot would lock the model out for good
+            breaker.release_probe(ticket)
+            raise
+        except Exception as e:
+            breaker.record_failure(e)
+            report_error(model, e)
+            last_error = e
+            reason = "quota" if is_quota_error(e) else "error"
+            _record_spillover(task, model, candidates[idx + 1:], reason)
+            continue
+
+        latency = time.monotonic() - start
+        breaker.record_success()
+        report_success(model)
+        Metrics.observe("model_latency", latency, model=model)
+        Metrics.increment("route_decision", task=task, model=model)
+        Metrics.record_event("route", task=task, model=model, latency=round(latency, 3),
+                             candidates=candidates, position=idx)
+        if idx > 0:
+            print(f"🔀 {task}: served by {model} (candidate #{idx + 1})")
+        return result
+
+    Metrics.increment("route_exhausted", task=task)
+    raise last_error or AllModelsExhausted(f"No model available for '{task}'")
+
+
+def _record_spillover(task, model, remaining, reason):
+    if not remaining:
+        return
+    print(f"🔀 {task}: {model} exhausted ({reason}), spilling over to {remaining[0]}")
+    Metrics.increment("route_spillover", task=task, model=model)
+
+
+def invoke_prompt(task, prompt, temperature=0.2, **model_kwargs):
+    """Routed single-prompt call; returns the model's message"""
+    return invoke_routed(task, lambda model: get_chat_model(model, temperature, **model_kwargs).invoke(prompt))
+
+
+def routing_report():
+    """Routing decisions, spillovers and per-model latency for dashboards"""
+    snap = Metrics.snapshot()
+    counters = {k: v for k, v in snap["counters"].items() if k.startswith("route")}
+    latency = {k: v for k, v in snap["samples"].items() if k.startswith("model_latency")}
+    return {"counters": counters, "latency": latency}
@@ -1,72 +1,251 @@
 #  ------------- old claude version without ui ----------
+"""
+PDF Rendering Service
+One place for every ReportLab export (Q&A sets, cover letters, improved
+resumes). Stylesheets are built once per process, Q&A rows are read from
+column arrays, and large Q&A exports build in a worker process so other
+sessions' reruns aren't held up on the GIL while they render.
+"""
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib import colors
-import pandas as pd
 from datetime import datetime
 
-def generate_qna_pdf(df: pd.DataFrame, role: str) -> bytes:
+from services.LazyImport import lazy_import
+
+# ReportLab (and pandas, for the Q&A signature) load on the first export
+_pagesizes = lazy_import("reportlab.lib.pagesizes")
+_rl_styles = lazy_import("reportlab.lib.styles")
+_units = lazy_import("reportlab.lib.units")
+_platypus = lazy_import("reportlab.platypus")
+colors = lazy_import("reportlab.lib.colors")
+pd = lazy_import("pandas")
+
+# Q&A exports with more questions than this build in a worker process.
+# The worker never renders faster, but it roughly halves other sessions'
+# rerun times during an export (pdf_render_bench). Below ~250 questions
+# its pickling and start-up cost is a large share of the export itself.
+LARGE_QNA_THRESHOLD = 250
+
+_RESUME_HEADINGS = ['SUMMARY', 'EXPERIENCE', 'EDUCATION', 'SKILLS', 'PROJECTS',
+                    'CERTIFICATIONS', 'ACHIEVEMENTS', 'CONTACT']
+
+_process_pool = None
+
+
+@lru_cache(maxsize=1)
+def _styles():
+    """Every style used by the exports, created once per process"""
+    base = _rl_styles.getSampleStyleSheet()
+    return {
+        "body": base["BodyText"],
+        # Q&A
+        "qna_title": _rl_styles.ParagraphStyle(
+            "title_style",
+            parent=base["Heading1"],
+            textColor=colors.HexColor("#1E88E5"),
+            spaceAfter=12,
+        ),
+        "qna_question": _rl_styles.ParagraphStyle(
+            "q_style",
+            parent=base["Heading4"],
+            textColor=colors.HexColor("#0D47A1"),
+            spaceAfter=6,
+        ),
+        "qna_answer": _rl_styles.ParagraphStyle(
+            "a_style",
+            parent=base["BodyText"],
+            spaceAfter=12,
+            leading=14,
+        ),
+        "qna_meta": _rl_styles.ParagraphStyle(
+            "meta_style",
+            parent=base["Normal"],
+            textColor=colors.gray,
+            fontSize=9,
+            spaceAfter=12,
+        ),
+        # Cover letter
+        "letter_title": _rl_styles.ParagraphStyle(
+            'CustomTitle',
+            parent=base['Heading1'],
+            fontSize=16,
+            textColor='#2C3E50',
+            spaceAfter=30,
+            alignment=1
+        ),
+        "letter_body": _rl_styles.ParagraphStyle(
+            'CustomBody',
+            parent=base['BodyText'],
+            fontSize=11,
+            leading=16,
+            spaceAfter=12,
+            alignment=0
+        ),
+        # Resume
+        "resume_heading": _rl_styles.ParagraphStyle(
+            'CustomHeading',
+            parent=base['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#1E3A8A'),
+            spaceAfter=12,
+            spaceBefore=16,
+            fontName='Helvetica-Bold'
+        ),
+        "resume_body": _rl_styles.ParagraphStyle(
+            'CustomBody',
+            parent=base['BodyText'],
+            fontSize=10,
+            leading=14,
+            spaceAfter=6,
+            fontName='Helvetica'
+        ),
+    }
+
+
+# ============= DOCUMENT TEMPLATES =============
+# Page sizes are named here and resolved from reportlab at render time
+_TEMPLATES = {
+    "qna": {"pagesize": "A4"},
+    "cover_letter": {"pagesize": "letter", "rightMargin": 72, "leftMargin": 72,
+                     "topMargin": 72, "bottomMargin": 18},
+    "resume": {"pagesize": "letter", "rightMargin": 54, "leftMargin": 54,
+               "topMargin": 54, "bottomMargin": 36},
+}
+
+
+def _render(template, content):
+    """Build flowables into PDF bytes using one of the document templates"""
+    pdf_buffer = BytesIO()
+    options = dict(_TEMPLATES[template])
+    options["pagesize"] = getattr(_pagesizes, options["pagesize"])
+    doc = _platypus.SimpleDocTemplate(pdf_buffer, **options)
+    doc.build(content)
+    return pdf_buffer.getvalue()
+
+
+def _get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        # spawn: never fork the (multi-threaded) Streamlit server
+        _process_pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(_shutdown_process_pool)
+    return _process_pool
+
+
+def _shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+# ============= Q&A =============
+def _build_qna(numbers, categories, questions, answers, role, timestamp):
+    """Render a Q&A set from plain column lists (picklable, runs in any process)"""
+    styles = _styles()
+    content = []
+
+    # --- Header Section ---
+    content.append(_platypus.Paragraph(f"Interview Q&A Set for {role.title()}", styles["qna_title"]))
+    content.append(_platypus.Paragraph(f"Generated on {timestamp}", styles["qna_meta"]))
+    content.append(_platypus.Spacer(1, 10))
+
+    # --- Add Questions and Answers ---
+    for number, category, question, answer in zip(numbers, categories, questions, answers):
+        content.append(_platypus.Paragraph(f"Q{number}. ({category})", styles["qna_question"]))
+        content.append(_platypus.Paragraph(f"<b>Question:</b> {question}", styles["body"]))
+        content.append(_platypus.Paragraph(f"<b>Answer:</b> {answer}", styles["qna_answer"]))
+        content.append(_platypus.Spacer(1, 6))
+
+    return _render("qna", content)
+
+
+def generate_qna_pdf(df: "pd.DataFrame", role: str, in_process=None) -> bytes:
     """
     Generate a formatted PDF containing Q&A pairs for a given job role.
 
     Args:
         df (pd.DataFrame): DataFrame with columns ['Category', 'Question', 'Answer']
         role (str): The job role name
+        in_process (bool): Force (True) or skip (False) the worker process;
+            by default only sets larger than LARGE_QNA_THRESHOLD use it
 
     Returns:
         bytes: PDF binary data
     """
-    pdf_buffer = BytesIO()
-    doc = SimpleDocTemplate(pdf_buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    content = []
+    def column(name, default):
+        return df[name].tolist() if name in df.columns else [default] * len(df)
 
-    # --- Custom Styles ---
-    title_style = ParagraphStyle(
-        "title_style",
-        parent=styles["Heading1"],
-        textColor=colors.HexColor("#1E88E5"),
-        spaceAfter=12,
-    )
-    q_style = ParagraphStyle(
-        "q_style",
-        parent=styles["Heading4"],
-        textColor=colors.HexColor("#0D47A1"),
-        spaceAfter=6,
-    )
-    a_style = ParagraphStyle(
-        "a_style",
-        parent=styles["BodyText"],
-        spaceAfter=12,
-        leading=14,
-    )
-    meta_style = ParagraphStyle(
-        "meta_style",
-        parent=styles["Normal"],
-        textColor=colors.gray,
-        fontSize=9,
-        spaceAfter=12,
+    args = (
+        [i + 1 for i in df.index.tolist()],
+        column("Category", "General"),
+        column("Question", ""),
+        column("Answer", ""),
+        role,
+        datetime.now().strftime("%d %b %Y, %I:%M %p"),
     )
 
-    # --- Header Section ---
-    content.append(Paragraph(f"Interview Q&A Set for {role.title()}", title_style))
-    timestamp = datetime.now().strftime("%d %b %Y, %I:%M %p")
-    content.append(Paragraph(f"Generated on {timestamp}", meta_style))
-    content.append(Spacer(1, 10))
+    if in_process is None:
+        in_process = len(df) > LARGE_QNA_THRESHOLD
+    if in_process:
+        try:
+            return _get_process_pool().submit(_build_qna, *args).result()
+        except Exception as e:
+            print(f"PDF worker error, rendering in-thread: {e}")
+    return _build_qna(*args)
 
-    # --- Add Questions and Answers ---
-    for i, row in df.iterrows():
-        category = row.get("Category", "General")
-        question = row.get("Question", "")
-        answer = row.get("Answer", "")
 
-        content.append(Paragraph(f"Q{i+1}. ({category})", q_style))
-        content.append(Paragraph(f"<b>Question:</b> {question}", styles["BodyText"]))
-        content.append(Paragraph(f"<b>Answer:</b> {answer}", a_style))
-        content.append(Spacer(1, 6))
+# ============= COVER LETTER =============
+def generate_cover_letter_pdf(cover_letter_text, job_role, company_name=""):
+    """Generate a professional PDF cover letter"""
+    styles = _styles()
+    body_style = styles["letter_body"]
+    content = []
 
-    # --- Build PDF ---
-    doc.build(content)
-    return pdf_buffer.getvalue()
\ No newline at end of file
+    # Title
+    company_text = f" - {company_name}" if company_name else ""
+    content.append(_platypus.Paragraph(f"Cover Letter: {job_role}{company_text}", styles["letter_title"]))
+    content.append(_platypus.Spacer(1, 0.2 * _units.inch))
+
+    # Date
+    date_text = datetime.now().strftime("%B %d, %Y")
+    content.append(_platypus.Paragraph(f"<i>{date_text}</i>", body_style))
+    content.append(_platypus.Spacer(1, 0.3 * _units.inch))
+
+    # Cover letter content
+    for para in cover_letter_text.split('\n\n'):
+        if para.strip():
+            content.append(_platypus.Paragraph(para.strip().replace('\n', '<br/>'), body_style))
+            content.append(_platypus.Spacer(1, 0.15 * _units.inch))
+
+    return _render("cover_letter", content)
+
+
+# ============= RESUME =============
+def generate_resume_pdf(resume_text, role):
+    """Generate a PDF of a plain-text resume, treating section titles as headings"""
+    styles = _styles()
+    heading_style, body_style = styles["resume_heading"], styles["resume_body"]
+    content = []
+
+    for section in resume_text.split('\n\n'):
+        if section.strip():
+            lines = section.split('\n')
+            first_line = lines[0].strip()
+
+            is_heading = (first_line.isupper() or
+                          any(heading in first_line.upper() for heading in _RESUME_HEADINGS))
+
+            if is_heading:
+                content.append(_platypus.Paragraph(first_line, heading_style))
+                if len(lines) > 1:
+                    content.append(_platypus.Paragraph('<br/>'.join(lines[1:]), body_style))
+            else:
+                content.append(_platypus.Paragraph('<br/>'.join(lines), body_style))
+
+            content.append(_platypus.Spacer(1, 0.1 * _units.inch))
+
+    return _render("resume", content)
@@ -1,18 +1,21 @@
 #  ------------- old claude version without ui ----------
 import os, re, json
 from dotenv import load_dotenv
-from services.RateLimiter import rate_limit, cached
-from langchain_google_genai import ChatGoogleGenerativeAI
+from services.RateLimiter import cached
+from services.Deadline import with_deadline
+from services.ModelRouter import invoke_prompt
 
 load_dotenv()
 
 api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY not found in environment variables")
 
-@rate_limit 
+@with_deadline("qna")
 @cached
 def generate_qna_from_resume(resume_text: str, job_role: str, num_questions: int = 10):
+    # Checked per call so the page still imports (and explains) without a key
+    if not os.getenv("GEMINI_API_KEY"):
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+
     MAX_CHARS = 10000
     if len(resume_text) > MAX_CHARS:
         resume_text = resume_text[:MAX_CHARS]
@@ -45,12 +48,7 @@ def generate_qna_from_resume(resume_text: str, job_role: str, num_questions: int
     Keep answers concise, practical, and easy to understand.
     """
 
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash-lite",
-        google_api_key=api_key,
-        temperature=0.3
-    )
-    response = llm.invoke(prompt)
+    response = invoke_prompt("qna", prompt, temperature=0.3)
 
     try:
         import json
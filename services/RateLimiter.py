@@ -1,70 +1,230 @@
 """
 Global Rate Limiter for All API Calls
-Prevents 429 errors by enforcing strict rate limits
+Prevents 429 errors with an AIMD (additive increase, multiplicative decrease)
+limiter that learns the usable request rate per API key and model
 """
+import hashlib
+import os
+import re
+import threading
 import time
 from functools import wraps
 
-# Global rate limiting state
-_api_call_timestamps = []
-_last_api_call = 0
-_min_call_interval = 10  # 10 seconds between calls
-_max_calls_per_minute = 5  # Maximum 5 calls per minute
+from services.Deadline import current_deadline
 
-def rate_limit(func):
-    """Decorator to enforce rate limiting on any function"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        global _api_call_timestamps, _last_api_call
-        current_time = time.time()
-        
-        # Remove timestamps older than 60 seconds (sliding window)
-        _api_call_timestamps = [t for t in _api_call_timestamps if current_time - t < 60]
-        
-        # Check if we've hit the per-minute limit
-        if len(_api_call_timestamps) >= _max_calls_per_minute:
-            oldest_call = min(_api_call_timestamps)
-            wait_time = 60 - (current_time - oldest_call) + 1
-            if wait_time > 0:
-                print(f"⏳ Rate limit: {_max_calls_per_minute} calls/minute reached. Waiting {wait_time:.1f}s")
-                time.sleep(wait_time)
-                _api_call_timestamps = []
-        
-        # Check minimum interval between calls
-        time_since_last = current_time - _last_api_call
-        if time_since_last < _min_call_interval:
-            sleep_time = _min_call_interval - time_since_last
-            print(f"⏳ Rate limiting: waiting {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-        
-        # Update timestamps
-        _last_api_call = time.time()
-        _api_call_timestamps.append(time.time())
-        
-        # Call the original function
-        return func(*args, **kwargs)
-    
-    return wrapper
+# ============= AIMD SETTINGS =============
+_initial_calls_per_minute = 6   # Start at the old 10s spacing
+_min_calls_per_minute = 1       # Never back off below 1 call/minute
+_max_calls_per_minute = 60      # Never probe above 1 call/second
+_additive_increase = 1          # +1 call/minute after each success
+_multiplicative_decrease = 0.5  # Halve the rate after each 429
+
+DEFAULT_MODEL = "default"
+
+_QUOTA_MARKERS = ["429", "quota", "resource_exhausted", "resource exhausted", "rate limit"]
+
+# Hints Gemini / HTTP use to say how long to back off
+_RETRY_AFTER_PATTERNS = [
+    re.compile(r"retry[-_ ]after[\"']?\s*[:=]?\s*[\"']?(\d+(?:\.\d+)?)", re.I),
+    re.compile(r"retry in (\d+(?:\.\d+)?)\s*s", re.I),
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.I),
+    re.compile(r"[\"']retryDelay[\"']\s*:\s*[\"'](\d+(?:\.\d+)?)s", re.I),
+]
+
+
+def is_quota_error(error):
+    """Return True if the error is a 429 / quota exhaustion response"""
+    error_msg = str(error).lower()
+    return any(marker in error_msg for marker in _QUOTA_MARKERS)
+
+
+def parse_retry_after(error):
+    """Extract a Retry-After hint (seconds) from an API error, if present"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers and headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except (TypeError, ValueError):
+            pass
+
+    text = str(error)
+    for pattern in _RETRY_AFTER_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            return float(m.group(1))
+    return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Spaces calls at 60 / calls_per_minute seconds and adapts that rate:
+    +`increase` calls/minute on success, x`decrease` on a 429, and no calls
+    at all until any Retry-After hint has passed.
+    """
+
+    def __init__(self, name=DEFAULT_MODEL, initial_rpm=_initial_calls_per_minute,
+                 min_rpm=_min_calls_per_minute, max_rpm=_max_calls_per_minute,
+                 increase=_additive_increase, decrease=_multiplicative_decrease,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.name = name
+        self.min_rpm = min_rpm
+        self.max_rpm = max_rpm
+        self.increase = increase
+        self.decrease = decrease
+        self._rpm = float(initial_rpm)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+
+    @property
+    def calls_per_minute(self):
+        return self._rpm
+
+    @property
+    def interval(self):
+        return 60.0 / self._rpm
+
+    def expected_wait(self):
+        """Seconds until the next free slot, without booking it"""
+        with self._lock:
+            now = self._clock()
+            return max(0.0, self._next_slot - now, self._blocked_until - now)
+
+    @property
+    def blocked(self):
+        """True while a Retry-After hint is still in force"""
+        return self._clock() < self._blocked_until
+
+    def reserve(self, max_wait=None):
+        """
+        Book the next free call slot and return how long to wait for it.
+        Returns None (and books nothing) if the wait would exceed max_wait.
+        """
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot, self._blocked_until)
+            if max_wait is not None and slot - now > max_wait:
+                return None
+            self._next_slot = slot + self.interval
+            return slot - now
+
+    def acquire(self, max_wait=None):
+        """Block until this caller may hit the API; returns seconds waited or None"""
+        wait_time = self.reserve(max_wait)
+        if wait_time is None:
+            return None
+        if wait_time > 0:
+            print(f"⏳ Rate limiting [{self.name} @ {self._rpm:.1f}/min]: waiting {wait_time:.1f}s")
+            self._sleep(wait_time)
+        return wait_time
+
+    def record_success(self):
+        with self._lock:
+            self._rpm = min(self.max_rpm, self._rpm + self.increase)
+
+    def record_throttle(self, retry_after=None):
+        """Back off after a 429, honouring the server's Retry-After hint"""
+        with self._lock:
+            now = self._clock()
+            # One decrease per interval so a burst of in-flight 429s
+            # doesn't collapse the rate to the floor
+            if now - self._last_decrease >= self.interval:
+                self._rpm = max(self.min_rpm, self._rpm * self.decrease)
+                self._last_decrease = now
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._next_slot = max(self._next_slot, self._blocked_until, now + self.interval)
+        print(f"🐢 Rate limit [{self.name}] backed off to {self._rpm:.1f}/min"
+              + (f", retry after {retry_after:.0f}s" if retry_after else ""))
+
+    def reset(self, initial_rpm=_initial_calls_per_minute):
+        with self._lock:
+            self._rpm = float(initial_rpm)
+            self._next_slot = 0.0
+            self._blocked_until = 0.0
+            self._last_decrease = float("-inf")
+
+
+# Learned limits, one per (API key, model)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _key_fingerprint(api_key):
+    # Never keep raw keys around as dict keys
+    if not api_key:
+        return "no-key"
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+def get_limiter(model=DEFAULT_MODEL, api_key=None):
+    """Return the shared limiter for this API key and model"""
+    if api_key is None:
+        api_key = os.getenv("GEMINI_API_KEY")
+    key = (_key_fingerprint(api_key), model)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveRateLimiter(name=model)
+        return _limiters[key]
+
+
+def report_success(model=DEFAULT_MODEL, api_key=None):
+    """Feed a successful API call back into the limiter"""
+    get_limiter(model, api_key).record_success()
+
+
+def report_error(model=DEFAULT_MODEL, error=None, api_key=None):
+    """Feed a failed API call back into the limiter (only 429s slow it down)"""
+    if error is not None and is_quota_error(error):
+        get_limiter(model, api_key).record_throttle(parse_retry_after(error))
+
+
+def acquire_slot(model=DEFAULT_MODEL, max_wait=None):
+    """
+    Wait for a slot on the model's limiter, counted against the current
+    deadline. With max_wait, returns None instead of waiting longer.
+    """
+    limiter = get_limiter(model)
+    deadline = current_deadline()
+    if deadline is None:
+        return limiter.acquire(max_wait=max_wait)
+
+    budget = deadline.remaining() if max_wait is None else min(max_wait, deadline.remaining())
+    with deadline.stage("rate_limit"):
+        wait_time = limiter.acquire(max_wait=budget)
+    if wait_time is None and max_wait is None:
+        raise deadline.exceeded("rate_limit")
+    return wait_time
 
 
 def reset_rate_limit():
     """Reset rate limiting state (useful for testing)"""
-    global _api_call_timestamps, _last_api_call
-    _api_call_timestamps = []
-    _last_api_call = 0
+    with _limiters_lock:
+        _limiters.clear()
 
 
 # Cache decorator
 _cache = {}
 _cache_max_size = 1000
 
+def _cache_key_hash(func, args, kwargs):
+    # Hash the full arguments: a key cut to the first 100 characters let a
+    # different role or job description with the same resume hit the cache
+    cache_key = repr((func.__module__, func.__qualname__, args, sorted(kwargs.items())))
+    return hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+
 def cached(func):
-    """Decorator to cache function results"""
+    """
+    Decorator to cache function results.
+    The wrapper also gets cache_get(*args) / cache_put(result, *args) so a
+    combined call can fill the caches of the functions it replaces.
+    """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        # Create cache key from function name and args
-        cache_key = f"{func.__name__}:{str(args)[:100]}:{str(kwargs)[:100]}"
-        cache_key_hash = hash(cache_key)
+        cache_key_hash = _cache_key_hash(func, args, kwargs)
         
         # Check cache
         if cache_key_hash in _cache:
@@ -74,6 +234,11 @@ def cached(func):
         # Call function
         result = func(*args, **kwargs)
         
+        # Don't keep a fallback produced because the latency budget ran out
+        deadline = current_deadline()
+        if deadline is not None and deadline.exceeded_stage:
+            return result
+        
         # Store in cache
         if len(_cache) >= _cache_max_size:
             # Remove oldest entry
@@ -82,4 +247,16 @@ def cached(func):
         
         return result
     
+    def cache_get(*args, **kwargs):
+        """Return the cached result for these arguments, or None"""
+        return _cache.get(_cache_key_hash(func, args, kwargs))
+    
+    def cache_put(result, *args, **kwargs):
+        """Store a result as if func(*args, **kwargs) had returned it"""
+        if len(_cache) >= _cache_max_size:
+            _cache.pop(next(iter(_cache)))
+        _cache[_cache_key_hash(func, args, kwargs)] = result
+    
+    wrapper.cache_get = cache_get
+    wrapper.cache_put = cache_put
     return wrapper
\ No newline at end of file
@@ -1,7 +1,13 @@
 import os
 import json
 import re
-from services.RateLimiter import rate_limit, cached
+import threading
+import uuid
+from services.RateLimiter import cached
+from services.CircuitBreaker import circuit_breaker, gemini_breaker
+from services.Deadline import with_deadline
+from services.LazyImport import lazy_import
+from services.ModelRouter import get_chat_model, invoke_routed
 from dotenv import load_dotenv
 
 # Defensive Streamlit import (display function will require it)
@@ -11,29 +17,15 @@ except Exception:
     st = None
 
 # Use pdfplumber for robust PDF extraction (Home.py uses it too)
-try:
-    import pdfplumber
-except Exception:
-    pdfplumber = None
+pdfplumber = lazy_import("pdfplumber", optional=True)
 
 # Optional resume parser
-try:
-    from pyresparser import ResumeParser
-except Exception:
-    ResumeParser = None
+pyresparser = lazy_import("pyresparser", optional=True)
 
-# LangChain / LangGraph / Gemini imports
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langgraph.checkpoint.memory import MemorySaver
-    from langgraph.prebuilt import create_react_agent
-    from langchain_core.messages import SystemMessage, HumanMessage
-except Exception:
-    ChatGoogleGenerativeAI = None
-    MemorySaver = None
-    create_react_agent = None
-    SystemMessage = None
-    HumanMessage = None
+# LangChain / LangGraph modules, imported on the first analysis
+_prebuilt = lazy_import("langgraph.prebuilt", optional=True)
+_checkpoint = lazy_import("langgraph.checkpoint.memory", optional=True)
+_messages = lazy_import("langchain_core.messages", optional=True)
 
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
@@ -41,25 +33,47 @@ api_key = os.getenv("GEMINI_API_KEY")
 # ---------------------------------------------------
 # Setup LLM (optional â€” only if all deps + key present)
 # ---------------------------------------------------
-llm = None
+# The model router picks the model per call. RESUME_ENGINE=direct (default)
+# sends the two analysis messages straight to the chat model; =agent keeps
+# the tool-less react agent, built per model on first use.
+RESUME_ENGINE = os.getenv("RESUME_ENGINE", "direct").lower()
+if RESUME_ENGINE == "agent":
+    ANALYSIS_AVAILABLE = bool(_prebuilt and _checkpoint and _messages and api_key)
+else:
+    ANALYSIS_AVAILABLE = bool(_messages and api_key)
 memory = None
-resume_agent = None
-THREAD_ID = "resume-analysis-001"
-
-if ChatGoogleGenerativeAI and create_react_agent and MemorySaver and api_key:
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-lite",
-            google_api_key=api_key,
-            temperature=0.2,
-            convert_system_message_to_human=True
-        )
-        memory = MemorySaver()
-        resume_agent = create_react_agent(model=llm, tools=[], checkpointer=memory)
-    except Exception:
-        llm = None
-        memory = None
-        resume_agent = None
+_resume_agents = {}
+_agents_lock = threading.Lock()
+
+def _get_resume_agent(model):
+    """Resume analysis agent for a routed model (None if deps/key missing)"""
+    global memory
+    if not (_prebuilt and _checkpoint and ANALYSIS_AVAILABLE):
+        return None
+    with _agents_lock:
+        if memory is None:
+            memory = _checkpoint.MemorySaver()
+        if model not in _resume_agents:
+            llm = get_chat_model(model, temperature=0.2, convert_system_message_to_human=True)
+            _resume_agents[model] = _prebuilt.create_react_agent(model=llm, tools=[], checkpointer=memory)
+        return _resume_agents[model]
+
+def _analysis_reply(model, messages):
+    """Text of the model's answer to the analysis messages, on the configured engine"""
+    if RESUME_ENGINE == "agent":
+        # Analyses are independent: each gets its own checkpoint thread,
+        # dropped afterwards, so earlier resumes never reach the prompt
+        thread_id = f"resume-analysis-{uuid.uuid4().hex}"
+        final_message = None
+        try:
+            for chunk in _get_resume_agent(model).stream({"messages": messages}, {"configurable": {"thread_id": thread_id}}):
+                if "agent" in chunk:
+                    final_message = chunk["agent"]["messages"][0].content
+        finally:
+            memory.delete_thread(thread_id)
+        return final_message
+    llm = get_chat_model(model, temperature=0.2, convert_system_message_to_human=True)
+    return llm.invoke(messages).content
 
 # -------------------------
 # PDF reader (pdfplumber)
@@ -140,9 +154,9 @@ def display_basic_info_from_resume(resume_data: dict = None, pdf_path: str = Non
     if st is None:
         raise ImportError("Streamlit required to use display_basic_info_from_resume()")
 
-    if resume_data is None and pdf_path and ResumeParser:
+    if resume_data is None and pdf_path and pyresparser:
         try:
-            resume_data = ResumeParser(pdf_path).get_extracted_data()
+            resume_data = pyresparser.ResumeParser(pdf_path).get_extracted_data()
         except Exception:
             resume_data = None
 
@@ -254,14 +268,68 @@ def recommend_courses_for_required_skills(required_skills: set, courses_mapping:
         ("The Web Developer Bootcamp (Udemy)", "https://www.udemy.com/course/the-web-developer-bootcamp")
     ]
 
-@rate_limit
+def _analysis_fallback(resume_text, role, job_description=""):
+    """Generic analysis built from local skill extraction (no API)"""
+    return {
+        "Overall_Score": 65,
+        "Category_Scores": {
+            "Presentation & Format": 70,
+            "Skills": 65,
+            "Projects": 60,
+            "Education": 70,
+            "Experience": 65,
+            "Certifications": 60,
+            "Achievements": 65
+        },
+        "Strengths": [
+            "Resume structure is clear and organized",
+            "Relevant experience highlighted",
+            "Educational background is strong"
+        ],
+        "Weaknesses": {
+            "Critical": [
+                "Add more quantifiable achievements with metrics",
+                "Include more technical skills relevant to the role"
+            ],
+            "Medium": [
+                "Expand project descriptions with outcomes",
+                "Add more action verbs in experience section"
+            ],
+            "Low": [
+                "Consider adding certifications"
+            ]
+        },
+        "Suggestions": {
+            "Critical": [
+                "Quantify achievements: 'Increased sales by 30%' not just 'Increased sales'",
+                "Add relevant keywords from job description"
+            ],
+            "Medium": [
+                "Use stronger action verbs: Led, Developed, Achieved, Implemented",
+                "Add links to projects and portfolio"
+            ],
+            "Low": [
+                "Consider adding a professional summary at the top",
+                "Ensure consistent formatting throughout"
+            ]
+        },
+        "resume_skills": extract_skills_from_text(resume_text),
+        "job_required_skills": extract_required_skills_from_jd(role, job_description),
+        "skills_to_improve": list(
+            extract_required_skills_from_jd(role, job_description) - 
+            extract_skills_from_text(resume_text)
+        )[:5]
+    }
+
+@with_deadline("analysis", fallback=_analysis_fallback)
 @cached
 def analyze_resume_langgraph(resume_text: str, role: str, job_description: str = ""):
     """
     Modified to use rate limiting and caching
     Keep all existing code but add these decorators
+    Pass timeout=<seconds> to cap the call (defaults to the analysis SLO)
     """
-    if resume_agent is None:
+    if not ANALYSIS_AVAILABLE:
         raise RuntimeError("Resume analysis agent unavailable. Check GEMINI_API_KEY & dependencies.")
 
     MAX_CHARS = 10000
@@ -308,15 +376,8 @@ def analyze_resume_langgraph(resume_text: str, role: str, job_description: str =
     """
 
     try:
-        stream = resume_agent.stream(
-            {"messages": [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]},
-            {"configurable": {"thread_id": THREAD_ID}}
-        )
-
-        final_message = None
-        for chunk in stream:
-            if "agent" in chunk:
-                final_message = chunk["agent"]["messages"][0].content
+        messages = [_messages.SystemMessage(content=system_prompt), _messages.HumanMessage(content=human_prompt)]
+        final_message = invoke_routed("analysis", lambda model: _analysis_reply(model, messages))
 
         if final_message is None:
             return {"error": "No response from model."}
@@ -326,62 +387,41 @@ def analyze_resume_langgraph(resume_text: str, role: str, job_description: str =
         
     except Exception as e:
         print(f"Analysis error: {e}")
-        # Return fallback structure
-        return {
-            "Overall_Score": 65,
-            "Category_Scores": {
-                "Presentation & Format": 70,
-                "Skills": 65,
-                "Projects": 60,
-                "Education": 70,
-                "Experience": 65,
-                "Certifications": 60,
-                "Achievements": 65
-            },
-            "Strengths": [
-                "Resume structure is clear and organized",
-                "Relevant experience highlighted",
-                "Educational background is strong"
-            ],
-            "Weaknesses": {
-                "Critical": [
-                    "Add more quantifiable achievements with metrics",
-                    "Include more technical skills relevant to the role"
-                ],
-                "Medium": [
-                    "Expand project descriptions with outcomes",
-                    "Add more action verbs in experience section"
-                ],
-                "Low": [
-                    "Consider adding certifications"
-                ]
-            },
-            "Suggestions": {
-                "Critical": [
-                    "Quantify achievements: 'Increased sales by 30%' not just 'Increased sales'",
-                    "Add relevant keywords from job description"
-                ],
-                "Medium": [
-                    "Use stronger action verbs: Led, Developed, Achieved, Implemented",
-                    "Add links to projects and portfolio"
-                ],
-                "Low": [
-                    "Consider adding a professional summary at the top",
-                    "Ensure consistent formatting throughout"
-                ]
-            },
-            "resume_skills": extract_skills_from_text(resume_text),
-            "job_required_skills": extract_required_skills_from_jd(role, job_description),
-            "skills_to_improve": list(
-                extract_required_skills_from_jd(role, job_description) - 
-                extract_skills_from_text(resume_text)
-            )[:5]
-        }
-
-@rate_limit
+        return _analysis_fallback(resume_text, role, job_description)
+
+def _job_fit_fallback(resume_text, job_description):
+    """Calculate a basic match from skill overlap (no API)"""
+    resume_skills = extract_skills_from_text(resume_text[:3000])
+    job_skills = extract_required_skills_from_jd("", job_description[:2000])
+
+    if job_skills:
+        overlap = len(resume_skills & job_skills)
+        total = len(job_skills)
+        match_score = min((overlap / total) * 10, 10) if total > 0 else 5.0
+    else:
+        match_score = 6.0
+
+    if match_score >= 8:
+        label = "Strong Match"
+        tip = "Your skills align well! Highlight these specific skills in your application."
+    elif match_score >= 5:
+        label = "Moderate Match"
+        tip = "Focus on learning the missing skills: " + ", ".join(list(job_skills - resume_skills)[:3])
+    else:
+        label = "Weak Match"
+        tip = "Consider gaining more relevant experience or skills before applying."
+
+    return {
+        "match_score": match_score,
+        "match_label": label,
+        "actionable_tip": tip
+    }
+
+@with_deadline("job_fit", fallback=_job_fit_fallback)
+@circuit_breaker(_job_fit_fallback)
 @cached
 def analyze_job_fit(resume_text, job_description):
-    """Modified to include fallback and better error handling"""
+    """Modified to include fallback and better error handling (timeout=<seconds> caps the call)"""
     
     # Truncate to reduce tokens
     resume_text = resume_text[:3000]
@@ -403,17 +443,11 @@ JSON format:
 """
 
     try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        import os, json, re
-
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash-8b",
-            google_api_key=os.getenv("GEMINI_API_KEY"),
-            temperature=0.2,
-            request_timeout=30
-        )
-
-        response = llm.invoke(prompt).content
+        response = invoke_routed(
+            "job_fit",
+            lambda model: get_chat_model(model, temperature=0.2).invoke(prompt)
+        ).content
+        gemini_breaker.record_success()
         cleaned = re.sub(r"^```json|```$", "", response.strip(), flags=re.MULTILINE)
         result = json.loads(cleaned)
         
@@ -425,32 +459,118 @@ JSON format:
         
     except Exception as e:
         print(f"Job match error: {e}")
+        gemini_breaker.record_failure(e)
         # Fallback: Calculate basic match based on skill overlap
-        resume_skills = extract_skills_from_text(resume_text)
-        job_skills = extract_required_skills_from_jd("", job_description)
-        
-        if job_skills:
-            overlap = len(resume_skills & job_skills)
-            total = len(job_skills)
-            match_score = min((overlap / total) * 10, 10) if total > 0 else 5.0
-        else:
-            match_score = 6.0
-        
-        if match_score >= 8:
-            label = "Strong Match"
-            tip = "Your skills align well! Highlight these specific skills in your application."
-        elif match_score >= 5:
-            label = "Moderate Match"
-            tip = "Focus on learning the missing skills: " + ", ".join(list(job_skills - resume_skills)[:3])
-        else:
-            label = "Weak Match"
-            tip = "Consider gaining more relevant experience or skills before applying."
-        
-        return {
-            "match_score": match_score,
-            "match_label": label,
-            "actionable_tip": tip
-        }
+        return _job_fit_fallback(resume_text, job_description)
+
+def _combined_fallback(resume_text, role, job_description=""):
+    """Local analysis + skill-overlap match (no API)"""
+    job_match = _job_fit_fallback(resume_text, job_description) if job_description else None
+    return _analysis_fallback(resume_text, role, job_description), job_match
+
+@with_deadline("analysis", fallback=_combined_fallback)
+def analyze_resume_and_job_fit(resume_text: str, role: str, job_description: str = ""):
+    """
+    Resume analysis and job match in ONE model call when a job description
+    is given. Returns (analysis, job_match); job_match is None without a JD.
+    Both results are stored in the analyze_resume_langgraph / analyze_job_fit
+    caches, so later calls to either one are free.
+    """
+    if not ANALYSIS_AVAILABLE:
+        raise RuntimeError("Resume analysis agent unavailable. Check GEMINI_API_KEY & dependencies.")
+
+    if not job_description:
+        return analyze_resume_langgraph(resume_text, role, job_description), None
+
+    # Reuse whatever we already have instead of paying for the combined call
+    analysis = analyze_resume_langgraph.cache_get(resume_text, role, job_description)
+    job_match = analyze_job_fit.cache_get(resume_text, job_description)
+    if analysis is not None and job_match is not None:
+        print("✅ Using cached result for analyze_resume_and_job_fit")
+        return analysis, job_match
+    if analysis is not None:
+        return analysis, analyze_job_fit(resume_text, job_description)
+    if job_match is not None:
+        return analyze_resume_langgraph(resume_text, role, job_description), job_match
+
+    # Checked here rather than with @circuit_breaker so the half-open probe
+    # isn't held while analyze_job_fit above checks the same breaker
+    ticket = gemini_breaker.allow_request()
+    if not ticket:
+        print("⚡ Circuit open - using fallback for analyze_resume_and_job_fit")
+        return _combined_fallback(resume_text, role, job_description)
+
+    prompt = f"""You are an expert resume reviewer. Analyze the resume for the target role
+and evaluate how well it matches the job description. Reply with valid JSON only.
+
+Resume: {resume_text[:5000]}
+Target Role: {role}
+Job Description: {job_description[:2000]}
+
+REQUIRED JSON OUTPUT:
+{{
+  "Overall_Score": int (0-100),
+  "Category_Scores": {{
+    "Presentation & Format": int,
+    "Skills": int,
+    "Projects": int,
+    "Education": int,
+    "Experience": int,
+    "Certifications": int,
+    "Achievements": int
+  }},
+  "Strengths": ["strength1", "strength2", "strength3"],
+  "Weaknesses": {{
+    "Critical": ["issue1", "issue2"],
+    "Medium": ["issue1", "issue2"],
+    "Low": ["issue1"]
+  }},
+  "Suggestions": {{
+    "Critical": ["suggestion1", "suggestion2"],
+    "Medium": ["suggestion1", "suggestion2"],
+    "Low": ["suggestion1"]
+  }},
+  "resume_skills": ["skill1", "skill2", "skill3"],
+  "job_required_skills": ["skill1", "skill2", "skill3"],
+  "skills_to_improve": ["skill1", "skill2", "skill3"],
+  "Job_Match": {{
+    "match_score": float (0-10),
+    "match_label": "Strong Match / Moderate Match / Weak Match",
+    "actionable_tip": "specific tip"
+  }}
+}}
+"""
+
+    try:
+        response = invoke_routed(
+            "analysis",
+            lambda model: get_chat_model(model, temperature=0.2).invoke(prompt)
+        ).content
+        gemini_breaker.record_success()
+        cleaned = re.sub(r"```json|```", "", response).strip()
+        result = json.loads(cleaned)
+
+        job_match = result.pop("Job_Match", None)
+        if "Overall_Score" not in result:
+            raise ValueError("Invalid response")
+        analysis = result
+
+    except Exception as e:
+        print(f"Combined analysis error: {e}")
+        gemini_breaker.record_failure(e)
+        return _combined_fallback(resume_text, role, job_description)
+    finally:
+        gemini_breaker.release_probe(ticket)
+
+    analyze_resume_langgraph.cache_put(analysis, resume_text, role, job_description)
+    if isinstance(job_match, dict) and "match_score" in job_match:
+        analyze_job_fit.cache_put(job_match, resume_text, job_description)
+    else:
+        # Model skipped the match block; ask for it separately
+        job_match = analyze_job_fit(resume_text, job_description)
+
+    return analysis, job_match
+
 # -------------------------
 # Exports
 # -------------------------
@@ -463,5 +583,6 @@ __all__ = [
     "recommend_courses_for_required_skills",
     "analyze_resume_langgraph",
     "analyze_job_fit",
+    "analyze_resume_and_job_fit",
     "_FLATTENED_SKILLS",
 ]
@@ -0,0 +1,150 @@
+"""
+Near-Duplicate Answer Cache for the Career Chatbot
+Questions are turned into sparse hashed term vectors (stop words dropped,
+crude suffix stemming), so "How do I negotiate salary?" and "tips for
+salary negotiation" land close together. An inverted index finds the
+nearest stored question; above the similarity threshold its answer is
+reused. Entries are scoped (role + context) and evicted LRU under a
+memory cap. CPU only, no model download.
+"""
+import math
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+DEFAULT_THRESHOLD = float(os.getenv("CHAT_SIMILARITY_THRESHOLD", "0.8"))
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+_HASH_BITS = 18  # 262k buckets - collisions between real words are rare
+_ENTRY_OVERHEAD = 200  # Rough bytes per entry beyond its text (dicts, keys)
+_FEATURE_BYTES = 80    # Rough bytes per stored feature + posting
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {
+    "a", "an", "the", "i", "me", "my", "we", "you", "your", "it", "is", "are", "am", "be",
+    "do", "does", "did", "to", "of", "for", "in", "on", "at", "and", "or", "with", "about",
+    "how", "what", "which", "can", "could", "should", "would", "will", "some", "any", "give",
+    "tips", "tip", "advice", "please", "tell", "way", "ways", "best", "good", "get", "there",
+    "this", "that", "so", "as", "from", "into", "when", "where", "who", "why", "help",
+}
+# Longest first; a stem must keep at least 3 characters
+_SUFFIXES = ("ations", "ation", "ments", "ment", "ings", "ing", "ions", "ion", "ies",
+             "ates", "ate", "ers", "er", "ed", "ly", "es", "s")
+
+
+def _stem(word):
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    # "prepare" and "preparing" should meet at "prepar"
+    return word[:-1] if word.endswith("e") and len(word) > 4 else word
+
+
+def tokenize(text):
+    """Lowercased, stemmed content words of `text`"""
+    return [_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def vectorize(text):
+    """Sparse L2-normalised hashed term vector: {bucket: weight}"""
+    counts = {}
+    for token in tokenize(text):
+        bucket = zlib.crc32(token.encode("utf-8")) & ((1 << _HASH_BITS) - 1)
+        counts[bucket] = counts.get(bucket, 0) + 1
+    if not counts:
+        return {}
+    # Sublinear term frequency, so a repeated word doesn't dominate
+    weights = {b: 1 + math.log(c) for b, c in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {b: w / norm for b, w in weights.items()}
+
+
+class SemanticCache:
+    """
+    LRU of (question vector, answer) pairs per scope with an inverted index
+    for nearest-neighbour lookups. Thread-safe.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_bytes=DEFAULT_MAX_BYTES):
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # id -> (scope, vector, answer, nbytes)
+        self._postings = {}            # (scope, bucket) -> set of ids
+        self._size = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._size
+
+    def _best_match(self, vector, scope):
+        """(entry id, cosine similarity) of the closest entry; call with the lock held"""
+        scores = {}
+        for bucket, weight in vector.items():
+            for entry_id in self._postings.get((scope, bucket), ()):
+                scores[entry_id] = scores.get(entry_id, 0.0) + weight * self._entries[entry_id][1][bucket]
+        if not scores:
+            return None, 0.0
+        best = max(scores, key=scores.get)
+        return best, scores[best]
+
+    def nearest(self, question, scope=""):
+        """(answer, similarity) of the closest stored question in `scope`, or (None, 0.0)"""
+        vector = vectorize(question)
+        with self._lock:
+            best, similarity = self._best_match(vector, scope)
+            return (self._entries[best][2] if best is not None else None), similarity
+
+    def get(self, question, scope=""):
+        """Stored answer for a question similar enough to `question`, else None"""
+        vector = vectorize(question)
+        with self._lock:
+            best, similarity = self._best_match(vector, scope)
+            if best is None or similarity < self.threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best)
+            self.hits += 1
+            return self._entries[best][2]
+
+    def put(self, question, answer, scope=""):
+        vector = vectorize(question)
+        if not vector or not answer:
+            return
+        nbytes = _ENTRY_OVERHEAD + len(answer) + _FEATURE_BYTES * len(vector)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (scope, vector, answer, nbytes)
+            for bucket in vector:
+                self._postings.setdefault((scope, bucket), set()).add(entry_id)
+            self._size += nbytes
+            # Evict least recently used answers until we fit again
+            while self._size > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def _evict(self, entry_id):
+        scope, vector, _, nbytes = self._entries.pop(entry_id)
+        for bucket in vector:
+            ids = self._postings[(scope, bucket)]
+            ids.discard(entry_id)
+            if not ids:
+                del self._postings[(scope, bucket)]
+        self._size -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._size = 0
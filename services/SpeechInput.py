@@ -0,0 +1,188 @@
+"""
+Speech Input from Browser Recordings
+Audio comes from st.audio_input (a WAV recorded in the browser). A NumPy
+energy VAD trims silence and splits it into speech chunks; each chunk goes
+to the recognizer as soon as it is found, so recognition starts on the
+first chunk instead of after the whole recording.
+"""
+import io
+import os
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from services.LazyImport import lazy_import
+
+# Loaded on the first recording
+np = lazy_import("numpy")
+sr = lazy_import("speech_recognition", optional=True)
+
+# ============= VAD SETTINGS =============
+_FRAME_MS = 30             # Energy is measured per 30ms frame
+_MIN_ENERGY = 0.01         # RMS floor (float audio in [-1, 1]) counted as speech
+_NOISE_MULTIPLIER = 3.0    # Speech must be this much louder than the noise floor
+_MEDIAN_CEILING = 0.8      # ...but never louder than this share of the median frame
+_MIN_NOISE_MARGIN = 1.5    # ...nor closer to the noise floor than this
+_MAX_GAP_MS = 500          # Pauses shorter than this stay inside one chunk
+_PAD_MS = 150              # Keep a little audio around each chunk
+_MIN_SPEECH_MS = 250       # Ignore clicks / pops shorter than this
+_MAX_CHUNK_S = 12.0        # Split long monologues so chunks recognise in parallel
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speech")
+
+
+def decode_wav(data):
+    """Return (mono float32 samples in [-1, 1], sample_rate) from WAV bytes"""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        rate = wav.getframerate()
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        frames = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def to_pcm16(samples):
+    """Float samples back to 16-bit little-endian PCM bytes"""
+    return (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def frame_energy(samples, rate, frame_ms=_FRAME_MS):
+    """RMS energy per frame"""
+    frame_len = max(1, int(rate * frame_ms / 1000))
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), frame_len
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(frames ** 2, axis=1)), frame_len
+
+
+def speech_threshold(energy):
+    """
+    Frame energy above which a frame counts as speech: well above the
+    quietest tenth of the recording. A recording with no silence has speech
+    in that tenth too, so the threshold is capped below the median frame
+    (while staying clear of the noise floor when most of it is silence).
+    """
+    noise_floor = float(np.percentile(energy, 10))
+    median = float(np.median(energy))
+    threshold = min(noise_floor * _NOISE_MULTIPLIER, median * _MEDIAN_CEILING)
+    return max(_MIN_ENERGY, threshold, noise_floor * _MIN_NOISE_MARGIN)
+
+
+def iter_speech_segments(samples, rate, max_chunk_s=_MAX_CHUNK_S):
+    """
+    Yield (start, end) sample ranges containing speech, in order, as soon as
+    each one is closed by a long enough pause (or reaches max_chunk_s).
+    """
+    energy, frame_len = frame_energy(samples, rate)
+    if len(energy) == 0:
+        return
+
+    voiced = energy > speech_threshold(energy)
+
+    max_gap = max(1, _MAX_GAP_MS // _FRAME_MS)
+    min_speech = max(1, _MIN_SPEECH_MS // _FRAME_MS)
+    max_frames = max(1, int(max_chunk_s * 1000 / _FRAME_MS))
+    pad = int(rate * _PAD_MS / 1000)
+
+    def _segment(first, last):
+        start = max(0, first * frame_len - pad)
+        end = min(len(samples), (last + 1) * frame_len + pad)
+        return start, end
+
+    first = last = None
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced:
+            if first is None:
+                first = i
+            last = i
+            if last - first + 1 >= max_frames:
+                yield _segment(first, last)
+                first = last = None
+        elif first is not None and i - last > max_gap:
+            if last - first + 1 >= min_speech:
+                yield _segment(first, last)
+            first = last = None
+
+    if first is not None and last - first + 1 >= min_speech:
+        yield _segment(first, last)
+
+
+# ============= RECOGNIZERS =============
+class GoogleRecognizer:
+    """Google Web Speech via SpeechRecognition"""
+
+    name = "google"
+
+    def __init__(self, language="en-US"):
+        if sr is None:
+            raise RuntimeError("SpeechRecognition is not installed")
+        self.language = language
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, samples, rate, index=0):
+        audio = sr.AudioData(to_pcm16(samples), rate, 2)
+        try:
+            return self._recognizer.recognize_google(audio, language=self.language)
+        except sr.UnknownValueError:
+            return ""
+
+
+class LocalRecognizer:
+    """
+    Offline stand-in for tests and demos: returns the scripted transcript
+    for each chunk index (chunks recognise in parallel, so not in call
+    order), or a placeholder describing the chunk.
+    """
+
+    name = "local"
+
+    def __init__(self, transcripts=None):
+        self.transcripts = list(transcripts or [])
+
+    def recognize(self, samples, rate, index=0):
+        if index < len(self.transcripts):
+            return self.transcripts[index]
+        return f"[speech {len(samples) / rate:.1f}s]"
+
+
+RECOGNIZERS = {
+    "google": GoogleRecognizer,
+    "local": LocalRecognizer,
+}
+
+
+def get_recognizer(name=None, **kwargs):
+    """Build a recognizer by name (default: SPEECH_RECOGNIZER env var, else google)"""
+    name = name or os.getenv("SPEECH_RECOGNIZER", "google")
+    if name not in RECOGNIZERS:
+        raise ValueError(f"Unknown speech recognizer '{name}'. Options: {', '.join(RECOGNIZERS)}")
+    return RECOGNIZERS[name](**kwargs)
+
+
+def transcribe(data, recognizer=None):
+    """
+    Transcribe WAV bytes. Chunks are sent for recognition as the VAD finds
+    them and joined in order. Returns "" if no speech was found.
+    Recognizer errors (e.g. the service being down) are raised.
+    """
+    recognizer = recognizer or get_recognizer()
+    samples, rate = decode_wav(data)
+
+    futures = [
+        _executor.submit(recognizer.recognize, samples[start:end], rate, index=idx)
+        for idx, (start, end) in enumerate(iter_speech_segments(samples, rate))
+    ]
+    texts = [f.result() for f in futures]
+    return " ".join(t.strip() for t in texts if t and t.strip())
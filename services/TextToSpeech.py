@@ -0,0 +1,314 @@
+"""
+Text-to-Speech with a Content-Addressed Audio Cache
+Interviewer lines are synthesised with edge_tts straight into memory on one
+long-lived background event loop, and cached by sha256(text, voice, rate),
+so repeated lines are never synthesised twice and nothing is written to
+the working directory. Scripted lines (fallback questions, closing message)
+are pre-rendered into a shared tier so they play without any network call.
+"""
+import asyncio
+import hashlib
+import queue
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from services import Metrics
+from services.LazyImport import lazy_import
+
+# edge_tts (and its aiohttp stack) loads on the first synthesis
+edge_tts = lazy_import("edge_tts", optional=True)
+
+DEFAULT_VOICE = "en-GB-RyanNeural"
+DEFAULT_RATE = "+25%"
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024  # ~20 minutes of 48kbps speech per session
+SCRIPTED_CACHE_BYTES = 16 * 1024 * 1024
+
+_MAX_CONCURRENT_SYNTHESES = 4  # Parallel edge_tts requests across all sessions
+_SYNTHESIS_TIMEOUT = 30.0
+
+# Sentence end: . ! ? (plus closing quotes/brackets) followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+_ABBREVIATIONS = ("e.g.", "i.e.", "etc.", "vs.", "mr.", "mrs.", "ms.", "dr.")
+_MIN_SENTENCE_CHARS = 20  # Merge very short fragments into the next sentence
+
+
+def audio_key(text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+    """Content address for one synthesised line"""
+    return hashlib.sha256(f"{voice}|{rate}|{text}".encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    LRU of mp3 bytes bounded by total size. Keep one per Streamlit session
+    (in st.session_state) so sessions never see each other's audio.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def size(self):
+        return self._size
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = data
+            self._size += len(data)
+            # Evict least recently played lines until we fit again
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+async def synthesize_async(text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+    """Return the mp3 bytes for `text` (b"" on failure)"""
+    try:
+        communicate = edge_tts.Communicate(text, voice=voice, rate=rate)
+        chunks = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+        return b"".join(chunks)
+    except Exception as e:
+        print(f"TTS Error: {e}")
+        return b""
+
+
+class TtsWorker:
+    """
+    One background thread running an asyncio loop for the whole process.
+    submit() hands it a synthesis job and returns a concurrent Future right
+    away, so Streamlit keeps rendering while audio is produced; up to
+    `max_concurrent` jobs run at the same time.
+    """
+
+    def __init__(self, max_concurrent=_MAX_CONCURRENT_SYNTHESES):
+        self.max_concurrent = max_concurrent
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._semaphore = None
+            self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _synthesize(self, text, voice, rate):
+        if self._semaphore is None:
+            # Created on the worker loop itself
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        async with self._semaphore:
+            return await synthesize_async(text, voice, rate)
+
+    def submit(self, text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+        """Queue a synthesis; returns a Future resolving to mp3 bytes"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self._synthesize(text, voice, rate), self._loop)
+
+    def stop(self):
+        with self._lock:
+            if not self.running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_worker = TtsWorker()
+
+# Shared by every session: only holds fixed scripted lines, never user content
+_scripted_cache = AudioCache(max_bytes=SCRIPTED_CACHE_BYTES)
+
+
+def get_worker():
+    """The shared TTS worker (started on first use)"""
+    return _worker
+
+
+def _done(data):
+    future = Future()
+    future.set_result(data)
+    return future
+
+
+def synthesize(text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE, timeout=_SYNTHESIS_TIMEOUT):
+    """Blocking synthesis through the worker (b"" on failure/timeout)"""
+    if edge_tts is None or not text:
+        return b""
+    try:
+        return get_worker().submit(text, voice, rate).result(timeout=timeout)
+    except Exception as e:
+        print(f"TTS Error: {e}")
+        return b""
+
+
+def speak_later(text, cache, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+    """
+    Return (key, Future of mp3 bytes) without blocking. Cached lines resolve
+    immediately; new ones are synthesised on the worker and land in `cache`.
+    Failed syntheses aren't cached so the next attempt can retry.
+    """
+    key = audio_key(text, voice, rate)
+    if cache is not _scripted_cache and key in _scripted_cache:
+        Metrics.increment("tts_cache_hit", tier="scripted")
+        return key, _done(_scripted_cache.get(key))
+    data = cache.get(key)
+    if data is not None:
+        Metrics.increment("tts_cache_hit", tier="session")
+        return key, _done(data)
+    if edge_tts is None or not text:
+        return key, _done(b"")
+
+    Metrics.increment("tts_synthesis")
+    future = get_worker().submit(text, voice, rate)
+
+    def _store(f):
+        if not f.cancelled() and f.exception() is None and f.result():
+            cache.put(key, f.result())
+
+    future.add_done_callback(_store)
+    return key, future
+
+
+def wait_for_audio(future, timeout=_SYNTHESIS_TIMEOUT):
+    """Resolve a speak_later() future to bytes (b"" on failure/timeout)"""
+    try:
+        return future.result(timeout=timeout)
+    except Exception as e:
+        print(f"TTS Error: {e}")
+        return b""
+
+
+def speak(text, cache, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+    """Blocking version of speak_later(): returns (key, mp3 bytes)"""
+    key, future = speak_later(text, cache, voice, rate)
+    return key, wait_for_audio(future)
+
+
+class SentenceSplitter:
+    """Turns a stream of text pieces into complete sentences"""
+
+    def __init__(self, min_chars=_MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text):
+        """Add text; return the sentences it completed"""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for m in _SENTENCE_END.finditer(self.buffer):
+            candidate = self.buffer[start:m.end()].strip()
+            if len(candidate) < self.min_chars or candidate.lower().endswith(_ABBREVIATIONS):
+                continue
+            sentences.append(candidate)
+            start = m.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Return whatever is left once the stream has ended"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+def speak_stream(chunks, cache, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+    """
+    Pipeline streamed text into speech. A background thread reads `chunks`,
+    and each sentence is sent to the TTS worker as soon as it is complete,
+    while later ones are still being generated. Yields (sentence, Future of
+    mp3 bytes) in order.
+    """
+    results = queue.Queue()
+
+    def _produce():
+        splitter = SentenceSplitter()
+        try:
+            for chunk in chunks:
+                for sentence in splitter.feed(chunk):
+                    results.put((sentence, speak_later(sentence, cache, voice, rate)[1]))
+            for sentence in splitter.flush():
+                results.put((sentence, speak_later(sentence, cache, voice, rate)[1]))
+        except Exception as e:
+            print(f"TTS pipeline error: {e}")
+        finally:
+            results.put(None)
+
+    threading.Thread(target=_produce, name="tts-pipeline", daemon=True).start()
+    while True:
+        item = results.get()
+        if item is None:
+            return
+        yield item
+
+
+def warm_up(lines, cache=None, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+    """
+    Pre-render lines in the background, whole and split into sentences (the
+    pieces a streamed turn asks for). Goes into the shared scripted tier
+    unless a session cache is given. Returns the synthesis futures.
+    """
+    cache = _scripted_cache if cache is None else cache
+    parts = []
+    for line in lines:
+        splitter = SentenceSplitter()
+        parts.append(line.strip())
+        parts.extend(splitter.feed(line) + splitter.flush())
+
+    futures = []
+    for text in dict.fromkeys(parts):
+        key = audio_key(text, voice, rate)
+        if not text or key in cache or key in _scripted_cache:
+            continue
+        futures.append(speak_later(text, cache, voice, rate)[1])
+    if futures:
+        print(f"🔊 Warming {len(futures)} scripted TTS clips ({voice})")
+    return futures
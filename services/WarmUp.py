@@ -0,0 +1,148 @@
+"""
+Background Warm-Up
+Imports and client construction are deferred until first use, which
+would put the Gemini SDK import, client setup and react-agent compilation
+on the first user's request. start() does that work once per server
+process in a background thread instead: pooled clients for every routed
+model, the compiled interview and resume agents (for services on the
+agent engine) and, with WARMUP_PROBE=1, one tiny routed call that opens
+the connection. WARMUP=0 turns it off.
+
+Pages start it through st.cache_resource (chatbot_component); status()
+and is_ready() report progress. At interpreter exit the remaining steps
+are skipped and the step in progress is waited for, so a short-lived
+process doesn't tear the thread down mid-import.
+"""
+import atexit
+import os
+import threading
+import time
+
+from services import Metrics
+
+_PROBE = os.getenv("WARMUP_PROBE", "").lower() in ("1", "true", "yes")
+_DISABLED = os.getenv("WARMUP", "1").lower() in ("0", "false", "no")
+
+IDLE, WARMING, READY, FAILED, STOPPED = "idle", "warming", "ready", "failed", "stopped"
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_stopping = threading.Event()
+_thread = None
+_status = {"state": IDLE, "steps": {}, "errors": {}, "started": None, "finished": None}
+
+
+# ============= STEPS =============
+def _import_services():
+    # Module-level indexes (knowledge base, intent router) build on import
+    from services import ChatBotModel, ResumeModel  # noqa: F401
+    from services import InterviewModel
+
+    InterviewModel._messages.HumanMessage  # Loads langchain_core's message types
+
+
+def _build_clients():
+    """Pooled clients with the exact settings each service asks for"""
+    from services.ChatBotModel import _get_llm
+    from services.ModelRouter import MODEL_PROFILES, get_chat_model
+
+    for model in MODEL_PROFILES:
+        _get_llm(model)                                      # Chatbot
+        get_chat_model(model, temperature=0.2)               # invoke_prompt default
+        get_chat_model(model, temperature=0.3)               # Interview, Q&A
+        get_chat_model(model, temperature=0.2, convert_system_message_to_human=True)  # Resume analysis
+
+
+def _build_agents():
+    """Compiled react agents, for services running on the agent engine"""
+    from services import InterviewModel, ResumeModel
+    from services.ModelRouter import MODEL_PROFILES
+
+    for model in MODEL_PROFILES:
+        if InterviewModel.INTERVIEW_ENGINE == "agent":
+            InterviewModel._get_agent(model)
+        if ResumeModel.RESUME_ENGINE == "agent":
+            ResumeModel._get_resume_agent(model)
+
+
+def _probe():
+    """One routed, rate-limited call so the first request finds an open connection"""
+    from services.ChatBotModel import _get_llm
+    from services.ModelRouter import invoke_routed
+
+    invoke_routed("chat", lambda model: _get_llm(model).invoke("Reply with OK."))
+
+
+def _steps():
+    steps = [("services", _import_services)]
+    if os.getenv("GEMINI_API_KEY"):
+        steps += [("clients", _build_clients), ("agents", _build_agents)]
+    if _PROBE and os.getenv("GEMINI_API_KEY"):
+        steps.append(("probe", _probe))
+    return steps
+
+
+def _run():
+    stopped = False
+    for name, step in _steps():
+        if _stopping.is_set():
+            stopped = True
+            break
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            # A failed step only means that work happens on first use instead
+            with _lock:
+                _status["errors"][name] = str(e)[:200]
+            print(f"⚠️ Warm-up step '{name}' failed: {e}")
+        elapsed = time.perf_counter() - start
+        Metrics.observe("warmup_seconds", elapsed, step=name)
+        with _lock:
+            _status["steps"][name] = round(elapsed, 3)
+
+    with _lock:
+        if _status["errors"]:
+            _status["state"] = FAILED
+        else:
+            _status["state"] = STOPPED if stopped else READY
+        _status["finished"] = time.time()
+        total = _status["finished"] - _status["started"]
+    _ready.set()
+    print(f"🔥 Warm-up {_status['state']} in {total:.1f}s: {_status['steps']}")
+
+
+# ============= PUBLIC API =============
+def start():
+    """Start the warm-up thread (once per process); returns immediately"""
+    global _thread
+    with _lock:
+        if _thread is not None or _DISABLED:
+            return _thread
+        _status.update(state=WARMING, started=time.time())
+        _thread = threading.Thread(target=_run, name="warm-up", daemon=True)
+        _thread.start()
+    atexit.register(stop)
+    return _thread
+
+
+def stop():
+    """Skip the steps not yet started and wait for the current one"""
+    _stopping.set()
+    if _thread is not None:
+        wait_until_ready()
+
+
+def is_ready():
+    """True once every warm-up step has run (successfully or not)"""
+    return _ready.is_set()
+
+
+def wait_until_ready(timeout=None):
+    return _ready.wait(timeout)
+
+
+def status():
+    """Copy of the warm-up state: state, per-step seconds and errors"""
+    with _lock:
+        return {**_status, "steps": dict(_status["steps"]), "errors": dict(_status["errors"])}
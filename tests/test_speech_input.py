@@ -0,0 +1,98 @@
+"""
+Tests for services/SpeechInput: the energy VAD and chunked transcription,
+on synthetic recordings recognised by the offline LocalRecognizer.
+"""
+import io
+import time
+import wave
+
+import numpy as np
+
+from services.SpeechInput import LocalRecognizer, iter_speech_segments, transcribe
+
+RATE = 16000
+
+
+def _speech(seconds, seed=0):
+    """Voice-like signal: a few harmonics with a syllable-rate envelope that never goes silent"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    rng = np.random.default_rng(seed)
+    tone = sum(np.sin(2 * np.pi * f * t + rng.uniform(0, 6)) for f in (180, 360, 720)) / 3
+    envelope = 0.25 + 0.75 * np.abs(np.sin(2 * np.pi * 2.5 * t))
+    return (0.5 * envelope * tone).astype(np.float32)
+
+
+def _noise(seconds, level, seed=1):
+    return (np.random.default_rng(seed).normal(0, level, int(seconds * RATE))).astype(np.float32)
+
+
+def _wav(samples):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def _three_phrases(gap_level=0.002):
+    gap = _noise(1.0, gap_level)
+    return np.concatenate([gap, _speech(1.0, 1), gap, _speech(1.2, 2), gap, _speech(0.8, 3), gap])
+
+
+def test_pauses_split_speech_into_ordered_chunks():
+    segments = list(iter_speech_segments(_three_phrases(), RATE))
+
+    assert len(segments) == 3
+    starts = [start / RATE for start, _ in segments]
+    assert starts == sorted(starts)
+    # Each chunk starts near its phrase (1.0s, 3.0s and 5.2s), within the padding
+    for start, expected in zip(starts, (1.0, 3.0, 5.2)):
+        assert abs(start - expected) < 0.25
+
+
+def test_silence_has_no_speech():
+    assert list(iter_speech_segments(_noise(3.0, 0.002), RATE)) == []
+    assert transcribe(_wav(_noise(3.0, 0.002)), recognizer=LocalRecognizer(["unused"])) == ""
+
+
+def test_recording_without_silence_keeps_the_speech():
+    samples = _speech(4.0)
+    segments = list(iter_speech_segments(samples, RATE))
+
+    covered = sum(end - start for start, end in segments)
+    assert covered >= 0.95 * len(samples)
+
+
+def test_noisy_background_is_not_speech():
+    # Noise loud enough to clear the absolute floor, with one short phrase
+    samples = np.concatenate([_noise(3.0, 0.03), _speech(0.8) + _noise(0.8, 0.03, 2), _noise(3.0, 0.03, 3)])
+    segments = list(iter_speech_segments(samples, RATE))
+
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert 2.7 < start / RATE and end / RATE < 4.1
+
+
+def test_transcripts_join_in_chunk_order():
+    recognizer = LocalRecognizer(["first", "second", "third"])
+    assert transcribe(_wav(_three_phrases()), recognizer=recognizer) == "first second third"
+
+
+def test_transcripts_stay_in_order_when_chunks_finish_out_of_order():
+    class SlowFirst(LocalRecognizer):
+        def recognize(self, samples, rate, index=0):
+            time.sleep(0.05 * (3 - index))  # Chunk 0 finishes last
+            return super().recognize(samples, rate, index)
+
+    recognizer = SlowFirst(["first", "second", "third"])
+    for _ in range(3):
+        assert transcribe(_wav(_three_phrases()), recognizer=recognizer) == "first second third"
+
+
+def test_unscripted_chunks_get_placeholders():
+    text = transcribe(_wav(_three_phrases()), recognizer=LocalRecognizer(["only one"]))
+
+    assert text.startswith("only one [speech ")
+    assert text.count("[speech ") == 2